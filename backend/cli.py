@@ -0,0 +1,207 @@
+"""
+5分钟快速复盘 - 命令行工具
+==========================
+通过 flask <group> <command> 调用的运维命令
+AI维护注意点:
+1. 命令组使用 AppGroup，自动推入应用上下文
+2. 新增命令组需在 utils/app_factory.py 中 add_command 注册
+3. 耗时命令需打印进度，避免运维误以为卡死
+"""
+
+from datetime import date
+
+import click
+from flask.cli import AppGroup
+
+from extensions import db
+
+# 可视化复盘相关命令：flask viz ...
+viz_cli = AppGroup('viz', help='可视化复盘维护命令')
+
+
+@viz_cli.command('reindex')
+@click.option('--batch-size', default=1000, show_default=True, help='每批读取的干货数')
+def reindex_command(batch_size):
+    """全量重建干货主题/内容的N-gram检索索引"""
+    from utils import text_index
+
+    rows = text_index.rebuild(db.session, batch_size=batch_size)
+    click.echo(f"检索索引重建完成，共 {rows} 个词元")
+
+
+@viz_cli.command('rollups')
+def rollups_command():
+    """全量重算分享者汇总（干货数、点赞、活跃天数、热门主题）"""
+    from utils.rollups import refresh_sharer_stats
+
+    rows = refresh_sharer_stats(db.session)
+    db.session.commit()
+    click.echo(f"分享者汇总重算完成，共 {rows} 位分享者")
+
+
+@viz_cli.command('ensure-indexes')
+def ensure_indexes_command():
+    """
+    补建模型中声明但库里缺失的索引
+
+    AI维护注意点: db.create_all 只在建表时建索引，已有表新增索引需执行此命令
+    """
+    created = 0
+    for table in db.metadata.sorted_tables:
+        existing = {ix['name'] for ix in db.inspect(db.engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                click.echo(f"已创建索引 {index.name}")
+                created += 1
+    click.echo(f"索引检查完成，新建 {created} 个")
+
+
+@viz_cli.command('hot-rebuild')
+@click.option('--batch-size', default=1000, show_default=True, help='每批读取的干货数')
+def hot_rebuild_command(batch_size):
+    """全量重算精选热度分"""
+    from utils import hot_rank
+
+    rows = hot_rank.rebuild(db.session, batch_size=batch_size)
+    click.echo(f"热度分重算完成，共 {rows} 条干货")
+
+
+@viz_cli.command('similar-rebuild')
+@click.option('--batch-size', default=1000, show_default=True, help='每批读取/写入的干货数')
+def similar_rebuild_command(batch_size):
+    """全量重建干货TF-IDF向量与相似近邻表"""
+    from utils import similar
+
+    vectors, neighbors = similar.rebuild(db.session, batch_size=batch_size)
+    click.echo(f"相似近邻重建完成，{vectors} 条干货，{neighbors} 条近邻")
+
+
+@viz_cli.command('fingerprints')
+@click.option('--batch-size', default=1000, show_default=True, help='每批读取的干货数')
+def fingerprints_command(batch_size):
+    """全量重算干货SimHash指纹（近似重复检测）"""
+    from utils import simhash
+
+    rows = simhash.rebuild(db.session, batch_size=batch_size)
+    click.echo(f"指纹重算完成，共 {rows} 条干货")
+
+
+@viz_cli.command('snapshots')
+@click.option('--date', 'day_date', default=None, help='只发布指定日期（YYYY-MM-DD），默认全部')
+def snapshots_command(day_date):
+    """发布看板静态快照到 static/boards/（可由cron定时执行刷新点赞数）"""
+    from flask import current_app
+    from models.visualization import ReviewDay
+
+    publisher = current_app.extensions['board_snapshots']
+    if day_date:
+        day = ReviewDay.query.filter_by(date=date.fromisoformat(day_date)).first()
+        if not day:
+            raise click.ClickException(f"未找到 {day_date} 的复盘数据")
+        publisher.publish(day)
+        count = 1
+    else:
+        count = publisher.publish_all()
+    click.echo(f"看板快照发布完成，共 {count} 天")
+
+
+@viz_cli.command('ingest')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--workers', default=None, type=int, help='解析进程数，默认CPU核数（1为不启用进程池）')
+@click.option('--chunk-size', default=50, show_default=True, help='每个事务导入的天数')
+@click.option('--skip-derived', is_flag=True, help='跳过导入后的汇总、相似近邻与快照重算')
+def ingest_command(directory, workers, chunk_size, skip_derived):
+    """
+    批量导入历史复盘markdown目录
+
+    AI维护注意点: 已存在的日期自动跳过，中断后重新执行同一命令即可续传
+    """
+    import time
+
+    from flask import current_app
+    from models.visualization import ReviewDay
+    from utils import ingest, similar
+    from utils.rollups import ensure_sharer_stats, refresh_sharer_stats
+
+    started = time.monotonic()
+    paths = ingest.find_files(directory)
+    if not paths:
+        raise click.ClickException(f"{directory} 下没有markdown文件")
+
+    # 1. 并行解析
+    with click.progressbar(ingest.parse_all(paths, workers), length=len(paths), label='解析文件') as results:
+        parsed = list(results)
+
+    seen = {day_date for (day_date,) in db.session.query(ReviewDay.date)}
+    pending, skipped, failed = [], 0, 0
+    for day in parsed:
+        if day['error']:
+            failed += 1
+            click.echo(f"跳过（读取失败）：{day['path']}：{day['error']}", err=True)
+        elif day['date'] is None:
+            click.echo(f"跳过（未找到日期）：{day['path']}", err=True)
+        elif not day['sharers']:
+            click.echo(f"跳过（没有干货）：{day['path']}", err=True)
+        elif day['date'] in seen:
+            skipped += 1
+        else:
+            seen.add(day['date'])
+            pending.append(day)
+
+    # 2. 一次性解析全部分享者
+    sharer_ids = ingest.resolve_sharers(
+        db.session, [name for day in pending for name, _, _ in day['sharers']]
+    )
+    db.session.commit()
+
+    # 3. 分块事务导入，每块提交即为续传检查点
+    day_ids, insights, duplicates = [], 0, 0
+    with click.progressbar(length=len(pending), label='写入数据库') as bar:
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            result = ingest.insert_days(db.session, chunk, sharer_ids)
+            db.session.commit()
+            day_ids.extend(result['day_ids'])
+            insights += result['insights']
+            duplicates += result['duplicates']
+            bar.update(len(chunk))
+
+    # 4. 派生数据统一重算
+    if day_ids and not skip_derived:
+        click.echo("重算分享者汇总与相似近邻…")
+        refresh_sharer_stats(db.session, set(sharer_ids.values()))
+        db.session.commit()
+        similar.rebuild(db.session)
+        current_app.extensions['board_snapshots'].publish_all(day_ids)
+    elif day_ids:
+        # 跳过重算时也要保证新分享者有汇总行，否则点赞累加无行可更新
+        ensure_sharer_stats(db.session, set(sharer_ids.values()))
+        db.session.commit()
+
+    click.echo(
+        f"导入完成：新增 {len(day_ids)} 天、{insights} 条干货，跳过已存在 {skipped} 天，"
+        f"疑似重复 {duplicates} 条，读取失败 {failed} 个文件，用时 {time.monotonic() - started:.1f} 秒"
+    )
+
+
+perf_cli = AppGroup('perf', help='性能测试数据命令')
+
+
+@perf_cli.command('generate')
+@click.option('--scale', default=1, show_default=True, help='数据规模倍数（1/10/100）')
+@click.option('--seed', default=0, show_default=True, help='随机种子，相同种子生成相同数据')
+def generate_command(scale, seed):
+    """
+    向当前数据库写入合成数据集
+
+    AI维护注意点: 只用于空库或专用的压测库，已存在基准用户时拒绝执行
+    """
+    from models.user import User
+    from perf import dataset
+
+    if User.query.filter_by(username=dataset.BENCH_USERNAME).first() is not None:
+        raise click.ClickException(f"已存在用户 {dataset.BENCH_USERNAME}，数据集已生成过")
+    counts = dataset.generate(db.session, scale=scale, seed=seed,
+                              progress=lambda stage, n: click.echo(f"  {stage}: {n}"))
+    click.echo("合成数据生成完成：" + "，".join(f"{name} {n}" for name, n in counts.items()))
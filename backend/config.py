@@ -8,9 +8,24 @@ AI维护注意点:
 4. 不同环境(开发/测试/生产)应使用不同配置类
 """
 
+import logging
 import os
 from datetime import timedelta
 
+def _env_threshold(name, default):
+    """读取毫秒阈值环境变量：未设置取默认值，off/none/0 表示关闭(None)，无法解析时告警并取默认值"""
+    value = (os.environ.get(name) or '').strip()
+    if not value:
+        return default
+    if value.lower() in ('off', 'none'):
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        logging.getLogger(__name__).warning(f"环境变量 {name}={value!r} 无法解析，使用默认值 {default}")
+        return default
+    return number or None
+
 class Config:
     """
     基础配置类
@@ -29,6 +44,19 @@ class Config:
         'pool_pre_ping': True   # 连接前ping测试
     }
     
+    # SQLite生产配置（数据库为SQLite时生效，见utils/sqlite_profile.py）
+    # AI维护注意点: gunicorn多worker共用一个文件，WAL+busy_timeout避免 "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,       # 毫秒，写锁冲突时等待
+        'synchronous': 'NORMAL',    # WAL下安全，提交少一次fsync
+        'mmap_size': 268435456,     # 256MB内存映射读
+        'cache_size': -65536,       # 负数单位KB，即64MB页缓存/连接
+        'temp_store': 'MEMORY'
+    }
+    SQLITE_READ_ENGINE = os.environ.get('SQLITE_READ_ENGINE', '1') == '1'  # @read_only接口走只读引擎
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', 10))  # 只读连接池大小/worker
+    
     # JWT配置
     # AI维护注意点: JWT_SECRET_KEY必须与SECRET_KEY不同
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
@@ -44,6 +72,45 @@ class Config:
     MAX_TEMPLATE_FIELDS = 10  # 单个模板最大字段数
     MAX_REVIEW_DAILY = 50  # 每日最大复盘次数限制
     
+    # 计数器写回配置
+    # AI维护注意点: 间隔越长落库越省，但其他worker看到新增量的延迟越大
+    COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL') or 2.0)  # 秒
+    
+    # 看板实时事件配置
+    # AI维护注意点: 同一周期内的点赞变化合并为一次推送；总线文件须在同机各worker间共享
+    LIVE_EVENTS_INTERVAL = 0.25  # 秒
+    LIVE_EVENTS_DB = os.environ.get('LIVE_EVENTS_DB')  # 默认 instance/live_events.db
+    
+    # 看板静态快照配置
+    # AI维护注意点: 点赞/头像变化后最多延迟一个周期重写快照，也是快照的HTTP缓存时长
+    SNAPSHOT_REFRESH_INTERVAL = float(os.environ.get('SNAPSHOT_REFRESH_INTERVAL') or 60)  # 秒
+    
+    # 单写者队列配置（见utils/write_queue.py）
+    # AI维护注意点: socket模式需先启动 flask writes serve；linger越长合并越多，单次写延迟也越高
+    WRITE_QUEUE_MODE = os.environ.get('WRITE_QUEUE_MODE') or 'off'  # off / thread / socket
+    WRITE_QUEUE_LINGER = float(os.environ.get('WRITE_QUEUE_LINGER') or 0.002)  # 秒
+    WRITE_QUEUE_SOCKET = os.environ.get('WRITE_QUEUE_SOCKET')  # 默认 instance/write_queue.sock
+    
+    # 监控指标配置（GET /api/metrics，见utils/metrics.py）
+    # AI维护注意点: 多worker汇总需设置环境变量 PROMETHEUS_MULTIPROC_DIR，见 gunicorn.conf.py
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # 设置后抓取需携带 Bearer token
+    
+    # 慢查询日志配置（见utils/slow_queries.py，GET /api/admin/slow-queries 查看）
+    # AI维护注意点: 环境变量 SLOW_QUERY_MS=off（或0）关闭；阈值过低会产生大量日志
+    SLOW_QUERY_MS = _env_threshold('SLOW_QUERY_MS', 200.0)  # 毫秒，None为关闭
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')  # 默认 instance/slow_queries.log
+    
+    # 单请求剖析配置（管理员 ?__profile=1，见utils/request_profiler.py）
+    PROFILE_SAMPLE_INTERVAL = 0.001  # 采样间隔(秒)
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')  # ?__profile=store 的保存目录，默认 instance/profiles
+    
+    # 线上流量录制配置（见utils/traffic_capture.py，perf/replay.py 回放）
+    # AI维护注意点: 默认0即关闭；盐变更后假名全部变化，同一份录制须使用同一个盐
+    TRAFFIC_CAPTURE_RATE = float(os.environ.get('TRAFFIC_CAPTURE_RATE') or 0)  # 采样比例 0~1
+    TRAFFIC_CAPTURE_LOG = os.environ.get('TRAFFIC_CAPTURE_LOG')  # 默认 instance/traffic.log
+    TRAFFIC_CAPTURE_SALT = os.environ.get('TRAFFIC_CAPTURE_SALT')  # 假名HMAC盐，默认SECRET_KEY
+    TRAFFIC_CAPTURE_MAX_BODY = 64 * 1024  # 超过此大小的请求体只记字节数
+    
     # 安全配置
     # AI维护注意点: 生产环境启用HTTPS
     SESSION_COOKIE_SECURE = False  # 生产环境设为True
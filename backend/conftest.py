@@ -0,0 +1,78 @@
+"""
+5分钟快速复盘 - pytest公共fixture
+=================================
+AI维护注意点:
+1. app 为整个测试会话共用的应用（utils/app_factory.py 装配，临时目录下的SQLite文件），
+   预先写入1倍规模的合成数据集（perf/dataset.py），基准用户 bench 有约3年的每日复盘
+2. 接口测试用 client + auth_headers（bench 用户的访问令牌）；用例会写数据时注意不要影响其他用例
+3. 用例中任何带 @query_budget 的请求超出预算，用例结束时失败并列出该请求的全部SQL
+"""
+
+import pytest
+
+from extensions import db
+from utils.query_budget import BudgetChecker, engines_of
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """会话级测试应用（含合成数据）"""
+    from perf import dataset
+    from utils.app_factory import create_app
+
+    root = tmp_path_factory.mktemp('app')
+    app = create_app({
+        'TESTING': True,
+        'PROPAGATE_EXCEPTIONS': False,  # 与线上一致：未捕获异常返回500而不是抛进用例
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{root / 'test.db'}",
+        'LIVE_EVENTS_DB': str(root / 'live_events.db'),
+        'SLOW_QUERY_LOG': str(root / 'slow_queries.log'),
+        'PROFILE_DIR': str(root / 'profiles'),
+        'TRAFFIC_CAPTURE_RATE': 0,
+        'WRITE_QUEUE_MODE': 'off',
+    }, instance_path=str(root / 'instance'), static_folder=str(root / 'static'), viz=False)
+    with app.app_context():
+        dataset.generate(db.session, scale=1, seed=0)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope='session')
+def bench_user(app):
+    """基准用户（管理员）"""
+    from models.user import User
+    from perf.dataset import BENCH_USERNAME
+
+    with app.app_context():
+        user = User.query.filter_by(username=BENCH_USERNAME).one()
+        db.session.expunge(user)
+    return user
+
+
+@pytest.fixture(scope='session')
+def auth_headers(app, bench_user):
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        token = create_access_token(identity=str(bench_user.id))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def query_budget(app):
+    """
+    检查用例期间每个请求的SQL预算
+
+    用法:
+        def test_reviews_list(client, auth_headers, query_budget):
+            client.get('/api/reviews?per_page=50', headers=auth_headers)
+            assert query_budget.checked  # 可选：确认确实命中了带预算的接口
+    """
+    with BudgetChecker(app, engines_of(app, db)) as checker:
+        yield checker
+    if checker.violations:
+        pytest.fail(f"SQL超出接口预算（疑似N+1）：\n\n{checker.report()}", pytrace=False)
@@ -7,6 +7,21 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 
+from utils.counters import WriteBehindCounter
+from utils.sqlite_profile import RoutingSession
+from utils.live_events import LiveEventBus
+from utils.board_snapshots import BoardSnapshotPublisher
+from utils.write_queue import WriteQueue
+
 # 初始化扩展（不绑定到app）
-db = SQLAlchemy()
+# AI维护注意点: 会话支持读写分离，@read_only 接口的查询走SQLite只读引擎（见utils/sqlite_profile.py）
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
+# 热点计数列写回缓冲（点赞数、模板使用次数）
+counters = WriteBehindCounter()
+# 看板实时点赞事件（SSE），多worker经本地SQLite文件共享
+live_events = LiveEventBus()
+# 看板静态快照（static/boards/{date}.json）
+snapshots = BoardSnapshotPublisher()
+# 高频写事务的单写者队列（可选，默认关闭）
+writes = WriteQueue()
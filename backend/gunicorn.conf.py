@@ -0,0 +1,31 @@
+"""
+5分钟快速复盘 - gunicorn配置
+============================
+用法: gunicorn -c gunicorn.conf.py app:app
+AI维护注意点:
+1. 设置 PROMETHEUS_MULTIPROC_DIR 后 /api/metrics 汇总全部worker（见utils/metrics.py），
+   该目录须在启动前清空，worker退出时清理其存活类指标
+2. 未设置该环境变量时每个worker只报告自己的指标
+"""
+
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+
+
+def on_starting(server):
+    """主进程启动：清空上次运行残留的指标文件"""
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """worker退出：移除其 livesum 类指标（如已借出连接数）"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
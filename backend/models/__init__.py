@@ -10,8 +10,10 @@ AI维护注意点:
 from models.user import User
 from models.template import ReviewTemplate, TemplateField
 from models.review import Review, ReviewAnswer
-from models.visualization import ReviewDay, Sharer, Insight, Like
-
+from models.visualization import (
+    ReviewDay, Sharer, Insight, Like, InsightTerm, SharerStats, HotInsight,
+    InsightVector, SimilarInsight, InsightFingerprint
+)
 # AI维护注意点: 导出所有模型供Alembic使用
 __all__ = [
     'User',
@@ -22,5 +24,11 @@ __all__ = [
     'ReviewDay',
     'Sharer',
     'Insight',
-    'Like'
+    'Like',
+    'InsightTerm',
+    'SharerStats',
+    'HotInsight',
+    'InsightVector',
+    'SimilarInsight',
+    'InsightFingerprint'
 ]
@@ -55,12 +55,13 @@ class Review(db.Model):
     answers = db.relationship('ReviewAnswer', backref='review', lazy='dynamic',
                              cascade='all, delete-orphan')
     
-    def to_dict(self, include_answers=True):
+    def to_dict(self, include_answers=True, answer_count=None):
         """
         转换为字典格式
         
         Args:
             include_answers: 是否包含答案详情
+            answer_count: 预先批量查出的答案数（列表接口用 answer_counts 一次查出，避免逐条COUNT）
         """
         data = {
             'id': self.id,
@@ -74,21 +75,41 @@ class Review(db.Model):
             'word_count': self.word_count,
             'is_completed': self.is_completed,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'answer_count': self.answers.count()
+            'answer_count': answer_count
         }
         
         if include_answers:
-            data['answers'] = [answer.to_dict() for answer in self.answers.all()]
+            answers = self.answers.options(db.undefer(ReviewAnswer.answer_text)).all()
+            data['answers'] = [answer.to_dict() for answer in answers]
+            data['answer_count'] = len(answers)
+        elif answer_count is None:
+            data['answer_count'] = self.answers.count()
             
         return data
     
+    @staticmethod
+    def answer_counts(review_ids):
+        """
+        批量统计答案数
+        
+        Returns:
+            dict: {review_id: 答案数}（无答案的复盘不在其中）
+        """
+        if not review_ids:
+            return {}
+        return dict(
+            db.session.query(ReviewAnswer.review_id, db.func.count(ReviewAnswer.id))
+            .filter(ReviewAnswer.review_id.in_(review_ids))
+            .group_by(ReviewAnswer.review_id)
+        )
+    
     def calculate_word_count(self):
         """
         计算复盘总字数
         AI维护注意点: 中文按字符计，英文按单词计
         """
         total = 0
-        for answer in self.answers.all():
+        for answer in self.answers.options(db.undefer(ReviewAnswer.answer_text)).all():
             if answer.answer_text:
                 # 简单统计：中文按字符，英文按空格分割
                 import re
@@ -163,8 +184,9 @@ class ReviewAnswer(db.Model):
     field_type = db.Column(db.String(20), nullable=False)
     
     # 答案内容
-    # AI维护注意点: 复杂类型(multiselect等)以JSON存储
-    answer_text = db.Column(db.Text, nullable=True)
+    # AI维护注意点: 复杂类型(multiselect等)以JSON存储；
+    # 大字段默认延迟加载，需要答案文本的查询显式 db.undefer(ReviewAnswer.answer_text)
+    answer_text = db.deferred(db.Column(db.Text, nullable=True))
     
     # 用于筛选/统计的标准化值
     # AI维护注意点: rating类型存储为数字便于统计
@@ -9,7 +9,7 @@ AI维护注意点:
 """
 
 from datetime import datetime
-from extensions import db
+from extensions import db, counters
 import json
 
 class ReviewTemplate(db.Model):
@@ -52,13 +52,51 @@ class ReviewTemplate(db.Model):
                             cascade='all, delete-orphan', order_by='TemplateField.order_index')
     reviews = db.relationship('Review', backref='template', lazy='dynamic')
     
-    def to_dict(self, include_fields=True):
+    @staticmethod
+    def fields_for(template_ids):
+        """
+        批量查询多个模板的字段
+        
+        Returns:
+            dict: {template_id: [TemplateField, ...]}（按 order_index 排序，每个模板都有键）
+        """
+        result = {template_id: [] for template_id in template_ids}
+        if template_ids:
+            for field in TemplateField.query.filter(
+                TemplateField.template_id.in_(template_ids)
+            ).order_by(TemplateField.template_id, TemplateField.order_index):
+                result[field.template_id].append(field)
+        return result
+    
+    @staticmethod
+    def field_counts(template_ids):
+        """
+        批量统计字段数（列表只需数量时用，不取回字段行）
+        
+        Returns:
+            dict: {template_id: 字段数}（无字段的模板不在其中）
+        """
+        if not template_ids:
+            return {}
+        return dict(
+            db.session.query(TemplateField.template_id, db.func.count(TemplateField.id))
+            .filter(TemplateField.template_id.in_(template_ids))
+            .group_by(TemplateField.template_id)
+        )
+    
+    def to_dict(self, include_fields=True, fields=None, field_count=None):
         """
         转换为字典格式
         
         Args:
             include_fields: 是否包含字段详情
+            fields: 预先批量查出的字段列表（列表接口用 fields_for 一次查出，避免逐个查询）
+            field_count: 预先批量查出的字段数（不含字段详情的列表用 field_counts 一次查出）
         """
+        if fields is None and include_fields:
+            fields = self.fields.all()
+        if field_count is None:
+            field_count = len(fields) if fields is not None else self.fields.count()
         data = {
             'id': self.id,
             'name': self.name,
@@ -67,21 +105,35 @@ class ReviewTemplate(db.Model):
             'is_system': self.is_system,
             'is_public': self.is_public,
             'user_id': self.user_id,
-            'use_count': self.use_count,
-            'field_count': self.fields.count(),
+            'use_count': counters.read(ReviewTemplate.use_count, self.id, self.use_count),
+            'field_count': field_count,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
         
         if include_fields:
-            data['fields'] = [field.to_dict() for field in self.fields.all()]
+            data['fields'] = [field.to_dict() for field in fields]
             
         return data
     
     def increment_use_count(self):
-        """增加使用计数"""
-        self.use_count += 1
-        db.session.commit()
+        """
+        增加使用计数
+        
+        AI维护注意点: 写入计数缓冲，由后台批量 use_count = use_count + n 落库，
+        调用方需在复盘事务提交之后调用
+        """
+        ReviewTemplate.adjust_use_count(self.id, 1)
+    
+    @staticmethod
+    def adjust_use_count(template_id, n):
+        """
+        按复盘条数变化调整使用计数（新建+1、删除-1，更新时换模板则旧-1新+1）
+        
+        AI维护注意点: use_count 的含义是"使用该模板的复盘条数"，与每晚对账
+        （counters.RECONCILE_SOURCES：COUNT(reviews.template_id)）口径一致，覆盖同一天的复盘不计数
+        """
+        counters.incr(ReviewTemplate.use_count, template_id, n)
     
     def can_edit(self, user_id):
         """
@@ -11,7 +11,10 @@ AI维护注意点:
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 # AI维护注意点: 从extensions模块导入db避免循环导入
-from extensions import db
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
+
+from extensions import db, writes
 
 class User(db.Model):
     """
@@ -103,9 +106,14 @@ class User(db.Model):
         return data
     
     def update_last_login(self):
-        """更新最后登录时间"""
-        self.last_login_at = datetime.utcnow()
-        db.session.commit()
+        """
+        更新最后登录时间
+        
+        AI维护注意点: 经单写者队列写入（见utils/write_queue.py），对象上直接置为已提交值
+        """
+        now = datetime.utcnow()
+        writes.submit('last_login', user_id=self.id, at=now.isoformat())
+        set_committed_value(self, 'last_login_at', now)
     
     @classmethod
     def find_by_username(cls, username):
@@ -123,3 +131,13 @@ class User(db.Model):
     
     def __repr__(self):
         return f'<User {self.username}>'
+
+
+@writes.operation('last_login')
+def _touch_last_login(conn, user_id, at):
+    """写操作：更新最后登录时间"""
+    return conn.execute(
+        update(User.__table__).where(User.__table__.c.id == user_id).values(
+            last_login_at=datetime.fromisoformat(at)
+        )
+    ).rowcount
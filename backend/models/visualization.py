@@ -11,6 +11,7 @@ AI维护注意点:
 
 from datetime import datetime
 from extensions import db
+import json
 
 
 class ReviewDay(db.Model):
@@ -23,7 +24,9 @@ class ReviewDay(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False, unique=True, index=True)  # 复盘日期
     title = db.Column(db.String(200))  # 复盘标题（从markdown提取）
-    raw_content = db.Column(db.Text)   # 原始markdown文本（备份）
+    # 原始markdown文本（备份）
+    # AI维护注意点: 大字段默认延迟加载，列表查询不取；需要时用 db.undefer(ReviewDay.raw_content)
+    raw_content = db.deferred(db.Column(db.Text))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # 关联关系
@@ -70,7 +73,9 @@ class Insight(db.Model):
     
     emoji = db.Column(db.String(10))        # 表情符号，如 "🕰️"
     topic = db.Column(db.String(100))       # 主题，如 "时间价值化魔法"
-    content = db.Column(db.Text, nullable=False)  # 详细内容
+    # 详细内容
+    # AI维护注意点: 大字段默认延迟加载，看板等需要全文的查询显式 db.undefer(Insight.content)
+    content = db.deferred(db.Column(db.Text, nullable=False))
     
     likes = db.Column(db.Integer, default=0)  # 冗余存储，优化查询
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -101,6 +106,135 @@ class Like(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # 联合唯一约束：同一设备不能对同一条干货重复点赞
+    # AI维护注意点: (insight_id, created_at) 索引支撑最近点赞者与时间线分页，
+    # (device_id, insight_id) 索引支撑看板批量查询已点赞状态，
+    # 已有库需执行 flask viz ensure-indexes 补建
     __table_args__ = (
         db.UniqueConstraint('insight_id', 'device_id', name='unique_device_like'),
+        db.Index('ix_likes_insight_created', 'insight_id', 'created_at'),
+        db.Index('ix_likes_device_insight', 'device_id', 'insight_id'),
     )
+
+
+class InsightTerm(db.Model):
+    """
+    干货N-gram倒排索引表
+    词元 → 干货，用于主题/内容检索（切分规则见 utils/text_index.py）
+    
+    AI维护注意点:
+    1. 主键 (term, field, insight_id) 即检索索引，按词元前缀定位
+    2. field: 't'=主题, 'c'=内容
+    3. 由 save_review 维护，规则变更后执行 flask viz reindex 全量重建
+    """
+    __tablename__ = 'insight_terms'
+    
+    term = db.Column(db.String(8), primary_key=True)
+    field = db.Column(db.String(1), primary_key=True)
+    insight_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True, index=True)
+
+
+class SharerStats(db.Model):
+    """
+    分享者汇总表
+    每位分享者的干货数、总点赞、活跃天数、首末日期和热门主题
+    
+    AI维护注意点:
+    1. 由 save_review（全量重算受影响分享者）和点赞（计数缓冲累加total_likes）维护；
+       有干货的分享者必须有汇总行（ensure_sharer_stats 补建），top_topics 只在重算时更新
+    2. 汇总规则见 utils/rollups.py，数据异常时执行 flask viz rollups 全量重算
+    3. total_likes/insight_count 建索引，排行榜直接走索引读取
+    """
+    __tablename__ = 'sharer_stats'
+    
+    sharer_id = db.Column(db.Integer, db.ForeignKey('sharers.id'), primary_key=True)
+    insight_count = db.Column(db.Integer, default=0, nullable=False, index=True)
+    total_likes = db.Column(db.Integer, default=0, nullable=False, index=True)
+    active_days = db.Column(db.Integer, default=0, nullable=False)
+    first_date = db.Column(db.Date)
+    last_date = db.Column(db.Date)
+    top_topics = db.Column(db.Text)  # JSON: [{"topic": "...", "likes": 3, "count": 2}]
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    sharer = db.relationship('Sharer', backref=db.backref('stats', uselist=False))
+    
+    def to_dict(self):
+        """转换为字典格式（total_likes由调用方叠加计数缓冲）"""
+        return {
+            'insight_count': self.insight_count,
+            'total_likes': self.total_likes,
+            'active_days': self.active_days,
+            'first_date': self.first_date.isoformat() if self.first_date else None,
+            'last_date': self.last_date.isoformat() if self.last_date else None,
+            'top_topics': json.loads(self.top_topics) if self.top_topics else []
+        }
+
+
+class HotInsight(db.Model):
+    """
+    干货热度排行表
+    "精选"信息流的排序依据，热度分见 utils/hot_rank.py
+    
+    AI维护注意点:
+    1. 热度分 = log10(点赞数) + 复盘日时间戳/45000（Reddit式），越新越高、点赞越多越高
+    2. 分数只随点赞变化、不随时间衰减重算，排行直接读 score 索引
+    3. 保存复盘时写入初始分，点赞计数落库时同事务刷新
+    """
+    __tablename__ = 'hot_insights'
+    
+    insight_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True)
+    score = db.Column(db.Float, nullable=False, index=True)
+
+
+class InsightVector(db.Model):
+    """
+    干货TF-IDF向量表
+    相似推荐的特征向量，计算规则见 utils/similar.py
+    
+    AI维护注意点:
+    1. vector 为L2归一化后的稀疏向量 JSON {词元: 权重}，只在计算相似度时读取
+    2. 全量重建时按当时的IDF计算；新保存的干货按保存时的IDF折入，不回算旧向量
+    """
+    __tablename__ = 'insight_vectors'
+    
+    insight_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True)
+    vector = db.Column(db.Text, nullable=False)
+
+
+class SimilarInsight(db.Model):
+    """
+    相似干货近邻表
+    每条干货预先计算的前K个相似干货（不含同一天），推荐接口直接按索引读取
+    
+    AI维护注意点:
+    1. 由 flask viz similar-rebuild 全量生成，save_review 增量折入新干货
+    2. 新干货会挤进旧干货的近邻列表（仍保持每条最多K个）
+    3. 覆盖保存某天时删除其干货作为主体与作为近邻的所有行
+    """
+    __tablename__ = 'similar_insights'
+    __table_args__ = (
+        db.Index('ix_similar_insights_insight_score', 'insight_id', 'score'),
+    )
+    
+    insight_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True, index=True)
+    score = db.Column(db.Float, nullable=False)
+
+
+class InsightFingerprint(db.Model):
+    """
+    干货SimHash指纹表
+    保存复盘时检测近似重复的干货，算法见 utils/simhash.py
+    
+    AI维护注意点:
+    1. simhash 为64位指纹（有符号存储），band0~band3 为其4个16位分段，各自建索引
+    2. 检测按分段等值查询召回候选，再比较海明距离
+    3. 过短的干货不生成指纹；规则变更后执行 flask viz fingerprints 全量重算
+    """
+    __tablename__ = 'insight_fingerprints'
+    
+    insight_id = db.Column(db.Integer, db.ForeignKey('insights.id'), primary_key=True)
+    simhash = db.Column(db.BigInteger, nullable=False)
+    band0 = db.Column(db.Integer, nullable=False, index=True)
+    band1 = db.Column(db.Integer, nullable=False, index=True)
+    band2 = db.Column(db.Integer, nullable=False, index=True)
+    band3 = db.Column(db.Integer, nullable=False, index=True)
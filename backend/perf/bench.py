@@ -0,0 +1,287 @@
+"""
+5分钟快速复盘 - 接口基准测试
+============================
+在1x/10x/100x合成数据集上逐个计时 /api/* 下的GET接口，输出p50/p95与SQL条数，并与基线对比
+用法:
+    python perf/bench.py --scales 1,10,100 --repeat 30
+    python perf/bench.py --scales 1,10 --update-baseline      # 把本次结果写为基线
+
+AI维护注意点:
+1. 每个规模一个子进程、一个独立SQLite文件（环境变量 DATABASE_URL 指向 --data-dir），
+   不会碰 instance/review_app.db；数据集按 规模+seed 缓存，重复运行不再生成
+   应用由 utils/app_factory.create_app(viz=False) 装配（与 app.py 相同，只跳过无法注册的FastAPI路由），
+   因此 /api/viz/* 不在基准范围内
+2. 请求经Flask test client在进程内发出，计时不含网络；SQL条数由 utils/query_budget.QueryRecorder 统计
+3. 以基准用户 bench（3年每日复盘的管理员）身份请求，路径参数取该用户的数据（见 path_values）
+4. 只测GET接口；写接口会改变数据集，由 perf/like_storm.py 等专项脚本覆盖
+5. 与基线对比：p50 慢于基线 --threshold（默认20%）且超过1ms、或SQL条数增加，视为退化，退出码为1
+6. 非2xx的接口单独列出，不写入基线、不参与耗时对比（错误响应的耗时没有意义）；
+   基线中为2xx、本次变为非2xx的，视为退化
+7. 仓库提交了1x基线 perf/baseline.json（--repeat 30），默认运行即与之对比；SQL条数与机器无关，
+   耗时与机器相关——换了运行机器（如CI）先在基准提交上 --update-baseline 再对比，
+   改动有意影响性能时在同一提交里更新基线；10x/100x 没有提交基线，需要时本地生成
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, 'perf', 'baseline.json')
+
+# 个别接口的查询参数（取该接口最重的常见用法）
+EXTRA_QUERY = {
+    '/api/reviews': {'per_page': 50},
+    '/api/stats/trends': {'days': 365},
+    '/api/stats/fields': {'field_name': 'mood', 'days': 90},
+    '/api/stats/wordcloud': {'limit': 100},
+}
+# 不参与基准的接口
+SKIP_RULES = {'/api/metrics'}
+
+
+# ============ 子进程：单一规模 ============
+
+def path_values():
+    """基准用户的数据，用于填充路径参数"""
+    from models.review import Review
+    from models.template import ReviewTemplate
+    from models.user import User
+    from perf.dataset import BENCH_USERNAME
+
+    user = User.query.filter_by(username=BENCH_USERNAME).one()
+    review = Review.query.filter_by(user_id=user.id).order_by(Review.review_date.desc()).first()
+    template = ReviewTemplate.query.filter_by(user_id=user.id).order_by(ReviewTemplate.id).first()
+    return user, {'review_id': review.id, 'template_id': template.id}
+
+
+def bench_routes(app, repeat, warmup=2):
+    """计时全部GET接口"""
+    from flask_jwt_extended import create_access_token
+
+    from extensions import db
+    from utils.query_budget import QueryRecorder, engines_of
+
+    with app.app_context():
+        user, values = path_values()
+        token = create_access_token(identity=str(user.id))
+    headers = {'Authorization': f'Bearer {token}'}
+    engines = engines_of(app, db)
+    client = app.test_client()
+
+    results = {}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda r: r.rule):
+        if not rule.rule.startswith('/api/') or 'GET' not in rule.methods or rule.rule in SKIP_RULES:
+            continue
+        if any(arg not in values for arg in rule.arguments):
+            continue
+        path = rule.build({arg: values[arg] for arg in rule.arguments}, append_unknown=False)[1]
+        query = EXTRA_QUERY.get(rule.rule, {})
+
+        for _ in range(warmup):
+            client.get(path, query_string=query, headers=headers)
+        timings, queries, status = [], [], None
+        for _ in range(repeat):
+            with QueryRecorder(engines) as recorder:
+                start = time.perf_counter()
+                response = client.get(path, query_string=query, headers=headers)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(recorder.statements))
+            status = response.status_code
+
+        timings.sort()
+        results[f"GET {rule.rule}"] = {
+            'status': status,
+            'p50': round(statistics.median(timings), 3),
+            'p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'queries': int(statistics.median(queries))
+        }
+    return results
+
+
+def run_child(scale, seed, repeat):
+    """子进程入口：准备数据集并计时，结果JSON写到stdout最后一行"""
+    sys.path.insert(0, BACKEND_DIR)
+    from extensions import db
+    from models.user import User
+    from perf import dataset
+    from utils.app_factory import create_app
+
+    # 数据库、事件总线等路径已由 run_scale 通过环境变量指向 --data-dir
+    data_dir = os.path.dirname(os.environ['LIVE_EVENTS_DB'])
+    app = create_app(
+        {'TRAFFIC_CAPTURE_RATE': 0},
+        instance_path=os.path.join(data_dir, 'instance'),
+        static_folder=os.path.join(data_dir, 'static'),
+        viz=False
+    )
+
+    with app.app_context():
+        if User.query.filter_by(username=dataset.BENCH_USERNAME).first() is None:
+            started = time.perf_counter()
+            counts = dataset.generate(
+                db.session, scale=scale, seed=seed,
+                progress=lambda stage, n: print(f"  [{scale}x] {stage}: {n}", file=sys.stderr)
+            )
+            print(f"  [{scale}x] 数据集生成完成，用时 {time.perf_counter() - started:.1f}s：{counts}", file=sys.stderr)
+
+    results = bench_routes(app, repeat)
+    print(json.dumps({'scale': scale, 'routes': results}, ensure_ascii=False))
+
+
+# ============ 主进程：汇总与对比 ============
+
+def is_ok(result):
+    return 200 <= result['status'] < 300
+
+
+def failed_routes(current):
+    """非2xx的接口：[(规模, 接口, 状态码), ...]"""
+    return [
+        (scale, route, result['status'])
+        for scale, routes in current.items()
+        for route, result in sorted(routes.items())
+        if not is_ok(result)
+    ]
+
+
+def run_scale(scale, seed, repeat, data_dir):
+    """启动子进程跑一个规模"""
+    os.makedirs(data_dir, exist_ok=True)
+    prefix = os.path.join(data_dir, f"bench_{scale}x_seed{seed}")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{prefix}.db",
+        LIVE_EVENTS_DB=f"{prefix}.events.db",
+        SLOW_QUERY_LOG=f"{prefix}.slow.log",
+        PROFILE_DIR=f"{prefix}.profiles",
+        WRITE_QUEUE_MODE='off',
+    )
+    env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', '--scale', str(scale),
+         '--seed', str(seed), '--repeat', str(repeat)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scale}x 基准子进程失败（退出码 {completed.returncode}）")
+    return json.loads(completed.stdout.strip().splitlines()[-1])['routes']
+
+
+def compare(current, baseline, threshold):
+    """
+    与基线对比
+
+    Returns:
+        list: [(规模, 接口, 说明), ...] 退化项
+    """
+    regressions = []
+    for scale, routes in current.items():
+        for route, result in routes.items():
+            base = baseline.get(scale, {}).get(route)
+            if base is None:
+                continue
+            if not is_ok(result):
+                regressions.append((scale, route, f"状态码 {base['status']} → {result['status']}"))
+                continue
+            if result['queries'] > base['queries']:
+                regressions.append((scale, route, f"SQL {base['queries']} → {result['queries']} 条"))
+            if result['p50'] > base['p50'] * (1 + threshold) and result['p50'] - base['p50'] > 1:
+                regressions.append((scale, route, f"p50 {base['p50']:.1f} → {result['p50']:.1f} ms"))
+    return regressions
+
+
+def print_report(current, baseline):
+    scales = list(current)
+    routes = sorted({route for results in current.values() for route in results})
+    width = max(len(route) for route in routes) if routes else 10
+    header = f"{'接口':<{width}}" + ''.join(f" | {scale:>6} p50/p95/SQL{'':>6}" for scale in scales)
+    print(header)
+    print('-' * len(header))
+    for route in routes:
+        line = f"{route:<{width}}"
+        for scale in scales:
+            result = current[scale].get(route)
+            if result is None:
+                line += f" | {'-':>24}"
+                continue
+            cell = f"{result['p50']:.1f}/{result['p95']:.1f}/{result['queries']}"
+            if not is_ok(result):
+                cell = f"[{result['status']}] " + cell
+            base = baseline.get(scale, {}).get(route)
+            if base and is_ok(result):
+                cell += f" ({(result['p50'] / base['p50'] - 1) * 100:+.0f}%)" if base['p50'] else ''
+            line += f" | {cell:>24}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='接口基准测试')
+    parser.add_argument('--scales', default='1,10,100', help='规模倍数，逗号分隔')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=30, help='每个接口计时次数')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), '5min-review-bench'))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.2, help='p50退化判定比例')
+    parser.add_argument('--output', help='本次结果另存为JSON')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--scale', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.scale, args.seed, args.repeat)
+        return 0
+
+    current = {}
+    for scale in [int(s) for s in args.scales.split(',') if s.strip()]:
+        print(f"运行 {scale}x ...", file=sys.stderr)
+        current[f"{scale}x"] = run_scale(scale, args.seed, args.repeat, args.data_dir)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_report(current, baseline)
+    failed = failed_routes(current)
+    if failed:
+        print(f"\n{len(failed)} 个接口返回非2xx（不计入基线与耗时对比）：")
+        for scale, route, status in failed:
+            print(f"  [{scale}] {route}: {status}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        merged = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                merged = json.load(f)
+        for scale, routes in current.items():
+            merged[scale] = {route: result for route, result in routes.items() if is_ok(result)}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\n基线已更新：{args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\n没有基线可对比（--update-baseline 生成）")
+        return 0
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n发现 {len(regressions)} 项退化：")
+        for scale, route, detail in regressions:
+            print(f"  [{scale}] {route}: {detail}")
+        return 1
+    print("\n与基线相比无退化")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+5分钟快速复盘 - 合成数据集生成
+==============================
+按规模倍数生成用户、模板/字段、多年复盘与答案、看板复盘日/分享者/干货/点赞，用于压测与基准测试
+用法:
+    flask perf generate --scale 10 --seed 1
+    或由 perf/bench.py 在临时库中调用 generate()
+
+AI维护注意点:
+1. 全部用Core批量插入（executemany），与 utils/ingest.py 相同的写法，100x规模也只需数分钟
+2. 1x规模：20个用户（含1个3年每日复盘的管理员基准用户）、60个看板复盘日；各项数量随倍数线性增长
+3. 文本由中文常用词随机拼句，长度与真实复盘接近；评分按用户各自的均值波动
+4. 同一 seed + scale 生成的数据完全一致，基准结果可比
+5. 只应写入空库（用户名/日期有唯一约束）；派生表（检索索引、热度分、分享者汇总）生成后统一重建
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import bindparam, insert, update
+
+from utils import hot_rank, text_index
+from utils.rollups import refresh_sharer_stats
+
+BASE_USERS = 20
+BASE_REVIEW_DAYS = 60
+BASE_SHARERS = 30
+BENCH_USERNAME = 'bench'
+BENCH_HISTORY_DAYS = 3 * 365
+CHUNK = 5000
+
+WORDS = (
+    '今天 早上 下午 晚上 项目 需求 会议 复盘 计划 目标 时间 精力 专注 效率 阅读 写作 运动 跑步 '
+    '睡眠 早起 家人 朋友 同事 客户 产品 设计 代码 测试 上线 问题 方案 思考 总结 学习 课程 笔记 '
+    '习惯 坚持 改进 反馈 沟通 表达 情绪 压力 放松 冥想 散步 阅读量 番茄钟 优先级 拖延 行动 '
+    '成长 价值 投资 长期主义 复利 认知 决策 风险 机会 选择 节奏 状态 心流 深度工作 碎片时间 '
+    '读完 完成 推进 整理 回顾 反思 发现 意识到 决定 尝试 调整 优化 记录 分享 收获 感恩'
+).split()
+PUNCTUATION = '，，，。；'
+EMOJIS = ['🕰️', '🔥', '🌱', '📚', '💡', '🎯', '🚀', '🧘', '☕', '🌙']
+NAMES = (
+    'Judy Jack Lily Tom Amy Leo Mia Sam Zoe Ben Ivy Max Eva Ray Ada Kai Joy Ian Nina Owen '
+    'Luna Evan Iris Noah Ruby Hugo Elsa Finn Cora Alan'
+).split()
+
+FIELD_POOL = [
+    ('mood', '今日心情', 'rating'),
+    ('energy', '精力状态', 'rating'),
+    ('done', '今天完成了什么', 'textarea'),
+    ('learned', '学到了什么', 'textarea'),
+    ('improve', '可以改进的地方', 'textarea'),
+    ('tomorrow', '明天最重要的事', 'text'),
+    ('focus_hours', '专注时长', 'number'),
+    ('gratitude', '感恩的事', 'text'),
+]
+SYSTEM_TEMPLATES = [
+    ('每日复盘', 'daily', [0, 2, 3, 5]),
+    ('周复盘', 'weekly', [1, 2, 4, 5, 6]),
+    ('项目复盘', 'project', [2, 3, 4]),
+]
+
+
+def sentence(rng, min_words=4, max_words=18) -> str:
+    """随机中文句子"""
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    parts = []
+    for i, word in enumerate(words):
+        parts.append(word)
+        if i < len(words) - 1 and rng.random() < 0.2:
+            parts.append(rng.choice(PUNCTUATION[:-1]))
+    return ''.join(parts) + '。'
+
+
+def paragraph(rng, sentences=(1, 4)) -> str:
+    return ''.join(sentence(rng) for _ in range(rng.randint(*sentences)))
+
+
+def _insert_returning(session, model, rows):
+    """批量插入并按输入顺序返回主键"""
+    ids = []
+    for start in range(0, len(rows), CHUNK):
+        ids.extend(session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows[start:start + CHUNK]
+        ).scalars().all())
+    return ids
+
+
+def _insert(session, model, rows):
+    for start in range(0, len(rows), CHUNK):
+        session.execute(insert(model.__table__), rows[start:start + CHUNK])
+
+
+def generate(session, scale=1, seed=0, today=None, progress=None):
+    """
+    生成规模为 scale 倍的数据集（调用方需保证是空库）
+
+    Args:
+        progress: 可选回调 progress(阶段名, 数量)
+
+    Returns:
+        dict: 各表生成的行数
+    """
+    from models.review import Review, ReviewAnswer
+    from models.template import ReviewTemplate, TemplateField
+    from models.user import User
+    from models.visualization import Insight, Like, ReviewDay, Sharer
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(seed)
+    today = today or date.today()
+    report = progress or (lambda stage, count: None)
+    counts = {}
+
+    # ============ 用户 ============
+    password_hash = generate_password_hash('123456')
+    user_rows = [{
+        'username': BENCH_USERNAME, 'email': f'{BENCH_USERNAME}@bench.local', 'password_hash': password_hash,
+        'is_active': True, 'is_admin': True,
+        'created_at': datetime.combine(today - timedelta(days=BENCH_HISTORY_DAYS), datetime.min.time())
+    }]
+    for i in range(1, BASE_USERS * scale):
+        user_rows.append({
+            'username': f'user{i:06d}', 'email': f'user{i:06d}@bench.local', 'password_hash': password_hash,
+            'is_active': True, 'is_admin': False, 'created_at': datetime.utcnow()
+        })
+    user_ids = _insert_returning(session, User, user_rows)
+    counts['users'] = len(user_ids)
+    report('users', len(user_ids))
+
+    # ============ 模板与字段 ============
+    template_rows, template_fields = [], []
+    for name, template_type, field_indexes in SYSTEM_TEMPLATES:
+        template_rows.append({
+            'name': name, 'description': f'系统预设{name}', 'user_id': None, 'template_type': template_type,
+            'is_system': True, 'is_public': True, 'use_count': 0, 'created_at': datetime.utcnow()
+        })
+        template_fields.append(field_indexes)
+    for user_id in user_ids:
+        for k in range(2):
+            field_indexes = sorted(rng.sample(range(len(FIELD_POOL)), rng.randint(3, 6)))
+            template_rows.append({
+                'name': f'我的模板{k + 1}', 'description': sentence(rng), 'user_id': user_id,
+                'template_type': rng.choice(['daily', 'weekly', 'custom']), 'is_system': False,
+                'is_public': rng.random() < 0.1, 'use_count': 0, 'created_at': datetime.utcnow()
+            })
+            template_fields.append(field_indexes)
+    template_ids = _insert_returning(session, ReviewTemplate, template_rows)
+    field_rows = [
+        {
+            'template_id': template_id, 'name': FIELD_POOL[i][0], 'label': FIELD_POOL[i][1],
+            'field_type': FIELD_POOL[i][2], 'required': order == 0, 'order_index': order
+        }
+        for template_id, field_indexes in zip(template_ids, template_fields)
+        for order, i in enumerate(field_indexes)
+    ]
+    _insert(session, TemplateField, field_rows)
+    counts['templates'], counts['template_fields'] = len(template_ids), len(field_rows)
+    report('templates', len(template_ids))
+
+    # 每个用户可用的模板：系统模板 + 自己的两个
+    system = list(zip(template_ids[:len(SYSTEM_TEMPLATES)], template_rows, template_fields))
+    own = list(zip(template_ids[len(SYSTEM_TEMPLATES):], template_rows[len(SYSTEM_TEMPLATES):],
+                   template_fields[len(SYSTEM_TEMPLATES):]))
+
+    # ============ 复盘与答案（按用户分批写入） ============
+    counts['reviews'] = counts['review_answers'] = 0
+    for u, user_id in enumerate(user_ids):
+        if u == 0:
+            history, rate = BENCH_HISTORY_DAYS, 1.0
+        else:
+            history, rate = rng.randint(30, BENCH_HISTORY_DAYS), rng.uniform(0.3, 0.95)
+        mood_mean = rng.uniform(2.5, 4.5)
+        choices = system + own[2 * u:2 * u + 2]
+
+        review_rows, answer_sets = [], []
+        for d in range(history):
+            if rng.random() > rate:
+                continue
+            review_date = today - timedelta(days=d)
+            template_id, template, field_indexes = rng.choice(choices)
+            answers, words = [], 0
+            for i in field_indexes:
+                name, label, field_type = FIELD_POOL[i]
+                if field_type == 'rating':
+                    value = float(min(5, max(1, round(rng.gauss(mood_mean, 0.8)))))
+                    text = str(int(value))
+                elif field_type == 'number':
+                    value = round(rng.uniform(0.5, 8), 1)
+                    text = str(value)
+                else:
+                    value = None
+                    text = paragraph(rng) if field_type == 'textarea' else sentence(rng, 2, 8)
+                    words += len(text)
+                answers.append({
+                    'field_name': name, 'field_label': label, 'field_type': field_type,
+                    'answer_text': text, 'numeric_value': value
+                })
+            review_rows.append({
+                'user_id': user_id, 'template_id': template_id, 'template_name': template['name'],
+                'review_type': template['template_type'], 'title': f"{review_date.isoformat()} {template['name']}",
+                'review_date': review_date, 'duration_minutes': rng.randint(3, 15), 'word_count': words,
+                'is_completed': True,
+                'created_at': datetime.combine(review_date, datetime.min.time()) + timedelta(hours=rng.uniform(19, 23.9))
+            })
+            answer_sets.append(answers)
+
+        review_ids = _insert_returning(session, Review, review_rows)
+        answer_rows = [
+            dict(answer, review_id=review_id)
+            for review_id, answers in zip(review_ids, answer_sets)
+            for answer in answers
+        ]
+        _insert(session, ReviewAnswer, answer_rows)
+        counts['reviews'] += len(review_ids)
+        counts['review_answers'] += len(answer_rows)
+        if u % 20 == 19:
+            session.commit()
+            report('reviews', counts['reviews'])
+    session.commit()
+
+    # ============ 看板：分享者、复盘日、干货、点赞 ============
+    sharer_count = BASE_SHARERS * scale
+    sharer_ids = _insert_returning(session, Sharer, [
+        {'name': f"{NAMES[i % len(NAMES)]}{i // len(NAMES) or ''}", 'avatar_url': None, 'created_at': datetime.utcnow()}
+        for i in range(sharer_count)
+    ])
+    # 活跃度长尾：少数分享者几乎每天都在
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(sharer_count)]
+
+    day_count = BASE_REVIEW_DAYS * scale
+    day_dates = [today - timedelta(days=d) for d in range(day_count)]
+    day_ids = _insert_returning(session, ReviewDay, [
+        {'date': day_date, 'title': f"{day_date.isoformat()} 复盘", 'raw_content': '', 'created_at': datetime.utcnow()}
+        for day_date in day_dates
+    ])
+    counts['sharers'], counts['review_days'] = len(sharer_ids), len(day_ids)
+    report('review_days', len(day_ids))
+
+    counts['insights'] = counts['likes'] = 0
+    for start in range(0, day_count, 100):
+        insight_rows = []
+        for day_id, day_date in zip(day_ids[start:start + 100], day_dates[start:start + 100]):
+            present = set(rng.choices(range(sharer_count), weights=weights, k=rng.randint(5, 12)))
+            for s in present:
+                emoji = rng.choice(EMOJIS)
+                for _ in range(rng.randint(1, 4)):
+                    insight_rows.append({
+                        'day_id': day_id, 'sharer_id': sharer_ids[s], 'emoji': emoji,
+                        'topic': ''.join(rng.choices(WORDS, k=rng.randint(1, 3))),
+                        'content': paragraph(rng, (1, 3)), 'likes': 0,
+                        'created_at': datetime.combine(day_date, datetime.min.time())
+                    })
+        insight_ids = _insert_returning(session, Insight, insight_rows)
+
+        like_rows = []
+        for insight_id, row in zip(insight_ids, insight_rows):
+            likes = min(int(rng.expovariate(1 / 5)), 200)
+            row['likes'] = likes
+            like_rows.extend(
+                {'insight_id': insight_id, 'liker_nickname': None, 'device_id': f'device{n:06d}',
+                 'created_at': row['created_at'] + timedelta(hours=20, seconds=n)}
+                for n in rng.sample(range(5000 * scale), likes)
+            )
+        _insert(session, Like, like_rows)
+        liked = [
+            {'_id': insight_id, '_likes': row['likes']}
+            for insight_id, row in zip(insight_ids, insight_rows) if row['likes']
+        ]
+        if liked:
+            table = Insight.__table__
+            session.execute(
+                update(table).where(table.c.id == bindparam('_id')).values(likes=bindparam('_likes')), liked
+            )
+        session.commit()
+        counts['insights'] += len(insight_ids)
+        counts['likes'] += len(like_rows)
+        report('insights', counts['insights'])
+
+    # ============ 派生表 ============
+    text_index.rebuild(session)
+    hot_rank.rebuild(session)
+    refresh_sharer_stats(session)
+    session.commit()
+    report('derived', counts['insights'])
+    return counts
+
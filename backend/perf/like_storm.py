@@ -0,0 +1,106 @@
+"""
+5分钟快速复盘 - 点赞风暴压测脚本
+================================
+模拟复盘直播时大量设备同时点赞（含重复双击）
+用法:
+    python perf/like_storm.py --base-url http://localhost:5000 --date 2024-01-15 --devices 500
+
+AI维护注意点:
+1. 只依赖标准库，可直接在部署机上运行
+2. 每个设备对每条干货连点 --taps 次，验证重复点击不会产生5xx
+3. 结束后核对每条干货的点赞数 = 设备数（需等待计数器落库周期）
+4. 出现任何错误时以非0退出码结束，便于接入CI
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _request(method, url, payload=None):
+    """发送请求，返回 (状态码, 响应体, 耗时ms)"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            body = json.loads(resp.read() or b'{}')
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        body, status = {}, e.code
+    except Exception:
+        body, status = {}, 0  # 连接失败/超时
+    return status, body, (time.perf_counter() - start) * 1000
+
+
+def run(base_url, review_date, devices, taps, concurrency, settle):
+    status, board, _ = _request('GET', f"{base_url}/api/viz/reviews/{review_date}")
+    if status != 200:
+        print(f"获取看板失败：HTTP {status}")
+        return 1
+    insight_ids = [i['id'] for s in board['sharers'] for i in s['insights']]
+    before = {i['id']: i['likes'] for s in board['sharers'] for i in s['insights']}
+
+    jobs = [
+        (insight_id, f"storm_{review_date}_{n}")
+        for n in range(devices)
+        for insight_id in insight_ids
+        for _ in range(taps)
+    ]
+    print(f"{len(insight_ids)} 条干货 × {devices} 台设备 × {taps} 次点击 = {len(jobs)} 个请求")
+
+    def tap(job):
+        insight_id, device_id = job
+        return _request('POST', f"{base_url}/api/viz/like",
+                        {'insight_id': insight_id, 'device_id': device_id})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(tap, jobs))
+    elapsed = time.perf_counter() - started
+
+    statuses = Counter(r[0] for r in results)
+    accepted = sum(1 for r in results if r[0] == 200 and r[1].get('success'))
+    latencies = sorted(r[2] for r in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+
+    print(f"耗时 {elapsed:.2f}s，吞吐 {len(jobs) / elapsed:.0f} req/s")
+    print(f"状态码分布：{dict(statuses)}")
+    print(f"成功点赞 {accepted}，期望 {len(insight_ids) * devices}")
+    print(f"延迟 p50={statistics.median(latencies):.1f}ms p95={p95:.1f}ms")
+
+    # 等待各worker计数器落库后核对总数
+    time.sleep(settle)
+    mismatched = 0
+    for insight_id in insight_ids:
+        _, detail, _ = _request('GET', f"{base_url}/api/viz/likes/{insight_id}")
+        if detail.get('total', 0) - before[insight_id] != devices:
+            mismatched += 1
+    print(f"点赞明细核对：{len(insight_ids) - mismatched}/{len(insight_ids)} 条一致")
+
+    errors = sum(n for code, n in statuses.items() if code != 200)
+    return 1 if errors or mismatched or accepted != len(insight_ids) * devices else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='点赞风暴压测')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--date', required=True, help='压测的复盘日期(YYYY-MM-DD)')
+    parser.add_argument('--devices', type=int, default=500)
+    parser.add_argument('--taps', type=int, default=2, help='每台设备对每条干货的点击次数')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--settle', type=float, default=3.0, help='核对前等待计数器落库的秒数')
+    args = parser.parse_args()
+    sys.exit(run(args.base_url.rstrip('/'), args.date, args.devices,
+                 args.taps, args.concurrency, args.settle))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+5分钟快速复盘 - 录制流量回放
+============================
+把 utils/traffic_capture.py 录制的线上流量按原始到达间隔（可N倍速）回放到本地实例，输出各接口延迟分布
+用法:
+    python perf/replay.py instance/traffic.log* --base-url http://localhost:5000 --speed 1
+    python perf/replay.py traffic.log --speed 5 --users 20 --route '^/api/reviews' --output replay.json
+
+AI维护注意点:
+1. 只依赖标准库，可直接在部署机上运行；目标实例通常是 flask perf generate 生成的压测库
+2. 开环回放：每个请求在 (ts - 首个ts) / speed 时刻发出，不等前一个请求返回，
+   原始并发与突发（周一早打卡、晚间看板点赞）随之重现；发送滞后（lag）过大说明回放机本身成了瓶颈
+3. 录制中的用户假名按首次出现顺序映射到本地用户id 1..--users，用 --jwt-secret（须与目标实例 JWT_SECRET_KEY 一致）
+   本地签发令牌；review_id/template_id 假名映射到该本地用户自己的复盘/模板（回放前预取，不计入计时）
+4. 无法重放的请求（未匹配路由、非JSON请求体如头像上传、未录请求体的 /api/auth/*）跳过并计数；
+   脱敏后的字符串为等长占位，依赖原文的接口回放时会走失败分支，以状态码分布为准
+5. 报告中"录制"列为线上该接口的耗时，"回放"列为本地实测，二者对照看性能改动在真实负载下的效果
+"""
+
+import argparse
+import base64
+import glob
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+_ARG_RE = re.compile(r'<(?:[^:<>]+:)?([^<>]+)>')
+
+
+# ============ 读取录制 ============
+
+def load(patterns):
+    """读取录制文件（含轮转出的历史文件），按到达时间排序"""
+    paths = sorted({path for pattern in patterns for path in (glob.glob(pattern) or [pattern])})
+    entries = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+    entries.sort(key=lambda entry: entry['ts'])
+    return entries
+
+
+# ============ 身份与id映射 ============
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def mint_token(user_id, secret, ttl=24 * 3600):
+    """签发与 flask_jwt_extended 兼容的HS256访问令牌"""
+    now = int(time.time())
+    header = {'alg': 'HS256', 'typ': 'JWT'}
+    claims = {'fresh': False, 'iat': now, 'jti': str(uuid.uuid4()), 'type': 'access',
+              'sub': str(user_id), 'nbf': now, 'exp': now + ttl}
+    signing_input = _b64(json.dumps(header, separators=(',', ':')).encode()) + '.' + \
+        _b64(json.dumps(claims, separators=(',', ':')).encode())
+    signature = hmac.new(secret.encode('utf-8'), signing_input.encode('ascii'), hashlib.sha256).digest()
+    return signing_input + '.' + _b64(signature)
+
+
+def _get_json(url, token):
+    req = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return json.loads(resp.read() or b'{}')
+    except (urllib.error.URLError, ValueError):
+        return {}
+
+
+class IdResolver:
+    """把录制中的假名id映射为目标实例上对应本地用户自己的数据id"""
+
+    def __init__(self, base_url, secret, users):
+        self.base_url = base_url
+        self.secret = secret
+        self.users = users
+        self.actors = {}        # 假名 -> 本地用户id
+        self.tokens = {}        # 本地用户id -> 令牌
+        self.owned = {}         # (本地用户id, 键) -> [id, ...]
+
+    def user_for(self, actor):
+        if actor is None:
+            return None
+        if actor not in self.actors:
+            self.actors[actor] = len(self.actors) % self.users + 1
+        return self.actors[actor]
+
+    def token_for(self, user_id):
+        if user_id not in self.tokens:
+            self.tokens[user_id] = mint_token(user_id, self.secret)
+        return self.tokens[user_id]
+
+    def _owned_ids(self, user_id, key):
+        cache_key = (user_id, key)
+        if cache_key not in self.owned:
+            token = self.token_for(user_id)
+            if key == 'review_id':
+                data = _get_json(f"{self.base_url}/api/reviews?per_page=50", token)
+                ids = [review['id'] for review in data.get('reviews', [])]
+            else:
+                data = _get_json(f"{self.base_url}/api/templates", token)
+                ids = [template['id'] for template in data.get('templates', [])]
+            self.owned[cache_key] = ids
+        return self.owned[cache_key]
+
+    def resolve(self, value, key, user_id):
+        """假名 → 本地id；无法映射的保持原值（请求会以4xx体现在报告中）"""
+        if not (isinstance(value, str) and value.startswith('#')) or user_id is None:
+            return value
+        if key not in ('review_id', 'template_id'):
+            return value
+        ids = self._owned_ids(user_id, key)
+        return ids[int(value[1:], 16) % len(ids)] if ids else value
+
+    def resolve_body(self, value, user_id, key=None):
+        if isinstance(value, dict):
+            return {k: self.resolve_body(v, user_id, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve_body(v, user_id, key) for v in value]
+        return self.resolve(value, key, user_id)
+
+
+def prepare(entries, resolver):
+    """
+    把录制条目转换为请求任务
+
+    Returns:
+        tuple: ([(偏移秒, 方法, 路径, 请求体bytes, 请求头, 路由, 录制耗时ms), ...], 跳过原因计数)
+    """
+    jobs, skipped = [], Counter()
+    if not entries:
+        return jobs, skipped
+    origin = entries[0]['ts']
+    for entry in entries:
+        if entry['route'] is None:
+            skipped['未匹配路由'] += 1
+            continue
+        if entry['body_kind'] == 'other':
+            skipped['非JSON请求体'] += 1
+            continue
+        if entry['body_kind'] == 'omitted':
+            skipped['请求体未录制（认证接口）'] += 1
+            continue
+        user_id = resolver.user_for(entry['actor'])
+        args = entry['args']
+        path = _ARG_RE.sub(
+            lambda m: urllib.parse.quote(str(resolver.resolve(args.get(m.group(1)), m.group(1), user_id))),
+            entry['route']
+        )
+        query = {key: [resolver.resolve(v, key, user_id) for v in values] for key, values in entry['query'].items()}
+        if query:
+            path += '?' + urllib.parse.urlencode(query, doseq=True)
+
+        headers = {}
+        if user_id is not None:
+            headers['Authorization'] = f'Bearer {resolver.token_for(user_id)}'
+        data = None
+        if entry['body'] is not None:
+            data = json.dumps(resolver.resolve_body(entry['body'], user_id), ensure_ascii=False).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        jobs.append((entry['ts'] - origin, entry['method'], path, data, headers,
+                     f"{entry['method']} {entry['route']}", entry['ms']))
+    return jobs, skipped
+
+
+# ============ 回放 ============
+
+def replay(base_url, jobs, speed, max_workers):
+    """
+    开环回放
+
+    Returns:
+        tuple: ([(路由, 状态码, 耗时ms, 发送滞后ms), ...], 总用时秒, 回放峰值并发)
+    """
+    results = [None] * len(jobs)
+    inflight = [0, 0]   # 当前并发, 峰值并发
+    lock = threading.Lock()
+
+    def send(index, scheduled):
+        _, method, path, data, headers, route, _ = jobs[index]
+        lag = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            inflight[0] += 1
+            inflight[1] = max(inflight[1], inflight[0])
+        req = urllib.request.Request(base_url + path, data=data, method=method, headers=headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                resp.read()
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        except Exception:
+            status = 0  # 连接失败/超时
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            inflight[0] -= 1
+        results[index] = (route, status, elapsed, lag)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for index, job in enumerate(jobs):
+            scheduled = started + job[0] / speed
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, index, scheduled)
+    return results, time.perf_counter() - started, inflight[1]
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def report(jobs, entries, results, elapsed, peak, skipped):
+    captured = defaultdict(list)
+    for job in jobs:
+        captured[job[5]].append(job[6])
+    replayed, statuses = defaultdict(list), defaultdict(Counter)
+    for route, status, ms, _ in results:
+        replayed[route].append(ms)
+        statuses[route][status] += 1
+
+    summary = {}
+    for route in sorted(replayed, key=lambda r: -len(replayed[r])):
+        values, original = sorted(replayed[route]), sorted(captured[route])
+        summary[route] = {
+            'count': len(values),
+            'status': dict(statuses[route]),
+            'captured_p50': round(_percentile(original, 0.5), 2),
+            'captured_p95': round(_percentile(original, 0.95), 2),
+            'p50': round(_percentile(values, 0.5), 2),
+            'p95': round(_percentile(values, 0.95), 2),
+            'p99': round(_percentile(values, 0.99), 2),
+            'max': round(values[-1], 2)
+        }
+
+    width = max((len(route) for route in summary), default=10)
+    print(f"{'接口':<{width}} | {'次数':>6} | {'录制p50/p95':>14} | {'回放p50/p95/p99/max':>24} | 状态码")
+    for route, item in summary.items():
+        print(f"{route:<{width}} | {item['count']:>6} | "
+              f"{item['captured_p50']:>6.1f}/{item['captured_p95']:<7.1f} | "
+              f"{item['p50']:>6.1f}/{item['p95']:.1f}/{item['p99']:.1f}/{item['max']:<6.1f} | {item['status']}")
+
+    lags = sorted(result[3] for result in results)
+    span = entries[-1]['ts'] - entries[0]['ts'] if entries else 0
+    captured_peak = max((entry.get('inflight', 0) for entry in entries), default=0)
+    print(f"\n回放 {len(results)} 个请求，用时 {elapsed:.1f}s（录制时长 {span:.1f}s），吞吐 {len(results) / elapsed:.1f} req/s")
+    print(f"峰值并发：录制（单进程）{captured_peak}，回放 {peak}；发送滞后 p95={_percentile(lags, 0.95):.1f}ms")
+    if skipped:
+        print(f"跳过：{dict(skipped)}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='录制流量回放')
+    parser.add_argument('logs', nargs='+', help='录制文件（支持通配符，如 instance/traffic.log*）')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--speed', type=float, default=1.0, help='回放倍速，2表示到达间隔缩短一半')
+    parser.add_argument('--users', type=int, default=20, help='目标实例上用于承接录制用户的本地用户数（id 1..N）')
+    parser.add_argument('--jwt-secret', default=os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production')
+    parser.add_argument('--route', help='只回放匹配该正则的路由')
+    parser.add_argument('--limit', type=int, help='只回放前N个请求')
+    parser.add_argument('--max-workers', type=int, default=256, help='回放线程上限（应大于预期峰值并发）')
+    parser.add_argument('--output', help='报告另存为JSON')
+    args = parser.parse_args()
+
+    entries = load(args.logs)
+    if args.route:
+        pattern = re.compile(args.route)
+        entries = [entry for entry in entries if entry['route'] and pattern.search(entry['route'])]
+    if args.limit:
+        entries = entries[:args.limit]
+    if not entries:
+        print("录制文件中没有可回放的请求")
+        return 1
+
+    base_url = args.base_url.rstrip('/')
+    resolver = IdResolver(base_url, args.jwt_secret, args.users)
+    jobs, skipped = prepare(entries, resolver)
+    print(f"{len(entries)} 条录制，{len(resolver.actors)} 个用户，按 {args.speed:g}x 回放 {len(jobs)} 个请求…")
+
+    results, elapsed, peak = replay(base_url, jobs, args.speed, args.max_workers)
+    summary = report(jobs, entries, results, elapsed, peak, skipped)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    # 连接失败/超时说明目标实例已过载或不可用
+    failures = sum(item['status'].get(0, 0) for item in summary.values())
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
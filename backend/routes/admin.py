@@ -0,0 +1,77 @@
+"""
+5分钟快速复盘 - 管理诊断路由
+============================
+AI维护注意点:
+1. 所有接口需管理员权限（users.is_admin），见utils/admin.py
+2. 只读诊断数据，不修改业务数据
+3. 剖析结果文件名须匹配 PROFILE_NAME_RE，防止路径穿越
+"""
+
+import os
+
+from flask import Blueprint, current_app, jsonify, request, send_from_directory
+
+from utils.admin import admin_required
+from utils import slow_queries, request_profiler
+
+# 创建蓝图
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+@admin_required
+def get_slow_queries():
+    """
+    慢查询排行（按总耗时）
+    
+    GET /api/admin/slow-queries?limit=20
+    
+    AI维护注意点: 汇总所有worker写入的日志；未启用慢查询日志时返回空列表
+    """
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    log = current_app.extensions.get('slow_queries')
+    if log is None:
+        return jsonify({"enabled": False, "fingerprints": []}), 200
+    
+    return jsonify({
+        "enabled": True,
+        "threshold_ms": log.threshold * 1000,
+        "fingerprints": slow_queries.top_fingerprints(log.path, limit)
+    }), 200
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+@admin_required
+def list_profiles():
+    """
+    已保存的请求剖析结果（?__profile=store 产生），按时间倒序
+    
+    GET /api/admin/profiles
+    """
+    directory = request_profiler.profile_directory(current_app)
+    names = sorted(
+        (name for name in os.listdir(directory) if request_profiler.PROFILE_NAME_RE.match(name)),
+        reverse=True
+    ) if os.path.isdir(directory) else []
+    
+    return jsonify({
+        "profiles": [
+            {"file": name, "size": os.path.getsize(os.path.join(directory, name))}
+            for name in names[:200]
+        ]
+    }), 200
+
+
+@admin_bp.route('/profiles/<filename>', methods=['GET'])
+@admin_required
+def get_profile(filename):
+    """
+    下载剖析结果（speedscope JSON）
+    
+    GET /api/admin/profiles/{文件名}
+    """
+    if not request_profiler.PROFILE_NAME_RE.match(filename):
+        return jsonify({"error": "文件名不合法"}), 400
+    return send_from_directory(
+        request_profiler.profile_directory(current_app), filename, mimetype='application/json'
+    )
@@ -17,6 +17,7 @@ from models.review import Review, ReviewAnswer
 from models.template import ReviewTemplate
 from models.user import User
 from extensions import db
+from utils.query_budget import query_budget
 
 # 创建蓝图
 reviews_bp = Blueprint('reviews', __name__)
@@ -24,6 +25,7 @@ reviews_bp = Blueprint('reviews', __name__)
 
 @reviews_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_reviews():
     """
     获取复盘列表
@@ -76,8 +78,14 @@ def get_reviews():
         page=page, per_page=per_page, error_out=False
     )
     
+    # 答案数一次GROUP BY查出，不逐条COUNT
+    answer_counts = Review.answer_counts([r.id for r in pagination.items])
+    
     return jsonify({
-        "reviews": [r.to_dict(include_answers=False) for r in pagination.items],
+        "reviews": [
+            r.to_dict(include_answers=False, answer_count=answer_counts.get(r.id, 0))
+            for r in pagination.items
+        ],
         "total": pagination.total,
         "pages": pagination.pages,
         "current_page": page,
@@ -87,6 +95,7 @@ def get_reviews():
 
 @reviews_bp.route('/<int:review_id>', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_review(review_id):
     """
     获取单个复盘详情
@@ -169,6 +178,8 @@ def create_review():
         review_type=template.template_type
     ).first()
     
+    replaced_template_id = existing_review.template_id if existing_review else None
+    
     try:
         if existing_review:
             # 删除旧复盘及其答案
@@ -212,14 +223,19 @@ def create_review():
         db.session.flush()  # 确保answers已写入
         review.calculate_word_count()
         
-        # 增加模板使用计数
-        template.increment_use_count()
-        
         # 更新用户连续打卡统计(可扩展)
         # AI维护注意点: 可在此触发成就系统
         
         db.session.commit()
         
+        # 模板使用计数（写回缓冲，提交成功后再计数）
+        # AI维护注意点: 计数=复盘条数，覆盖同模板的当日复盘条数不变，不计数
+        if replaced_template_id is None:
+            template.increment_use_count()
+        elif replaced_template_id != template.id:
+            template.increment_use_count()
+            ReviewTemplate.adjust_use_count(replaced_template_id, -1)
+        
         return jsonify({
             "message": "复盘保存成功" if not existing_review else "复盘更新成功",
             "review": review.to_dict(include_answers=True)
@@ -232,6 +248,7 @@ def create_review():
 
 @reviews_bp.route('/today', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_today_review():
     """
     获取今日复盘
@@ -259,6 +276,7 @@ def get_today_review():
 
 @reviews_bp.route('/checkin', methods=['GET'])
 @jwt_required()
+@query_budget(1)
 def get_checkin_status():
     """
     获取打卡状态(最近7天)
@@ -332,9 +350,13 @@ def delete_review(review_id):
         return jsonify({"error": "无权删除此复盘"}), 403
     
     try:
+        template_id = review.template_id
         db.session.delete(review)
         db.session.commit()
         
+        if template_id is not None:
+            ReviewTemplate.adjust_use_count(template_id, -1)
+        
         return jsonify({"message": "复盘已删除"}), 200
         
     except Exception as e:
@@ -17,6 +17,8 @@ import calendar
 from models.review import Review, ReviewAnswer
 from models.template import ReviewTemplate
 from extensions import db
+from utils.query_budget import query_budget
+from utils.sqlite_profile import read_only
 
 # 创建蓝图
 stats_bp = Blueprint('stats', __name__)
@@ -24,6 +26,8 @@ stats_bp = Blueprint('stats', __name__)
 
 @stats_bp.route('/overview', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(5)
 def get_overview_stats():
     """
     获取复盘概览统计
@@ -74,32 +78,37 @@ def calculate_streak(user_id):
     """
     计算连续打卡天数
     
-    AI维护注意点: 从昨天开始往前计算，今天已打卡则+1
+    AI维护注意点:
+    1. 从昨天开始往前计算，今天已打卡则+1
+    2. 一条查询按日期倒序取出打卡日，遇到断档即停止读取（不再逐天查询）
     """
     today = date.today()
     streak = 0
-    check_date = today
-    
-    # 检查今天是否已打卡
-    if Review.query.filter_by(user_id=user_id, review_date=today).first():
-        streak = 1
-        check_date = today - timedelta(days=1)
-    else:
-        check_date = today - timedelta(days=1)
-    
-    # 往前计算
-    while True:
-        if Review.query.filter_by(user_id=user_id, review_date=check_date).first():
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
+    check_date = today - timedelta(days=1)
+    
+    review_dates = db.session.query(Review.review_date).filter(
+        Review.user_id == user_id,
+        Review.review_date <= today
+    ).distinct().order_by(Review.review_date.desc())
+    
+    for (review_date,) in review_dates:
+        # 检查今天是否已打卡
+        if review_date == today:
+            streak = 1
+            continue
+        # 往前计算
+        if review_date != check_date:
             break
+        streak += 1
+        check_date -= timedelta(days=1)
     
     return streak
 
 
 @stats_bp.route('/calendar', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(1)
 def get_calendar_stats():
     """
     获取日历热力图数据
@@ -150,6 +159,8 @@ def get_calendar_stats():
 
 @stats_bp.route('/trends', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(1)
 def get_trends_stats():
     """
     获取复盘趋势数据
@@ -202,6 +213,8 @@ def get_trends_stats():
 
 @stats_bp.route('/fields', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(1)
 def get_field_stats():
     """
     获取字段统计(用于评分类字段分析)
@@ -223,7 +236,9 @@ def get_field_stats():
     start_date = end_date - timedelta(days=days-1)
     
     # 查询该字段的答案
-    answers = db.session.query(ReviewAnswer, Review).join(Review).filter(
+    answers = db.session.query(ReviewAnswer, Review).join(Review).options(
+        db.undefer(ReviewAnswer.answer_text)
+    ).filter(
         Review.user_id == current_user_id,
         Review.review_date >= start_date,
         Review.review_date <= end_date,
@@ -259,6 +274,8 @@ def get_field_stats():
 
 @stats_bp.route('/wordcloud', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(2)
 def get_wordcloud_data():
     """
     获取词云数据(简单频率统计)
@@ -270,10 +287,14 @@ def get_wordcloud_data():
     current_user_id = get_jwt_identity()
     limit = request.args.get('limit', 50, type=int)
     
-    # 获取最近100条复盘的文本内容
+    # 获取最近100条复盘的文本内容（答案一次IN查询取回）
     recent_reviews = Review.query.filter_by(user_id=current_user_id).order_by(
         Review.created_at.desc()
     ).limit(100).all()
+    answers = ReviewAnswer.query.options(db.undefer(ReviewAnswer.answer_text)).filter(
+        ReviewAnswer.review_id.in_([review.id for review in recent_reviews]),
+        ReviewAnswer.field_type.in_(['text', 'textarea'])
+    ).all() if recent_reviews else []
     
     # 简单词频统计(中文需要jieba分词，这里简化处理)
     word_freq = {}
@@ -281,14 +302,13 @@ def get_wordcloud_data():
                  '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着',
                  '没有', '看', '好', '自己', '这', '那', '什么', '怎么', '今天', '明天'}
     
-    for review in recent_reviews:
-        for answer in review.answers.all():
-            if answer.answer_text and answer.field_type in ['text', 'textarea']:
-                text = answer.answer_text
-                # 简单分割(实际应使用jieba)
-                words = [w for w in text if len(w) >= 2 and w not in stopwords]
-                for word in words:
-                    word_freq[word] = word_freq.get(word, 0) + 1
+    for answer in answers:
+        if answer.answer_text:
+            text = answer.answer_text
+            # 简单分割(实际应使用jieba)
+            words = [w for w in text if len(w) >= 2 and w not in stopwords]
+            for word in words:
+                word_freq[word] = word_freq.get(word, 0) + 1
     
     # 取高频词
     sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:limit]
@@ -302,6 +322,8 @@ def get_wordcloud_data():
 
 @stats_bp.route('/templates', methods=['GET'])
 @jwt_required()
+@read_only
+@query_budget(1)
 def get_template_usage():
     """
     获取模板使用统计
@@ -15,6 +15,7 @@ from sqlalchemy import or_
 from models.template import ReviewTemplate, TemplateField
 from models.user import User
 from extensions import db
+from utils.query_budget import query_budget
 
 # 创建蓝图
 templates_bp = Blueprint('templates', __name__)
@@ -26,6 +27,7 @@ FIELD_TYPES = ['text', 'textarea', 'number', 'select',
 
 @templates_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_templates():
     """
     获取模板列表
@@ -62,13 +64,19 @@ def get_templates():
         ReviewTemplate.created_at.desc()
     ).all()
     
+    # 列表只要字段数：一次 GROUP BY 计数，不取回字段行
+    field_counts = ReviewTemplate.field_counts([t.id for t in templates])
+    
     return jsonify({
-        "templates": [t.to_dict(include_fields=False) for t in templates]
+        "templates": [
+            t.to_dict(include_fields=False, field_count=field_counts.get(t.id, 0)) for t in templates
+        ]
     }), 200
 
 
 @templates_bp.route('/<int:template_id>', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_template(template_id):
     """
     获取单个模板详情
@@ -320,6 +328,7 @@ def delete_template(template_id):
 
 
 @templates_bp.route('/system', methods=['GET'])
+@query_budget(2)
 def get_system_templates():
     """
     获取系统预设模板(无需登录)
@@ -329,7 +338,8 @@ def get_system_templates():
     AI维护注意点: 用于展示页面，返回简化信息
     """
     templates = ReviewTemplate.query.filter_by(is_system=True).all()
+    fields = ReviewTemplate.fields_for([t.id for t in templates])
     
     return jsonify({
-        "templates": [t.to_dict(include_fields=True) for t in templates]
+        "templates": [t.to_dict(include_fields=True, fields=fields[t.id]) for t in templates]
     }), 200
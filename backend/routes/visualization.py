@@ -9,20 +9,34 @@ AI维护注意点:
 4. 所有接口返回格式统一，方便前端处理
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, date
 import re
 import os
+import asyncio
+import json
+from datetime import timedelta
 import uuid
 import hashlib
-from PIL import Image
-from io import BytesIO
+import base64
+from urllib.parse import quote
+from sqlalchemy import insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from flask import current_app
 
-from extensions import db
-from models.visualization import ReviewDay, Sharer, Insight, Like
+from extensions import db, counters, live_events, snapshots, writes
+from models.visualization import ReviewDay, Sharer, Insight, Like, SharerStats, HotInsight, SimilarInsight
+from utils.bloom import RecentKeyFilter
+from utils import text_index, avatar_pipeline, avatar_generator, avatar_sprite
+from utils.rollups import refresh_sharer_stats
+from utils.sqlite_profile import read_only, read_engine
+from utils.metrics import cache_lookup
+from utils import hot_rank, similar, simhash
 
 viz_router = APIRouter(prefix="/api/viz", tags=["visualization"])
 
@@ -59,6 +73,12 @@ class LikeRequest(BaseModel):
     nickname: Optional[str] = None  # 可选昵称
     device_id: str                    # 设备指纹（必填，防重复）
 
+class LikeStateRequest(BaseModel):
+    """批量查询已点赞状态请求（insight_ids 与 date 二选一）"""
+    device_id: str
+    insight_ids: Optional[List[int]] = None  # 干货id列表，位图按此顺序
+    date: Optional[str] = None               # 复盘日期，位图按干货id升序
+
 
 # ============ Markdown解析器 ============
 
@@ -273,9 +293,8 @@ async def parse_markdown(request: ParseRequest):
         review_date = request.review_date or str(date.today())
         
         # 从markdown标题提取日期（如果有）
-        date_match = re.search(r'(\d{4}[-年]\d{1,2}[-月]\d{1,2})', markdown)
-        if date_match:
-            extracted_date = date_match.group(1).replace('年', '-').replace('月', '-')
+        extracted_date = MarkdownParser._extract_date(markdown)
+        if extracted_date:
             review_date = extracted_date
         
         return ParseResponse(
@@ -311,8 +330,19 @@ async def save_review(
         # 检查是否已存在同一天的复盘
         existing_day = ReviewDay.query.filter_by(date=review_date).first()
         
+        # 受影响的分享者（含被覆盖掉的旧分享者），保存后重算其汇总
+        affected_sharer_ids = set()
+        
         if existing_day:
-            # 删除旧的干货数据（覆盖模式）
+            affected_sharer_ids.update(
+                row.sharer_id for row in
+                db.session.query(Insight.sharer_id).filter_by(day_id=existing_day.id).distinct()
+            )
+            # 删除旧的干货数据（覆盖模式），先删其检索索引、热度分、相似近邻与指纹
+            text_index.remove_day(db.session, existing_day.id)
+            hot_rank.remove_day(db.session, existing_day.id)
+            similar.remove_day(db.session, existing_day.id)
+            simhash.remove_day(db.session, existing_day.id)
             Insight.query.filter_by(day_id=existing_day.id).delete()
             existing_day.raw_content = markdown
         else:
@@ -326,6 +356,7 @@ async def save_review(
             db.session.flush()  # 获取day_id
         
         # 保存每个分享者的干货
+        new_insights = []
         for sharer_data in sharers_data:
             # 查找或创建分享者
             sharer = Sharer.query.filter_by(name=sharer_data.name).first()
@@ -336,6 +367,7 @@ async def save_review(
                 )
                 db.session.add(sharer)
                 db.session.flush()
+            affected_sharer_ids.add(sharer.id)
             
             # 保存干货
             for insight_item in sharer_data.insights:
@@ -348,14 +380,33 @@ async def save_review(
                     likes=0
                 )
                 db.session.add(insight)
+                new_insights.append(insight)
+        
+        # 写入主题/内容检索索引
+        db.session.flush()
+        text_index.index_insights(db.session, new_insights)
+        hot_rank.index_insights(db.session, new_insights, existing_day.date)
+        similar.fold_in(db.session, new_insights)
+        duplicate_pairs = simhash.index_insights(db.session, new_insights)
+        
+        # 同一事务内重算分享者汇总
+        refresh_sharer_stats(db.session, affected_sharer_ids)
         
         db.session.commit()
         
+        # 发布静态快照（失败不影响保存，下次刷新周期补发）
+        try:
+            snapshots.publish(existing_day)
+        except Exception as e:
+            snapshots.mark_dirty([existing_day.id])
+            current_app.logger.warning(f"看板快照发布失败：{e}")
+        
         return {
             "success": True,
             "day_id": existing_day.id,
             "message": f"成功保存 {len(sharers_data)} 位分享者的干货",
-            "url": f"/viz/{review_date}"  # 查看链接
+            "url": f"/viz/{review_date}",  # 查看链接
+            "duplicates": _describe_duplicates(duplicate_pairs)
         }
     
     except Exception as e:
@@ -363,7 +414,198 @@ async def save_review(
         raise HTTPException(status_code=500, detail=f"保存失败：{str(e)}")
 
 
+def _describe_duplicates(pairs):
+    """
+    疑似重复报告：一条查询取出双方的主题、分享者与日期
+    
+    Returns:
+        list: [{"insight_id", "topic", "sharer", "duplicate_of": {...}, "distance"}, ...]
+    """
+    if not pairs:
+        return []
+    ids = {insight_id for pair in pairs for insight_id in pair[:2]}
+    rows = db.session.query(Insight.id, Insight.topic, Sharer.name, ReviewDay.date).join(
+        Sharer, Insight.sharer_id == Sharer.id
+    ).join(
+        ReviewDay, Insight.day_id == ReviewDay.id
+    ).filter(Insight.id.in_(ids)).all()
+    info = {
+        insight_id: {
+            "insight_id": insight_id,
+            "topic": topic,
+            "sharer": name,
+            "date": day_date.strftime("%Y-%m-%d")
+        }
+        for insight_id, topic, name, day_date in rows
+    }
+    return [
+        dict(info[insight_id], duplicate_of=info[other_id], distance=d)
+        for insight_id, other_id, d in pairs
+        if insight_id in info and other_id in info
+    ]
+
+
+# 区间查询最大天数
+MAX_RANGE_DAYS = 92
+
+
+@viz_router.get("/reviews")
+@read_only
+async def get_reviews_in_range(
+    from_date: str = Query(..., alias="from"),
+    to_date: str = Query(..., alias="to")
+):
+    """
+    按日期区间获取多天看板（周/月视图）
+    
+    GET /api/viz/reviews?from=2024-01-01&to=2024-01-31
+    
+    AI维护注意点:
+    1. 一条JOIN查询取区间内全部干货、分享者与点赞数，按 日期→分享者→干货 排序
+    2. 逐行读取（yield_per）并按天流式输出JSON，内存占用与区间长度无关
+    3. 流式生成器在线程池中分段执行，不依赖Flask应用上下文，直接使用引擎连接
+    4. 每天的结构与 /reviews/{date} 的 sharers 一致，区间最长 MAX_RANGE_DAYS 天
+    """
+    try:
+        start = date.fromisoformat(from_date)
+        end = date.fromisoformat(to_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式错误，应为YYYY-MM-DD")
+    if end < start:
+        raise HTTPException(status_code=400, detail="结束日期不能早于开始日期")
+    if end - start >= timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(status_code=400, detail=f"区间最长{MAX_RANGE_DAYS}天")
+    
+    stmt = select(
+        ReviewDay.date, ReviewDay.title,
+        Sharer.id, Sharer.name, Sharer.avatar_url,
+        Insight.id, Insight.emoji, Insight.topic, Insight.content, Insight.likes
+    ).join(
+        Insight, Insight.day_id == ReviewDay.id
+    ).join(
+        Sharer, Insight.sharer_id == Sharer.id
+    ).where(
+        ReviewDay.date >= start,
+        ReviewDay.date <= end
+    ).order_by(
+        ReviewDay.date, Sharer.id, Insight.id
+    )
+    # 生成器在接口返回后才执行，此处先取定只读引擎
+    engine = read_engine(current_app, db)
+    
+    def generate():
+        with engine.connect() as conn:
+            rows = conn.execution_options(yield_per=500).execute(stmt)
+            
+            yield f'{{"success": true, "from": "{start}", "to": "{end}", "days": ['
+            
+            day_payload = None
+            sharer_payload = None
+            total_insights = 0
+            first_day = True
+            
+            for (day_date, title, sharer_id, name, avatar_url,
+                 insight_id, emoji, topic, content, likes) in rows:
+                if day_payload is None or day_payload["date"] != day_date.isoformat():
+                    if day_payload is not None:
+                        yield ("" if first_day else ",") + json.dumps(day_payload, ensure_ascii=False)
+                        first_day = False
+                    day_payload = {"date": day_date.isoformat(), "title": title, "sharers": []}
+                    sharer_payload = None
+                
+                if sharer_payload is None or sharer_payload["id"] != sharer_id:
+                    sharer_payload = {
+                        "id": sharer_id,
+                        "name": name,
+                        "emoji": emoji,  # 使用干货中的表情
+                        "avatar_url": avatar_url or _default_avatar_url(name),
+                        "insights": []
+                    }
+                    day_payload["sharers"].append(sharer_payload)
+                
+                sharer_payload["insights"].append({
+                    "id": insight_id,
+                    "topic": topic,
+                    "content": content,
+                    "likes": counters.read(Insight.likes, insight_id, likes)
+                })
+                total_insights += 1
+            
+            if day_payload is not None:
+                yield ("" if first_day else ",") + json.dumps(day_payload, ensure_ascii=False)
+            
+            yield f'], "total_insights": {total_insights}}}'
+    
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+def _render_board(day: ReviewDay) -> dict:
+    """
+    渲染一天的看板数据（看板接口与静态快照共用）
+    
+    AI维护注意点: 快照文件与接口响应必须一致，修改结构只改这里
+    """
+    review_date = day.date.strftime("%Y-%m-%d")
+    
+    # 查询所有干货（JOIN分享者信息）
+    insights = db.session.query(
+        Insight, Sharer
+    ).join(
+        Sharer, Insight.sharer_id == Sharer.id
+    ).options(
+        db.undefer(Insight.content)
+    ).filter(
+        Insight.day_id == day.id
+    ).all()
+    
+    # 按分享者聚合
+    sharers_map = {}
+    members = []
+    for insight, sharer in insights:
+        if sharer.name not in sharers_map:
+            members.append((sharer.id, sharer.name, sharer.avatar_url))
+            sharers_map[sharer.name] = {
+                "id": sharer.id,
+                "name": sharer.name,
+                "emoji": insight.emoji,  # 使用干货中的表情
+                "avatar_url": sharer.avatar_url or _default_avatar_url(sharer.name),
+                "insights": []
+            }
+        
+        sharers_map[sharer.name]["insights"].append({
+            "id": insight.id,
+            "topic": insight.topic,
+            "content": insight.content,
+            "likes": counters.read(Insight.likes, insight.id, insight.likes)
+        })
+    
+    # 头像雪碧图偏移（版本号随成员头像变化）
+    offsets = avatar_sprite.layout(members)
+    columns, rows = avatar_sprite.grid(members)
+    for sharer_data in sharers_map.values():
+        sharer_data["sprite_offset"] = offsets[sharer_data["id"]]
+    
+    return {
+        "success": True,
+        "date": review_date,
+        "title": day.title,
+        "sharers": list(sharers_map.values()),
+        "total_insights": len(insights),
+        "avatar_sprite": {
+            "url": f"/api/viz/reviews/{review_date}/avatars.webp?v={avatar_sprite.sprite_version(members)}",
+            "cell_size": avatar_sprite.CELL_SIZE,
+            "columns": columns,
+            "rows": rows
+        }
+    }
+
+
+# 看板静态快照使用同一渲染函数
+snapshots.set_renderer(_render_board)
+
+
 @viz_router.get("/reviews/{review_date}")
+@read_only
 async def get_review_by_date(review_date: str):
     """
     按日期获取复盘数据（人物卡片格式）
@@ -372,6 +614,7 @@ async def get_review_by_date(review_date: str):
     1. 使用JOIN查询优化性能
     2. 按分享者聚合干货
     3. 返回前端可直接渲染的数据结构
+    4. avatar_sprite + sprite_offset 供前端用一张雪碧图渲染全部头像
     """
     try:
         # 查找复盘日
@@ -379,41 +622,106 @@ async def get_review_by_date(review_date: str):
         if not day:
             raise HTTPException(status_code=404, detail="该日期暂无复盘数据")
         
-        # 查询所有干货（JOIN分享者信息）
-        insights = db.session.query(
-            Insight, Sharer
+        return _render_board(day)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"查询失败：{str(e)}")
+
+
+# SSE心跳间隔（秒），防止代理断开空闲连接
+EVENTS_KEEPALIVE = 15
+
+
+@viz_router.get("/reviews/{review_date}/events")
+async def stream_review_events(review_date: str):
+    """
+    看板实时点赞推送（Server-Sent Events）
+    
+    GET /api/viz/reviews/{date}/events
+    
+    事件格式:
+    event: likes
+    data: {"likes": {"12": 35, "15": 8}}
+    
+    AI维护注意点:
+    1. 推送点赞总数，前端取 max(本地值, 推送值)，无需再刷新整个看板
+    2. 订阅进程内事件总线（utils/live_events.py），250ms合并一次，与观众人数无关
+    3. 只在建立连接时查一次复盘日，之后不再访问业务库
+    """
+    day_id = db.session.query(ReviewDay.id).filter_by(date=review_date).scalar()
+    if day_id is None:
+        raise HTTPException(status_code=404, detail=f"未找到 {review_date} 的复盘数据")
+    
+    queue = live_events.subscribe(day_id)
+    
+    async def generate():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: likes\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            live_events.unsubscribe(day_id, queue)
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@viz_router.get("/reviews/{review_date}/avatars.webp")
+@read_only
+async def get_review_avatar_sprite(
+    review_date: str,
+    v: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    看板头像雪碧图（一张WebP包含当天所有分享者头像）
+    
+    AI维护注意点:
+    1. 偏移量见看板接口的 sharers[].sprite_offset，网格单元 avatar_sprite.cell_size 像素
+    2. 按成员头像版本哈希缓存（utils/avatar_sprite.py），只有头像变化才重新拼接
+    3. 带版本参数 v 且与当前版本一致时返回 immutable 长缓存，否则每次校验ETag
+    """
+    try:
+        day = ReviewDay.query.filter_by(date=review_date).first()
+        if not day:
+            raise HTTPException(status_code=404, detail="该日期暂无复盘数据")
+        
+        members = db.session.query(
+            Sharer.id, Sharer.name, Sharer.avatar_url
         ).join(
-            Sharer, Insight.sharer_id == Sharer.id
+            Insight, Insight.sharer_id == Sharer.id
         ).filter(
             Insight.day_id == day.id
-        ).all()
-        
-        # 按分享者聚合
-        sharers_map = {}
-        for insight, sharer in insights:
-            if sharer.name not in sharers_map:
-                sharers_map[sharer.name] = {
-                    "id": sharer.id,
-                    "name": sharer.name,
-                    "emoji": insight.emoji,  # 使用干货中的表情
-                    "avatar_url": sharer.avatar_url or f"/static/avatars/default/{sharer.name[0]}.png",
-                    "insights": []
-                }
-            
-            sharers_map[sharer.name]["insights"].append({
-                "id": insight.id,
-                "topic": insight.topic,
-                "content": insight.content,
-                "likes": insight.likes
-            })
+        ).distinct().all()
+        members = [tuple(m) for m in members]
         
-        return {
-            "success": True,
-            "date": review_date,
-            "title": day.title,
-            "sharers": list(sharers_map.values()),
-            "total_insights": len(insights)
-        }
+        version = avatar_sprite.sprite_version(members)
+        etag = f'"{version}"'
+        headers = {"ETag": etag}
+        if v == version:
+            headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            headers["Cache-Control"] = "public, max-age=0, must-revalidate"
+        
+        if if_none_match == etag:
+            return Response(status_code=304, headers=headers)
+        
+        # 拼接在线程池中执行，不阻塞事件循环
+        static_dir = os.path.join(os.path.dirname(__file__), '..', 'static')
+        loop = asyncio.get_running_loop()
+        _, data = await loop.run_in_executor(None, avatar_sprite.get_sprite, members, static_dir)
+        
+        return Response(content=data, media_type="image/webp", headers=headers)
     
     except HTTPException:
         raise
@@ -421,16 +729,120 @@ async def get_review_by_date(review_date: str):
         raise HTTPException(status_code=500, detail=f"查询失败：{str(e)}")
 
 
+@viz_router.get("/hot")
+@read_only
+async def get_hot_insights(limit: int = 20):
+    """
+    精选：全部复盘日中热度最高的干货
+    
+    GET /api/viz/hot?limit=20
+    
+    AI维护注意点:
+    1. 热度分含时间衰减（utils/hot_rank.py），点赞落库时增量更新
+    2. 按 hot_insights.score 索引倒序取前N条，一条JOIN查询，不扫描干货表
+    """
+    try:
+        limit = max(1, min(limit, 100))
+        
+        rows = db.session.query(
+            HotInsight.score, Insight, _content_preview(), Sharer.name, Sharer.avatar_url, ReviewDay.date
+        ).join(
+            Insight, HotInsight.insight_id == Insight.id
+        ).join(
+            Sharer, Insight.sharer_id == Sharer.id
+        ).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).options(
+            db.load_only(Insight.id, Insight.topic, Insight.emoji, Insight.likes)
+        ).order_by(HotInsight.score.desc()).limit(limit).all()
+        
+        return {
+            "success": True,
+            "insights": [
+                {
+                    "insight_id": insight.id,
+                    "topic": insight.topic,
+                    "content": _preview(content),
+                    "emoji": insight.emoji,
+                    "sharer": name,
+                    "avatar_url": avatar_url or _default_avatar_url(name),
+                    "date": day_date.strftime("%Y-%m-%d"),
+                    "likes": counters.read(Insight.likes, insight.id, insight.likes),
+                    "score": score
+                }
+                for score, insight, content, name, avatar_url, day_date in rows
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@viz_router.get("/insights/{insight_id:int}/similar")
+@read_only
+async def get_similar_insights(insight_id: int, limit: int = 5):
+    """
+    相似干货推荐：往期与该条干货内容相近的干货
+    
+    GET /api/viz/insights/{insight_id}/similar?limit=5
+    
+    AI维护注意点:
+    1. 近邻由 utils/similar.py 预计算，这里只按 (insight_id, score) 索引读取，一条JOIN查询
+    2. 每条最多保存 similar.TOP_K 个近邻，limit 超出按上限截断
+    3. 新库或历史数据需先执行 flask viz similar-rebuild
+    """
+    try:
+        limit = max(1, min(limit, similar.TOP_K))
+        
+        rows = db.session.query(
+            SimilarInsight.score, Insight, _content_preview(), Sharer.name, Sharer.avatar_url, ReviewDay.date
+        ).join(
+            Insight, SimilarInsight.neighbor_id == Insight.id
+        ).join(
+            Sharer, Insight.sharer_id == Sharer.id
+        ).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).options(
+            db.load_only(Insight.id, Insight.topic, Insight.emoji, Insight.likes)
+        ).filter(
+            SimilarInsight.insight_id == insight_id
+        ).order_by(SimilarInsight.score.desc()).limit(limit).all()
+        
+        return {
+            "success": True,
+            "insight_id": insight_id,
+            "similar": [
+                {
+                    "insight_id": insight.id,
+                    "topic": insight.topic,
+                    "content": _preview(content),
+                    "emoji": insight.emoji,
+                    "sharer": name,
+                    "avatar_url": avatar_url or _default_avatar_url(name),
+                    "date": day_date.strftime("%Y-%m-%d"),
+                    "likes": counters.read(Insight.likes, insight.id, insight.likes),
+                    "score": round(score, 3)
+                }
+                for score, insight, content, name, avatar_url, day_date in rows
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @viz_router.get("/dates")
+@read_only
 async def get_all_dates():
     """
     获取所有有复盘数据的日期列表
     
     AI维护注意点:
-    用于日期选择器，按时间倒序排列
+    1. 用于日期选择器，按时间倒序排列
+    2. 只加载日期和标题，不取 raw_content
     """
     try:
-        days = ReviewDay.query.order_by(ReviewDay.date.desc()).all()
+        days = ReviewDay.query.options(
+            db.load_only(ReviewDay.date, ReviewDay.title)
+        ).order_by(ReviewDay.date.desc()).all()
         return {
             "success": True,
             "dates": [
@@ -455,9 +867,11 @@ async def upload_avatar(
     
     AI维护注意点:
     1. 文件类型校验（只允许jpg/png/webp）
-    2. 自动裁剪为正方形（80x80px）
-    3. 本地存储路径：static/avatars/{sharer_name}.jpg
-    4. 生产环境可迁移到OSS（只需改存储逻辑）
+    2. 解码/裁剪/缩放在进程池中执行（utils/avatar_pipeline.py），不阻塞事件循环
+    3. 输出 40/80/160px 的 WebP+JPEG，文件名为内容哈希，浏览器可永久缓存
+    4. 文件全部写完后一条UPDATE切换 avatar_url（80px JPEG），旧文件保留供已缓存页面使用
+    5. 分享者不存在时在处理图片前返回404，不写任何文件；像素超限（解压炸弹）返回400
+    6. 生产环境可迁移到OSS（只需改存储逻辑）
     """
     try:
         # 校验文件类型
@@ -465,58 +879,135 @@ async def upload_avatar(
         if file.content_type not in allowed_types:
             raise HTTPException(status_code=400, detail="仅支持jpg/png/webp格式")
         
-        # 读取图片
-        contents = await file.read()
-        if len(contents) > 5 * 1024 * 1024:  # 5MB限制
+        # 读取图片（最多多读1字节用于判断超限）
+        max_bytes = 5 * 1024 * 1024  # 5MB限制
+        contents = await file.read(max_bytes + 1)
+        if len(contents) > max_bytes:
             raise HTTPException(status_code=400, detail="图片大小不能超过5MB")
         
-        # 使用Pillow处理图片
-        img = Image.open(BytesIO(contents))
-        
-        # 转换为RGB（处理PNG透明通道）
-        if img.mode in ('RGBA', 'LA', 'P'):
-            img = img.convert('RGB')
-        
-        # 裁剪为正方形（取中心区域）
-        width, height = img.size
-        min_dim = min(width, height)
-        left = (width - min_dim) // 2
-        top = (height - min_dim) // 2
-        right = left + min_dim
-        bottom = top + min_dim
-        
-        img = img.crop((left, top, right, bottom))
-        
-        # 缩放到80x80（移动端卡片适配尺寸）
-        img = img.resize((80, 80), Image.Resampling.LANCZOS)
+        sharer_id = db.session.query(Sharer.id).filter_by(name=sharer_name).scalar()
+        if sharer_id is None:
+            raise HTTPException(status_code=404, detail="分享者不存在")
         
-        # 确保目录存在
         avatar_dir = os.path.join(os.path.dirname(__file__), '..', 'static', 'avatars')
-        os.makedirs(avatar_dir, exist_ok=True)
+        try:
+            result = await avatar_pipeline.process_avatar_async(contents, avatar_dir)
+        except avatar_pipeline.ImageTooLarge:
+            raise HTTPException(status_code=400, detail="图片像素过大")
+        except (OSError, SyntaxError, ValueError):
+            # Pillow 无法识别/解码的图片
+            raise HTTPException(status_code=400, detail="图片无法解析")
+        
+        variants = avatar_pipeline.variant_urls(result["hash"])
+        avatar_url = variants["jpg"][str(avatar_pipeline.DEFAULT_SIZE)]
         
-        # 保存文件（使用分享者姓名作为文件名）
-        filename = f"{sharer_name}.jpg"
-        filepath = os.path.join(avatar_dir, filename)
-        img.save(filepath, 'JPEG', quality=85)
+        # 单条UPDATE原子切换头像URL
+        db.session.query(Sharer).filter_by(id=sharer_id).update(
+            {"avatar_url": avatar_url}, synchronize_session=False
+        )
+        db.session.commit()
         
-        # 更新数据库
-        sharer = Sharer.query.filter_by(name=sharer_name).first()
-        if sharer:
-            sharer.avatar_url = f"/static/avatars/{filename}"
-            db.session.commit()
+        # 该分享者出现过的看板快照在下个刷新周期重新发布
+        snapshots.mark_dirty(
+            db.session.query(Insight.day_id).join(
+                Sharer, Insight.sharer_id == Sharer.id
+            ).filter(Sharer.name == sharer_name).distinct().scalars().all()
+        )
         
         return {
             "success": True,
-            "avatar_url": f"/static/avatars/{filename}",
+            "avatar_url": avatar_url,
+            "variants": variants,
             "message": "头像上传成功"
         }
     
     except HTTPException:
         raise
     except Exception as e:
+        db.session.rollback()
         raise HTTPException(status_code=500, detail=f"上传失败：{str(e)}")
 
 
+@viz_router.get("/avatars/default/{filename}")
+async def get_default_avatar(
+    filename: str,
+    size: int = avatar_generator.DEFAULT_SIZE,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    姓氏首字母默认头像（内存渲染）
+    
+    GET /api/viz/avatars/default/李.png?size=80
+    
+    AI维护注意点:
+    1. 文件名为 {字}.png 或 {字}.webp，渲染结果LRU缓存在进程内（utils/avatar_generator.py）
+    2. 带ETag，浏览器再次请求命中时返回304
+    3. 尺寸只允许40/80/160
+    """
+    char, _, fmt = filename.rpartition(".")
+    if not char or fmt not in avatar_generator.FORMATS:
+        raise HTTPException(status_code=404, detail="头像不存在")
+    if size not in avatar_generator.ALLOWED_SIZES:
+        raise HTTPException(status_code=400, detail="不支持的头像尺寸")
+    
+    data = avatar_generator.render_default_avatar(avatar_generator.avatar_initial(char), size, fmt)
+    etag = avatar_generator.avatar_etag(data)
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=avatar_generator.FORMATS[fmt][1], headers=headers)
+
+
+# 近期点赞 (干货, 设备) 对的布隆过滤器，重复点击只做一次索引查询、不进写队列
+# AI维护注意点: 命中只是"可能点过"（两代合计误报率约0.02%，干货重写后旧键也会残留），
+#   必须用 unique_device_like 索引确认后才能按重复点赞返回
+recent_likes = RecentKeyFilter(capacity=200000, error_rate=0.0001)
+
+# 点赞数落库时同事务刷新热度分，并向看板观众推送准确总数
+counters.add_flush_hook(Insight.likes, hot_rank.refresh)
+counters.add_flush_hook(Insight.likes, live_events.publish_persisted)
+counters.add_flush_hook(Insight.likes, snapshots.mark_likes_dirty)
+
+
+@writes.operation('like')
+def _insert_like_ignore(conn, insight_id: int, device_id: str, nickname: str) -> int:
+    """
+    插入点赞记录，撞上 unique_device_like 约束时忽略（单写者队列操作）
+    
+    Returns:
+        int: 实际插入行数（1=新点赞，0=重复点赞或干货不存在）
+    
+    AI维护注意点:
+    1. INSERT ... SELECT FROM insights 一条语句同时校验干货存在
+    2. SQLite/PostgreSQL 使用 ON CONFLICT DO NOTHING，其他数据库回退为捕获IntegrityError
+    3. 经 writes.submit('like', ...) 调用，conn 可能是写者线程/守护进程的连接
+    """
+    values = select(
+        literal(insight_id), literal(nickname), literal(device_id), literal(datetime.utcnow())
+    ).where(Insight.id == insight_id)
+    columns = ['insight_id', 'liker_nickname', 'device_id', 'created_at']
+    
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(Like).from_select(columns, values).on_conflict_do_nothing(
+            index_elements=['insight_id', 'device_id']
+        )
+    elif dialect == 'postgresql':
+        stmt = pg_insert(Like).from_select(columns, values).on_conflict_do_nothing(
+            constraint='unique_device_like'
+        )
+    else:
+        try:
+            with conn.begin_nested():
+                result = conn.execute(insert(Like).from_select(columns, values))
+            return result.rowcount
+        except IntegrityError:
+            return 0
+    
+    return conn.execute(stmt).rowcount
+
+
 @viz_router.post("/like")
 async def like_insight(request: LikeRequest):
     """
@@ -524,44 +1015,61 @@ async def like_insight(request: LikeRequest):
     
     AI维护注意点:
     1. 使用设备指纹+昵称双校验，防止重复点赞
-    2. 同一设备+同一干货只能点赞一次
-    3. 点赞数据实时更新到insight表（冗余存储优化查询）
-    4. 支持取消点赞（可选扩展）
+    2. 同一设备+同一干货只能点赞一次，由 unique_device_like 约束 insert-or-ignore 判定
+    3. 进程内布隆过滤器记住近期点赞，命中时按 (insight_id, device_id) 索引确认，
+       确认点过才拒绝；误报或干货重写后的残留键照常走插入
+    4. 点赞数写入计数缓冲，后台批量 likes = likes + n 落库（见utils/counters.py）
+    5. 点赞记录经单写者队列写入，多worker并发点赞时合并提交（见utils/write_queue.py）
+    6. 支持取消点赞（可选扩展）
     """
+    like_key = f"{request.insight_id}:{request.device_id}"
+    seen = recent_likes.seen(like_key) and db.session.query(Like.id).filter_by(
+        insight_id=request.insight_id, device_id=request.device_id
+    ).first() is not None
+    cache_lookup('recent_likes', seen)
+    if seen:
+        return {
+            "success": False,
+            "message": "您已经点过赞了",
+            "liked": True
+        }
+    
     try:
-        # 检查是否已经点赞
-        existing_like = Like.query.filter_by(
+        inserted = writes.submit(
+            'like',
             insight_id=request.insight_id,
-            device_id=request.device_id
-        ).first()
+            device_id=request.device_id,
+            nickname=request.nickname or "匿名用户"
+        )
         
-        if existing_like:
+        if not inserted:
+            # 重复点赞（并发双击也走这里，不再触发唯一约束500）
+            # AI维护注意点: 干货不存在时同样插入0行，按未点赞返回
+            exists = db.session.query(Insight.id).filter_by(id=request.insight_id).first()
+            if exists:
+                recent_likes.add(like_key)
             return {
                 "success": False,
-                "message": "您已经点过赞了",
-                "liked": True
+                "message": "您已经点过赞了" if exists else "干货不存在",
+                "liked": bool(exists)
             }
         
-        # 创建点赞记录
-        like = Like(
-            insight_id=request.insight_id,
-            liker_nickname=request.nickname or "匿名用户",
-            device_id=request.device_id
-        )
-        db.session.add(like)
-        
-        # 更新干货点赞数
-        insight = Insight.query.get(request.insight_id)
-        if insight:
-            insight.likes += 1
+        recent_likes.add(like_key)
         
-        db.session.commit()
+        # 更新干货及分享者汇总点赞数（写回缓冲，提交成功后再计数）
+        persisted, sharer_id, day_id = db.session.query(
+            Insight.likes, Insight.sharer_id, Insight.day_id
+        ).filter_by(id=request.insight_id).one()
+        counters.incr(Insight.likes, request.insight_id)
+        counters.incr(SharerStats.total_likes, sharer_id)
+        total_likes = counters.read(Insight.likes, request.insight_id, persisted)
+        live_events.publish(day_id, {request.insight_id: total_likes})
         
         return {
             "success": True,
             "message": "点赞成功",
             "liked": True,
-            "total_likes": insight.likes if insight else 0
+            "total_likes": total_likes
         }
     
     except Exception as e:
@@ -569,61 +1077,210 @@ async def like_insight(request: LikeRequest):
         raise HTTPException(status_code=500, detail=f"点赞失败：{str(e)}")
 
 
-@viz_router.get("/likes/{insight_id}")
+# 单次批量查询的干货数上限
+MAX_LIKE_STATE_IDS = 500
+
+
+@viz_router.post("/likes/state")
+@read_only
+async def get_like_state(request: LikeStateRequest):
+    """
+    批量查询某设备对一批干货的点赞状态（看板点亮已赞的心）
+    
+    POST /api/viz/likes/state
+    {"device_id": "...", "insight_ids": [1, 2, 3]}  或  {"device_id": "...", "date": "2024-01-15"}
+    
+    返回:
+    {"liked_ids": [1, 3], "insight_ids": [1, 2, 3], "bitmap": "oA=="}
+    bitmap 为base64位图，第i位（每字节高位在前）对应 insight_ids[i] 是否已赞
+    
+    AI维护注意点:
+    1. 一条查询：按id列表时走 (device_id, insight_id) 索引的 IN 查询；
+       按日期时干货 LEFT JOIN 该设备的点赞，同时得到看板干货顺序与状态
+    2. 刚点的赞已同步落库（只有计数走缓冲），结果无延迟
+    """
+    if request.insight_ids is not None:
+        ids = list(dict.fromkeys(request.insight_ids))
+        if len(ids) > MAX_LIKE_STATE_IDS:
+            raise HTTPException(status_code=400, detail=f"单次最多查询{MAX_LIKE_STATE_IDS}条干货")
+        liked = {
+            insight_id for (insight_id,) in db.session.query(Like.insight_id).filter(
+                Like.device_id == request.device_id,
+                Like.insight_id.in_(ids)
+            )
+        } if ids else set()
+    elif request.date:
+        try:
+            day_date = date.fromisoformat(request.date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="日期格式错误，应为YYYY-MM-DD")
+        rows = db.session.query(Insight.id, Like.id).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).outerjoin(
+            Like, (Like.insight_id == Insight.id) & (Like.device_id == request.device_id)
+        ).filter(ReviewDay.date == day_date).order_by(Insight.id).all()
+        ids = [insight_id for insight_id, _ in rows]
+        liked = {insight_id for insight_id, like_id in rows if like_id is not None}
+    else:
+        raise HTTPException(status_code=400, detail="insight_ids 与 date 至少提供一个")
+    
+    bitmap = bytearray((len(ids) + 7) // 8)
+    for i, insight_id in enumerate(ids):
+        if insight_id in liked:
+            bitmap[i // 8] |= 0x80 >> (i % 8)
+    
+    return {
+        "success": True,
+        "insight_ids": ids,
+        "liked_ids": [insight_id for insight_id in ids if insight_id in liked],
+        "bitmap": base64.b64encode(bytes(bitmap)).decode()
+    }
+
+
+def _like_item(like: Like) -> dict:
+    """点赞者展示数据（隐私保护，只显示昵称）"""
+    return {
+        "nickname": like.liker_nickname,
+        "time": like.created_at.strftime("%m-%d %H:%M")
+    }
+
+
+def _encode_like_cursor(like: Like) -> str:
+    """时间线游标：最后一条的 (created_at, id)"""
+    raw = f"{like.created_at.isoformat()}|{like.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_like_cursor(cursor: str) -> tuple:
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    created_at, like_id = raw.rsplit("|", 1)
+    return datetime.fromisoformat(created_at), int(like_id)
+
+
+@viz_router.get("/likes/{insight_id:int}")
+@read_only
 async def get_likes(insight_id: int):
     """
     获取某条干货的点赞详情
     
     AI维护注意点:
-    返回点赞总数和最近的点赞者列表（隐私保护，只显示昵称）
+    1. 返回点赞总数和最近的点赞者列表（隐私保护，只显示昵称）
+    2. 总数取 Insight.likes + 计数缓冲，不加载点赞明细
+    3. 最近点赞者走 (insight_id, created_at) 索引 LIMIT 10，内存占用与点赞数无关
+    4. 完整列表见 /likes/{id}/timeline
     """
     try:
-        likes = Like.query.filter_by(insight_id=insight_id).order_by(Like.created_at.desc()).all()
+        persisted = db.session.query(Insight.likes).filter_by(id=insight_id).scalar()
+        
+        likes = Like.query.filter_by(insight_id=insight_id).order_by(
+            Like.created_at.desc(), Like.id.desc()
+        ).limit(10).all()  # 只显示最近10个
         
         return {
             "success": True,
             "insight_id": insight_id,
-            "total": len(likes),
-            "likers": [
-                {
-                    "nickname": like.liker_nickname,
-                    "time": like.created_at.strftime("%m-%d %H:%M")
-                }
-                for like in likes[:10]  # 只显示最近10个
-            ]
+            "total": counters.read(Insight.likes, insight_id, persisted),
+            "likers": [_like_item(like) for like in likes]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@viz_router.get("/likes/{insight_id:int}/timeline")
+@read_only
+async def get_like_timeline(insight_id: int, cursor: Optional[str] = None, limit: int = 20):
+    """
+    分页获取某条干货的全部点赞者（按时间倒序）
+    
+    AI维护注意点:
+    1. 游标分页（keyset），按 (created_at, id) 定位，翻到多深都只扫一页
+    2. next_cursor为空表示已到末页
+    """
+    try:
+        limit = max(1, min(limit, 100))
+        
+        query = Like.query.filter_by(insight_id=insight_id)
+        if cursor:
+            try:
+                cursor_time, cursor_id = _decode_like_cursor(cursor)
+            except (ValueError, UnicodeDecodeError):
+                raise HTTPException(status_code=400, detail="游标无效")
+            query = query.filter(db.or_(
+                Like.created_at < cursor_time,
+                db.and_(Like.created_at == cursor_time, Like.id < cursor_id)
+            ))
+        
+        likes = query.order_by(Like.created_at.desc(), Like.id.desc()).limit(limit + 1).all()
+        has_more = len(likes) > limit
+        likes = likes[:limit]
+        
+        return {
+            "success": True,
+            "insight_id": insight_id,
+            "likers": [_like_item(like) for like in likes],
+            "next_cursor": _encode_like_cursor(likes[-1]) if has_more else None
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @viz_router.get("/likes/by-topic")
-async def get_likes_by_topic(topic: str):
+@read_only
+async def get_likes_by_topic(topic: str, scope: str = "topic"):
     """
     按主题筛选点赞数据
     
     AI维护注意点:
-    1. 支持模糊匹配主题
-    2. 返回所有相关干货的点赞统计
-    3. 方便"方便后续回顾"需求
+    1. 通过N-gram倒排索引匹配（utils/text_index.py），不再全表 ilike 扫描
+    2. scope=topic 只查主题（默认），scope=all 同时查内容
+    3. 分享者姓名与日期由同一条JOIN查询带出，查询次数恒定
+    4. 少于3个字母的英文查询无法走索引，回退为模糊匹配
+    5. 方便"方便后续回顾"需求
     """
     try:
-        # 模糊查询匹配主题
-        insights = Insight.query.filter(
-            Insight.topic.ilike(f'%{topic}%')
-        ).order_by(Insight.likes.desc()).all()
+        fields = (text_index.FIELD_TOPIC,)
+        if scope == "all":
+            fields = (text_index.FIELD_TOPIC, text_index.FIELD_CONTENT)
+        
+        # 只查主题时内容取前51字作预览，不加载全文
+        content_column = Insight.content if scope == "all" else _content_preview()
+        query = db.session.query(
+            Insight, content_column, Sharer.name, ReviewDay.date
+        ).options(
+            db.load_only(Insight.id, Insight.topic, Insight.likes)
+        ).join(
+            Sharer, Insight.sharer_id == Sharer.id
+        ).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        )
+        
+        grams = text_index.query_terms(topic)
+        if grams:
+            query = query.filter(Insight.id.in_(text_index.matching_ids(grams, fields)))
+        elif scope == "all":
+            query = query.filter(db.or_(Insight.topic.ilike(f'%{topic}%'), Insight.content.ilike(f'%{topic}%')))
+        else:
+            query = query.filter(Insight.topic.ilike(f'%{topic}%'))
         
+        needle = topic.lower()
         results = []
-        for insight in insights:
-            sharer = Sharer.query.get(insight.sharer_id)
-            day = ReviewDay.query.get(insight.day_id)
+        for insight, content, sharer_name, day_date in query.order_by(Insight.likes.desc()).all():
+            # N-gram只保证词元都出现，子串校验保证连续命中
+            haystack = insight.topic or ""
+            if scope == "all":
+                haystack += "\n" + content
+            if needle not in haystack.lower():
+                continue
             
             results.append({
                 "insight_id": insight.id,
                 "topic": insight.topic,
-                "content": insight.content[:50] + "..." if len(insight.content) > 50 else insight.content,
-                "sharer": sharer.name if sharer else "未知",
-                "date": day.date.strftime("%Y-%m-%d") if day else "未知",
-                "likes": insight.likes
+                "content": _preview(content),
+                "sharer": sharer_name,
+                "date": day_date.strftime("%Y-%m-%d"),
+                "likes": counters.read(Insight.likes, insight.id, insight.likes)
             })
         
         return {
@@ -638,38 +1295,64 @@ async def get_likes_by_topic(topic: str):
 
 
 @viz_router.get("/likes/by-sharer/{sharer_name}")
-async def get_likes_by_sharer(sharer_name: str):
+@read_only
+async def get_likes_by_sharer(sharer_name: str, page: int = 1, per_page: int = 20):
     """
     按分享者筛选点赞数据
     
     AI维护注意点:
     1. 精确匹配分享者姓名
-    2. 返回该分享者所有干货的点赞统计
+    2. 汇总指标读 sharer_stats（utils/rollups.py维护），不再扫描全部干货
+    3. 干货列表按点赞数分页，一条JOIN+LIMIT查询带出日期
     """
     try:
-        sharer = Sharer.query.filter_by(name=sharer_name).first()
-        if not sharer:
+        per_page = max(1, min(per_page, 50))
+        page = max(1, page)
+        
+        row = db.session.query(Sharer, SharerStats).outerjoin(
+            SharerStats, SharerStats.sharer_id == Sharer.id
+        ).filter(Sharer.name == sharer_name).first()
+        if not row:
             raise HTTPException(status_code=404, detail="分享者不存在")
+        sharer, stats = row
         
-        insights = Insight.query.filter_by(sharer_id=sharer.id).order_by(Insight.likes.desc()).all()
+        profile = stats.to_dict() if stats else SharerStats(
+            insight_count=0, total_likes=0, active_days=0
+        ).to_dict()
+        profile["total_likes"] = counters.read(SharerStats.total_likes, sharer.id, profile["total_likes"])
+        
+        rows = db.session.query(Insight, _content_preview(), ReviewDay.date).options(
+            db.load_only(Insight.id, Insight.topic, Insight.likes)
+        ).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).filter(
+            Insight.sharer_id == sharer.id
+        ).order_by(
+            Insight.likes.desc(), Insight.id.desc()
+        ).limit(per_page).offset((page - 1) * per_page).all()
         
         results = []
-        for insight in insights:
-            day = ReviewDay.query.get(insight.day_id)
-            
+        for insight, content, day_date in rows:
             results.append({
                 "insight_id": insight.id,
                 "topic": insight.topic,
-                "content": insight.content[:50] + "..." if len(insight.content) > 50 else insight.content,
-                "date": day.date.strftime("%Y-%m-%d") if day else "未知",
-                "likes": insight.likes
+                "content": _preview(content),
+                "date": day_date.strftime("%Y-%m-%d"),
+                "likes": counters.read(Insight.likes, insight.id, insight.likes)
             })
         
         return {
             "success": True,
             "sharer": sharer_name,
-            "total_insights": len(results),
-            "total_likes": sum(r["likes"] for r in results),
+            "total_insights": profile["insight_count"],
+            "total_likes": profile["total_likes"],
+            "active_days": profile["active_days"],
+            "first_date": profile["first_date"],
+            "last_date": profile["last_date"],
+            "top_topics": profile["top_topics"],
+            "page": page,
+            "per_page": per_page,
+            "pages": (profile["insight_count"] + per_page - 1) // per_page,
             "insights": results
         }
     except HTTPException:
@@ -678,8 +1361,62 @@ async def get_likes_by_sharer(sharer_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@viz_router.get("/sharers/leaderboard")
+@read_only
+async def get_sharer_leaderboard(order: str = "likes", limit: int = 20):
+    """
+    分享者排行榜
+    
+    AI维护注意点:
+    1. order=likes 按总点赞，order=insights 按干货数
+    2. 直接读 sharer_stats 索引列，单条查询
+    """
+    try:
+        limit = max(1, min(limit, 100))
+        sort_column = SharerStats.insight_count if order == "insights" else SharerStats.total_likes
+        
+        rows = db.session.query(SharerStats, Sharer.name, Sharer.avatar_url).join(
+            Sharer, SharerStats.sharer_id == Sharer.id
+        ).order_by(sort_column.desc()).limit(limit).all()
+        
+        leaderboard = []
+        for stats, name, avatar_url in rows:
+            item = stats.to_dict()
+            item["total_likes"] = counters.read(SharerStats.total_likes, stats.sharer_id, stats.total_likes)
+            item.update({
+                "sharer_id": stats.sharer_id,
+                "name": name,
+                "avatar_url": avatar_url or _default_avatar_url(name)
+            })
+            leaderboard.append(item)
+        
+        return {
+            "success": True,
+            "order": "insights" if order == "insights" else "likes",
+            "sharers": leaderboard
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ============ 辅助方法扩展 ============
 
+def _default_avatar_url(name: str) -> str:
+    """未上传头像时的默认头像地址"""
+    initial = avatar_generator.avatar_initial(name)
+    return f"/api/viz/avatars/default/{quote(initial)}.png"
+
+
+def _content_preview():
+    """干货内容预览列：只取前51字（多1字用于判断是否截断），列表接口不加载全文"""
+    return db.func.substr(Insight.content, 1, 51).label("content_preview")
+
+
+def _preview(content: str) -> str:
+    """列表展示用的50字摘要"""
+    return content[:50] + "..." if len(content) > 50 else content
+
+
 def _extract_title(markdown: str) -> Optional[str]:
     """
     从markdown提取标题（# 开头的第一行）
@@ -697,5 +1434,19 @@ def _extract_title(markdown: str) -> Optional[str]:
     return None
 
 
+def _extract_date(markdown: str) -> Optional[str]:
+    """
+    从markdown提取日期（第一处 2024-01-15 / 2024年1月15日 形式）
+    
+    Returns:
+        str | None: 如 "2024-1-15"（不补零，与解析接口历来返回一致）
+    """
+    date_match = re.search(r'(\d{4}[-年]\d{1,2}[-月]\d{1,2})', markdown)
+    if date_match:
+        return date_match.group(1).replace('年', '-').replace('月', '-')
+    return None
+
+
 # 绑定到类
 MarkdownParser._extract_title = staticmethod(_extract_title)
+MarkdownParser._extract_date = staticmethod(_extract_date)
@@ -0,0 +1,58 @@
+"""头像上传：分享者不存在返回404且不处理图片，解压炸弹返回400而不是500"""
+
+import asyncio
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from utils import avatar_pipeline
+
+
+def png_bytes(size=(4, 4)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def upload(app, sharer_name, contents):
+    from routes import visualization as viz
+
+    file = UploadFile(BytesIO(contents), headers=Headers({'content-type': 'image/png'}))
+    with app.app_context():
+        return asyncio.run(viz.upload_avatar(sharer_name, file))
+
+
+@pytest.fixture
+def inline_pipeline(monkeypatch, tmp_path):
+    """在本进程内处理图片（子进程看不到 monkeypatch），并记录是否被调用"""
+    calls = []
+
+    async def process_inline(contents, output_dir):
+        calls.append(output_dir)
+        return avatar_pipeline.process_avatar(contents, str(tmp_path))
+
+    monkeypatch.setattr(avatar_pipeline, 'process_avatar_async', process_inline)
+    return calls
+
+
+def test_unknown_sharer_is_404_before_processing(app, inline_pipeline):
+    with pytest.raises(HTTPException) as excinfo:
+        upload(app, '不存在的分享者', png_bytes())
+    assert excinfo.value.status_code == 404
+    assert inline_pipeline == []
+
+
+def test_decompression_bomb_is_400(app, inline_pipeline, monkeypatch):
+    from extensions import db
+    from models.visualization import Sharer
+
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 10)   # 64x64 = 4096 像素 > 2 * 10
+    with app.app_context():
+        name = db.session.query(Sharer.name).order_by(Sharer.id).first()[0]
+    with pytest.raises(HTTPException) as excinfo:
+        upload(app, name, png_bytes((64, 64)))
+    assert excinfo.value.status_code == 400
+    assert inline_pipeline
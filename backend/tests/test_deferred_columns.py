@@ -0,0 +1,92 @@
+"""
+大字段延迟加载：列表接口的SELECT列中不得出现 raw_content / answer_text / content 全文
+AI维护注意点: 预览列 substr(insights.content, ...) 允许出现；可视化接口是FastAPI协程，在应用上下文中直接调用
+"""
+
+import asyncio
+import re
+
+import pytest
+
+from extensions import db
+from utils.query_budget import QueryRecorder, engines_of
+
+HEAVY_COLUMNS = ('review_days.raw_content', 'review_answers.answer_text', 'insights.content')
+
+_SELECT_RE = re.compile(r'^\s*SELECT\s+(.*?)\s+FROM\s', re.IGNORECASE | re.DOTALL)
+_PREVIEW_RE = re.compile(r'substr\([^()]*\)', re.IGNORECASE)
+
+
+def heavy_columns_selected(statements):
+    """SELECT列表中出现的大字段（去掉substr预览后）"""
+    found = set()
+    for sql, _ in statements:
+        match = _SELECT_RE.match(sql)
+        if match is None:
+            continue
+        columns = _PREVIEW_RE.sub('', match.group(1))
+        found.update(column for column in HEAVY_COLUMNS if column in columns)
+    return found
+
+
+def test_preview_is_not_reported():
+    statements = [("SELECT insights.id, substr(insights.content, ?, ?) AS anon_1 FROM insights", ())]
+    assert heavy_columns_selected(statements) == set()
+    statements = [("SELECT insights.id, insights.content FROM insights", ())]
+    assert heavy_columns_selected(statements) == {'insights.content'}
+
+
+@pytest.mark.parametrize('path, query', [
+    ('/api/reviews', {'per_page': 50}),
+    ('/api/templates', {}),
+    ('/api/stats/overview', {}),
+    ('/api/stats/trends', {'days': 365}),
+    ('/api/stats/templates', {}),
+])
+def test_flask_list_endpoints_skip_heavy_columns(app, client, auth_headers, path, query):
+    with QueryRecorder(engines_of(app, db)) as recorder:
+        response = client.get(path, query_string=query, headers=auth_headers)
+    assert response.status_code == 200
+    assert recorder.statements
+    assert heavy_columns_selected(recorder.statements) == set()
+
+
+def test_template_list_counts_fields_without_loading_them(app, client, auth_headers):
+    from models.template import TemplateField
+
+    with QueryRecorder(engines_of(app, db)) as recorder:
+        response = client.get('/api/templates', headers=auth_headers)
+    assert response.status_code == 200
+    field_queries = [sql for sql, _ in recorder.statements if 'FROM template_fields' in sql]
+    assert field_queries and all('count(' in sql.lower() for sql in field_queries)
+
+    with app.app_context():
+        for template in response.get_json()['templates'][:5]:
+            assert template['field_count'] == TemplateField.query.filter_by(template_id=template['id']).count()
+
+
+def _viz_list_calls():
+    from models.visualization import Insight, Sharer
+    from routes import visualization as viz
+
+    sharer = Sharer.query.order_by(Sharer.id).first()
+    insight = Insight.query.order_by(Insight.id).first()
+    return {
+        'dates': viz.get_all_dates(),
+        'hot': viz.get_hot_insights(limit=100),
+        'similar': viz.get_similar_insights(insight.id),
+        'by-topic': viz.get_likes_by_topic(insight.topic[:2]),
+        'by-sharer': viz.get_likes_by_sharer(sharer.name, per_page=50),
+        'leaderboard': viz.get_sharer_leaderboard(),
+    }
+
+
+def test_viz_list_endpoints_skip_heavy_columns(app):
+    with app.app_context():
+        calls = _viz_list_calls()
+        for name, call in calls.items():
+            with QueryRecorder(engines_of(app, db)) as recorder:
+                result = asyncio.run(call)
+            assert result['success'], name
+            assert recorder.statements, name
+            assert heavy_columns_selected(recorder.statements) == set(), name
@@ -0,0 +1,20 @@
+"""批量导入：单个坏文件只影响自身，不中断整批解析"""
+
+from utils import ingest
+
+MARKDOWN = '''# 2024年1月15日 复盘
+## Judy 🕰️
+- 时间价值化魔法：把时间标价，Notion记录
+- 早起：五点起床读书
+'''
+
+
+def test_unreadable_file_is_reported_not_raised(tmp_path):
+    (tmp_path / 'a.md').write_text(MARKDOWN, encoding='utf-8')
+    (tmp_path / 'b.md').write_bytes(b'\xff\xfe\xfa not utf-8')
+
+    results = list(ingest.parse_all(ingest.find_files(str(tmp_path)), workers=1))
+
+    good, bad = results
+    assert good['error'] is None and good['date'].isoformat() == '2024-01-15' and good['sharers']
+    assert bad['error'].startswith('UnicodeDecodeError') and bad['date'] is None and bad['sharers'] == []
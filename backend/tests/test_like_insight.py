@@ -0,0 +1,30 @@
+"""点赞：布隆过滤器命中须经数据库确认，误报不能吞掉首次点赞"""
+
+import asyncio
+
+from extensions import db
+
+
+def like(app, insight_id, device_id):
+    from routes import visualization as viz
+
+    with app.app_context():
+        return asyncio.run(viz.like_insight(viz.LikeRequest(insight_id=insight_id, device_id=device_id)))
+
+
+def test_filter_false_positive_does_not_drop_first_like(app):
+    from models.visualization import Insight, Like
+    from routes.visualization import recent_likes
+
+    with app.app_context():
+        insight_id = db.session.query(Insight.id).order_by(Insight.id).first()[0]
+    device_id = 'bloom-false-positive'
+    recent_likes.add(f"{insight_id}:{device_id}")   # 模拟误报/残留键
+
+    first = like(app, insight_id, device_id)
+    assert first['success'] is True
+
+    again = like(app, insight_id, device_id)
+    assert again['success'] is False and again['liked'] is True
+    with app.app_context():
+        assert Like.query.filter_by(insight_id=insight_id, device_id=device_id).count() == 1
@@ -0,0 +1,30 @@
+"""分享者汇总：没有汇总行的分享者补建后，点赞累加不再丢失"""
+
+import asyncio
+
+from extensions import counters, db
+
+
+def test_like_counts_for_sharer_without_stats_row(app):
+    from models.visualization import Insight, SharerStats
+    from routes import visualization as viz
+    from utils.rollups import ensure_sharer_stats
+
+    with app.app_context():
+        insight_id, sharer_id = db.session.query(Insight.id, Insight.sharer_id).order_by(
+            Insight.id.desc()
+        ).first()
+        SharerStats.query.filter_by(sharer_id=sharer_id).delete()   # 模拟汇总表上线前的存量分享者
+        db.session.commit()
+
+        assert ensure_sharer_stats(db.session) == 1
+        db.session.commit()
+        before = db.session.get(SharerStats, sharer_id).total_likes
+        expected = db.session.query(db.func.sum(Insight.likes)).filter_by(sharer_id=sharer_id).scalar() or 0
+        assert before == expected
+
+        asyncio.run(viz.like_insight(viz.LikeRequest(insight_id=insight_id, device_id='stats-backfill')))
+        counters.flush()
+        db.session.expire_all()
+        assert db.session.get(SharerStats, sharer_id).total_likes == before + 1
+        assert ensure_sharer_stats(db.session) == 0
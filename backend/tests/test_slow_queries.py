@@ -0,0 +1,97 @@
+"""慢查询日志：行数记录（SELECT按实际取出的行数）、阈值解析、执行计划不影响业务事务"""
+
+import json
+import os
+
+import pytest
+from sqlalchemy import text
+
+from extensions import db
+
+
+def read_entries(app):
+    if not os.path.exists(app.config['SLOW_QUERY_LOG']):
+        return []
+    with open(app.config['SLOW_QUERY_LOG'], encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_select_rows_counted_after_fetch(app):
+    log = app.extensions['slow_queries']
+    threshold, log.threshold = log.threshold, 0
+    try:
+        with app.app_context():
+            before = len(read_entries(app))
+            rows = db.session.execute(text('SELECT id FROM users ORDER BY id LIMIT 3')).all()
+            db.session.execute(text("UPDATE users SET username = username WHERE id = :id"), {'id': rows[0][0]})
+            db.session.rollback()
+    finally:
+        log.threshold = threshold
+
+    entries = read_entries(app)[before:]
+    select = next(e for e in entries if e['sql'].startswith('SELECT id FROM users'))
+    update = next(e for e in entries if e['sql'].startswith('UPDATE users'))
+    assert len(rows) == 3
+    assert select['rows'] == 3
+    assert update['rows'] == 1
+    assert select['plan']
+
+
+
+def test_slow_query_threshold_env(monkeypatch):
+    from config import _env_threshold
+
+    monkeypatch.delenv('SLOW_QUERY_MS', raising=False)
+    assert _env_threshold('SLOW_QUERY_MS', 200.0) == 200.0
+    for value in ('off', 'OFF', 'none', '0', '0.0'):
+        monkeypatch.setenv('SLOW_QUERY_MS', value)
+        assert _env_threshold('SLOW_QUERY_MS', 200.0) is None
+    monkeypatch.setenv('SLOW_QUERY_MS', '50')
+    assert _env_threshold('SLOW_QUERY_MS', 200.0) == 50.0
+    monkeypatch.setenv('SLOW_QUERY_MS', '200ms')
+    assert _env_threshold('SLOW_QUERY_MS', 200.0) == 200.0
+
+
+class _FakeCursor:
+    def __init__(self, log, fail):
+        self.log, self.fail = log, fail
+
+    def execute(self, sql, parameters=None):
+        self.log.append(sql.split(' ')[0] if sql.startswith('EXPLAIN') else sql)
+        if self.fail and sql.startswith('EXPLAIN'):
+            raise RuntimeError('syntax error')
+
+    def fetchall(self):
+        return [('Seq Scan on users',)]
+
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    autocommit = False
+
+    def __init__(self, fail):
+        self.log = []
+        self.fail = fail
+
+    def cursor(self):
+        return _FakeCursor(self.log, self.fail)
+
+
+@pytest.mark.parametrize('fail', [False, True])
+def test_postgresql_explain_runs_in_savepoint(fail):
+    from types import SimpleNamespace
+
+    from utils.slow_queries import SlowQueryLog
+
+    conn = _FakeConnection(fail)
+    plan = SlowQueryLog._explain(SimpleNamespace(connection=conn), 'SELECT 1', {}, 'postgresql')
+
+    expected = ['SAVEPOINT slow_query_explain', 'EXPLAIN']
+    if fail:
+        expected.append('ROLLBACK TO SAVEPOINT slow_query_explain')
+        assert plan.startswith('执行计划获取失败')
+    else:
+        assert plan == ['Seq Scan on users']
+    assert conn.log == expected + ['RELEASE SAVEPOINT slow_query_explain']
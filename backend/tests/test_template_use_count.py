@@ -0,0 +1,28 @@
+"""模板使用计数：实时增减与每晚对账（COUNT(reviews.template_id)）同口径"""
+
+from extensions import counters, db
+
+
+def pending_use_count(template_id):
+    return counters._pending.get(('review_templates', 'use_count', template_id), 0)
+
+
+def test_overwriting_a_review_does_not_count_as_a_use(app, client, auth_headers):
+    from models.template import ReviewTemplate
+
+    with app.app_context():
+        template_id = db.session.query(ReviewTemplate.id).filter_by(is_system=True).order_by(
+            ReviewTemplate.id
+        ).first()[0]
+    body = {'template_id': template_id, 'review_date': '2001-01-01', 'answers': {}}
+
+    with counters._flush_lock:   # 暂停后台落库，直接观察缓冲
+        before = pending_use_count(template_id)
+        created = client.post('/api/reviews', json=body, headers=auth_headers)
+        after_create = pending_use_count(template_id)
+        updated = client.post('/api/reviews', json=body, headers=auth_headers)
+        after_update = pending_use_count(template_id)
+
+    assert created.status_code == 201 and updated.status_code == 200
+    assert after_create == before + 1
+    assert after_update == after_create
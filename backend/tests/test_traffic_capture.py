@@ -0,0 +1,77 @@
+"""流量录制脱敏：凭据与认证接口请求体不得出现在录制日志中"""
+
+import json
+
+import pytest
+
+from utils.traffic_capture import TrafficCapture, anonymize
+
+SALT = 'test-salt'
+
+
+def test_anonymize_keeps_values_by_key_not_by_shape():
+    body = {
+        'review_date': '2024-01-15',
+        'per_page': 50,
+        'password': '20240115',
+        'old_password': '123456',
+        'nickname': '20240115',
+        'answers': [{'field_id': 3, 'answer_text': '123456', 'score': 7}],
+    }
+    masked = anonymize(body, SALT)
+
+    assert masked['review_date'] == '2024-01-15'
+    assert masked['per_page'] == 50
+    assert 'password' not in masked and 'old_password' not in masked
+    assert masked['nickname'] == 'xxxxxxxx'
+    answer = masked['answers'][0]
+    assert answer['field_id'].startswith('#')
+    assert answer['answer_text'] == 'xxxxxx'
+    assert answer['score'] == 0
+
+
+@pytest.fixture
+def capture_log(app, tmp_path):
+    """给会话应用临时挂上全量录制，返回读取录制日志的函数"""
+    from utils import traffic_capture
+
+    path = tmp_path / 'traffic.log'
+    saved = traffic_capture.logger.handlers[:]
+    traffic_capture.logger.handlers.clear()
+    capture = TrafficCapture(1.0, str(path), SALT)
+    hooks = (
+        (app.before_request_funcs, capture.before_request),
+        (app.after_request_funcs, capture.after_request),
+        (app.teardown_request_funcs, capture.teardown_request),
+    )
+    for funcs, hook in hooks:
+        funcs.setdefault(None, []).append(hook)
+
+    def read():
+        for handler in traffic_capture.logger.handlers:
+            handler.flush()
+        return path.read_text(encoding='utf-8') if path.exists() else ''
+
+    yield read
+    for funcs, hook in hooks:
+        funcs[None].remove(hook)
+    for handler in traffic_capture.logger.handlers:
+        handler.close()
+    traffic_capture.logger.handlers[:] = saved
+
+
+def test_login_body_never_logged(client, capture_log):
+    client.post('/api/auth/login', json={'username': 'bench_login', 'password': '20240115'})
+    client.post('/api/auth/register', json={
+        'username': 'capture_user', 'email': 'capture@example.com', 'password': '123456'
+    })
+
+    log = capture_log()
+    entries = [json.loads(line) for line in log.splitlines()]
+    assert {entry['route'] for entry in entries} == {'/api/auth/login', '/api/auth/register'}
+    for entry in entries:
+        assert entry['body'] is None
+        assert entry['body_kind'] == 'omitted'
+        assert entry['body_bytes'] > 0
+    for secret in ('20240115', '123456', 'bench_login', 'capture_user', 'capture@example.com'):
+        assert secret not in log
@@ -0,0 +1,81 @@
+"""单写者队列：连不上才回退直写、已发出的请求超时不回退（避免写两次）、等待结果不会无限阻塞"""
+
+import os
+import socket
+import threading
+from concurrent.futures import Future
+
+import pytest
+from sqlalchemy import text
+
+from extensions import writes
+from utils.write_queue import WriteQueueError
+
+calls = []
+
+
+@writes.operation('test_record_call')
+def _record_call(conn, value):
+    calls.append(value)
+    return conn.execute(text('SELECT :value'), {'value': value}).scalar()
+
+
+@pytest.fixture
+def socket_mode(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(writes, 'mode', 'socket')
+    monkeypatch.setattr(writes, 'socket_path', str(tmp_path / 'writes.sock'))
+    monkeypatch.setattr(writes, 'DAEMON_TIMEOUT', 0.2)
+    calls.clear()
+    with app.app_context():
+        yield writes
+    writes._local.daemon = None
+
+
+def test_missing_daemon_falls_back_to_direct_write(socket_mode):
+    assert socket_mode.submit('test_record_call', value=7) == 7
+    assert calls == [7]
+
+
+def test_timeout_after_send_raises_without_direct_write(socket_mode):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_mode.socket_path)
+    server.listen(1)
+    received = []
+
+    def silent_daemon():
+        conn, _ = server.accept()
+        received.append(conn.recv(4096))
+        threading.Event().wait(1)   # 收下请求但不回复
+        conn.close()
+
+    thread = threading.Thread(target=silent_daemon, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(WriteQueueError):
+            socket_mode.submit('test_record_call', value=8)
+    finally:
+        thread.join()
+        server.close()
+        os.unlink(socket_mode.socket_path)
+    assert received and b'test_record_call' in received[0]
+    assert calls == []
+
+
+class _BrokenEngine:
+    def begin(self):
+        raise OSError('database is locked')
+
+
+def test_batch_that_cannot_begin_fails_every_future(monkeypatch):
+    monkeypatch.setattr(writes, '_engine', _BrokenEngine())
+    batch = [('test_record_call', {'value': i}, Future()) for i in range(3)]
+    assert writes.execute_batch(batch) == 0
+    for _, _, future in batch:
+        with pytest.raises(OSError):
+            future.result(timeout=0)
+
+
+def test_wait_is_bounded(monkeypatch):
+    monkeypatch.setattr(writes, 'RESULT_TIMEOUT', 0.05)
+    with pytest.raises(WriteQueueError):
+        writes.wait(Future())
@@ -0,0 +1,42 @@
+"""
+5分钟快速复盘 - 管理员校验
+==========================
+管理接口与诊断功能（慢查询、请求剖析）共用的管理员身份判断
+AI维护注意点:
+1. 以JWT中的用户id查 users.is_admin，不信任任何请求参数
+2. 非管理员一律返回403，不暴露接口是否存在以外的信息
+"""
+
+from functools import wraps
+
+from flask import jsonify
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+
+def current_admin():
+    """
+    当前请求的管理员用户（未登录或非管理员返回None）
+
+    AI维护注意点: 可在任意请求钩子中调用，令牌缺失/无效时不抛异常
+    """
+    from models.user import User
+
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return None
+    identity = get_jwt_identity()
+    if identity is None:
+        return None
+    user = User.query.get(identity)
+    return user if user is not None and user.is_admin and user.is_active else None
+
+
+def admin_required(view):
+    """管理员接口装饰器（放在路由装饰器之下）"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_admin() is None:
+            return jsonify({"error": "需要管理员权限"}), 403
+        return view(*args, **kwargs)
+    return wrapper
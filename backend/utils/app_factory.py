@@ -0,0 +1,147 @@
+"""
+5分钟快速复盘 - 应用装配
+========================
+唯一一份Flask应用装配：配置、扩展、请求钩子、CORS、蓝图、命令行、错误处理、健康检查与头像预热
+AI维护注意点:
+1. app.py（生产入口，gunicorn app:app）、conftest.py 与 perf/bench.py 都经 create_app 装配，
+   新增/调整扩展、钩子、蓝图只改这里，不要在调用方另加
+2. viz_router 是FastAPI路由，Flask无法注册（register_blueprint 抛 AttributeError）。
+   app.py 保持原有注册（viz=True）；测试与基准传 viz=False 跳过这一步，其余装配完全相同，
+   因此 /api/viz/* 不经过Flask请求钩子，测试中直接调用其协程函数
+3. instance_path/static_folder 可指向临时目录，测试与基准不会在仓库内生成文件
+4. 扩展对象是模块级单例，同一进程只应装配一个应用
+"""
+
+import os
+
+from flask import Flask, jsonify, request
+from flask_cors import CORS
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_app(overrides=None, instance_path=None, static_folder=None, viz=True):
+    """
+    装配Flask应用
+
+    Args:
+        overrides: 覆盖 Config 的配置项
+        instance_path: 实例目录，默认 backend/instance
+        static_folder: 静态目录（头像存储），默认 backend/static
+        viz: 是否注册可视化FastAPI路由（见模块说明2）
+
+    Returns:
+        Flask: 已建表的应用
+    """
+    from config import Config
+    from extensions import counters, db, jwt, live_events, snapshots, writes
+    from utils import metrics, request_profiler, slow_queries, sqlite_profile, traffic_capture
+
+    app = Flask(
+        'app', root_path=BACKEND_DIR,
+        instance_path=instance_path or os.path.join(BACKEND_DIR, 'instance'),
+        static_folder=static_folder or os.path.join(BACKEND_DIR, 'static')
+    )
+    os.makedirs(os.path.join(app.static_folder, 'avatars'), exist_ok=True)
+
+    # 从环境变量或配置文件加载配置
+    app.config.from_object(Config)
+    app.config.update(overrides or {})
+
+    # 初始化扩展
+    db.init_app(app)
+    sqlite_profile.init_app(app, db)
+    # AI维护注意点: 剖析与流量录制钩子最先注册，其 after_request 最后执行，覆盖其他钩子的耗时
+    request_profiler.init_app(app)
+    traffic_capture.init_app(app)
+    metrics.init_app(app, db)
+    slow_queries.init_app(app, db)
+    jwt.init_app(app)
+    counters.init_app(app)
+    live_events.init_app(app)
+    snapshots.init_app(app)
+    writes.init_app(app)
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
+            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"]
+        }
+    })
+
+    # 注册错误处理
+    @app.errorhandler(404)
+    def not_found(error):
+        """处理404错误"""
+        return jsonify({"error": "接口不存在", "code": 404}), 404
+
+    @app.errorhandler(500)
+    def internal_error(error):
+        """处理500错误并回滚数据库"""
+        db.session.rollback()
+        return jsonify({"error": "服务器内部错误", "code": 500}), 500
+
+    @app.after_request
+    def cache_hashed_avatars(response):
+        """
+        静态资源缓存头：内容哈希命名的头像永久缓存，看板快照按刷新周期缓存
+
+        AI维护注意点: 头像文件名随内容变化，URL不变则内容不变，可安全设置immutable
+        """
+        from utils.avatar_pipeline import HASHED_NAME_RE
+        if request.path.startswith('/static/avatars/') and response.status_code == 200:
+            if HASHED_NAME_RE.match(os.path.basename(request.path)):
+                response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        elif request.path.startswith('/static/boards/') and response.status_code == 200:
+            # 看板快照按刷新周期缓存（CDN同样适用）
+            response.headers['Cache-Control'] = f"public, max-age={int(snapshots.refresh_interval)}"
+        return response
+
+    # 延迟导入路由避免循环依赖
+    # AI维护注意点: 蓝图注册顺序影响中间件执行顺序
+    with app.app_context():
+        from routes.admin import admin_bp
+        from routes.auth import auth_bp
+        from routes.reviews import reviews_bp
+        from routes.stats import stats_bp
+        from routes.templates import templates_bp
+
+        # 注册蓝图 - URL前缀统一管理
+        app.register_blueprint(auth_bp, url_prefix='/api/auth')
+        app.register_blueprint(templates_bp, url_prefix='/api/templates')
+        app.register_blueprint(reviews_bp, url_prefix='/api/reviews')
+        app.register_blueprint(stats_bp, url_prefix='/api/stats')
+        app.register_blueprint(admin_bp, url_prefix='/api/admin')
+        if viz:
+            from routes.visualization import viz_router
+            app.register_blueprint(viz_router)
+
+        # 注册命令行工具
+        from cli import perf_cli, viz_cli
+        app.cli.add_command(viz_cli)
+        app.cli.add_command(perf_cli)
+
+        # 创建所有数据库表
+        # AI维护注意点: 生产环境应使用Alembic进行数据库迁移，不要auto create
+        db.create_all()
+
+        # 存量分享者补建汇总行，点赞累加 total_likes 才有行可更新（见 utils/rollups.py）
+        from utils.rollups import ensure_sharer_stats
+        if ensure_sharer_stats(db.session):
+            db.session.commit()
+        db.session.remove()
+
+    # 预渲染常见姓氏默认头像（worker开始服务前完成，gunicorn --preload 时在fork前完成）
+    from utils.avatar_generator import warmup as warmup_default_avatars
+    warmup_default_avatars()
+
+    @app.route('/api/health', methods=['GET'])
+    def health_check():
+        """健康检查端点"""
+        return jsonify({
+            "status": "healthy",
+            "service": "5min-review-api",
+            "version": "1.0.0"
+        })
+
+    return app
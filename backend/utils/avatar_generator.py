@@ -3,13 +3,16 @@
 ================================
 生成姓氏首字母的彩色圆形头像
 AI维护注意点:
-1. 生成80x80像素的圆形头像
+1. 默认80x80像素，支持40/80/160三档
 2. 使用预定义配色方案（柔和色彩）
-3. 字体回退机制：优先使用系统字体
-4. 生成后保存到 static/avatars/default/ 目录
+3. 字体回退机制：优先使用系统字体，每个字号只加载一次
+4. 线上在内存中渲染并LRU缓存编码后的PNG/WebP字节，由 /api/viz/avatars/default/ 路由输出
+5. generate_default_avatar 仍可把头像导出到 static/avatars/default/ 目录
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+from io import BytesIO
 import os
 import hashlib
 
@@ -29,6 +32,27 @@ COLOR_PALETTE = [
     (200, 230, 201),  # 淡绿
 ]
 
+# 常见姓氏（中文+英文），启动预热与批量生成使用
+COMMON_INITIALS = [
+    # 中文常见姓氏
+    "李", "王", "张", "刘", "陈", "杨", "赵", "黄", "周", "吴",
+    "徐", "孙", "胡", "朱", "高", "林", "何", "郭", "马", "罗",
+    "梁", "宋", "郑", "谢", "韩", "唐", "冯", "于", "董", "萧",
+    "程", "曹", "袁", "邓", "许", "傅", "沈", "曾", "彭", "吕",
+    "苏", "卢", "蒋", "蔡", "贾", "丁", "魏", "薛", "叶", "阎",
+    "余", "潘", "杜", "戴", "夏", "钟", "汪", "田", "任", "姜",
+    "范", "方", "石", "姚", "谭", "廖", "邹", "熊", "金", "陆",
+    "郝", "孔", "白", "崔", "康", "毛", "邱", "秦", "江", "史",
+    "顾", "侯", "邵", "孟", "龙", "万", "段", "雷", "钱", "汤",
+    "尹", "黎", "易", "常", "武", "乔", "贺", "赖", "龚", "文",
+    # 英文首字母
+    "A", "B", "C", "D", "E", "F", "G", "H", "I", "J",
+    "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T",
+    "U", "V", "W", "X", "Y", "Z",
+    # 特殊
+    "光", "影", "时", "团", "声", "J", "S"  # 你的示例分享者
+]
+
 
 def get_color_for_name(name: str) -> tuple:
     """
@@ -43,9 +67,124 @@ def get_color_for_name(name: str) -> tuple:
     return COLOR_PALETTE[color_index]
 
 
+# 字体候选（优先Arial，其次支持中文的系统字体）
+FONT_PATHS = [
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/simsun.ttc",  # 宋体（支持中文）
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+    "/System/Library/Fonts/Helvetica.ttc",  # macOS
+]
+
+# 默认头像尺寸
+DEFAULT_SIZE = 80
+# 允许渲染的尺寸（与上传头像变体一致，防止任意尺寸撑爆缓存）
+ALLOWED_SIZES = (40, 80, 160)
+# 输出格式 -> (Pillow格式, MIME类型)
+FORMATS = {
+    'png': ('PNG', 'image/png'),
+    'webp': ('WEBP', 'image/webp'),
+}
+
+
+def avatar_initial(name: str) -> str:
+    """取姓名第一个字符（通常是姓氏），英文转大写"""
+    if not name:
+        name = "匿名"
+    return name[0].upper() if name[0].isalpha() else name[0]
+
+
+@lru_cache(maxsize=None)
+def _font_path():
+    """探测一次可用字体路径，进程内复用"""
+    for font_path in FONT_PATHS:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+@lru_cache(maxsize=16)
+def _load_font(font_size: int):
+    """
+    按字号加载字体，每个字号只加载一次
+    
+    AI维护注意点: 字体回退：先尝试Arial，再尝试系统默认
+    """
+    font_path = _font_path()
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, font_size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def render_default_avatar(char: str, size: int = DEFAULT_SIZE, fmt: str = 'png') -> bytes:
+    """
+    渲染单字头像并编码为图片字节（LRU缓存）
+    
+    Args:
+        char: 头像上显示的字符（见 avatar_initial）
+        size: 边长像素
+        fmt: png / webp
+        
+    Returns:
+        bytes: 编码后的图片
+        
+    AI维护注意点:
+    1. 背景色按字符哈希确定，同一字符在任何尺寸/格式下颜色一致
+    2. 缓存键为 (字符, 尺寸, 格式)，常用姓氏在启动时由 warmup 预渲染
+    """
+    img = Image.new('RGB', (size, size), get_color_for_name(char))
+    draw = ImageDraw.Draw(img)
+    font = _load_font(round(size * 0.45))
+    
+    # 计算文字位置（居中）
+    bbox = draw.textbbox((0, 0), char, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    
+    x = (size - text_width) // 2 - bbox[0]
+    y = (size - text_height) // 2 - bbox[1]
+    
+    # 绘制白色文字
+    draw.text((x, y), char, fill=(255, 255, 255), font=font)
+    
+    buf = BytesIO()
+    img.save(buf, FORMATS[fmt][0])
+    return buf.getvalue()
+
+
+def avatar_etag(data: bytes) -> str:
+    """头像字节的强ETag"""
+    return '"' + hashlib.md5(data).hexdigest() + '"'
+
+
+def warmup(names: list = None, sizes: tuple = (DEFAULT_SIZE,), formats: tuple = tuple(FORMATS)) -> int:
+    """
+    预渲染常见姓氏头像到内存缓存
+    
+    Returns:
+        int: 预渲染的头像数
+        
+    AI维护注意点:
+    在 utils/app_factory.create_app 装配时调用：worker开始服务前完成；
+    gunicorn 使用 --preload 时在fork前执行，所有worker共享缓存页
+    """
+    names = names or COMMON_INITIALS
+    count = 0
+    for name in names:
+        char = avatar_initial(name)
+        for size in sizes:
+            for fmt in formats:
+                render_default_avatar(char, size, fmt)
+                count += 1
+    return count
+
+
 def generate_default_avatar(name: str, output_dir: str = None) -> str:
     """
-    生成姓氏首字母头像
+    生成姓氏首字母头像文件
     
     Args:
         name: 姓名（如"李阳州"）
@@ -55,15 +194,10 @@ def generate_default_avatar(name: str, output_dir: str = None) -> str:
         str: 生成的文件路径
         
     AI维护注意点:
-    1. 取姓名第一个字符（通常是姓氏）
-    2. 圆形头像，白色文字
-    3. 字体回退：先尝试Arial，再尝试系统默认
+    线上看板已改为 /api/viz/avatars/default/{字}.png 内存渲染，
+    此函数保留用于导出静态文件（如CDN预置）
     """
-    if not name:
-        name = "匿名"
-    
-    # 取第一个字符（通常是姓氏）
-    char = name[0].upper() if name[0].isalpha() else name[0]
+    char = avatar_initial(name)
     
     # 确定输出路径
     if output_dir is None:
@@ -73,55 +207,14 @@ def generate_default_avatar(name: str, output_dir: str = None) -> str:
     os.makedirs(output_dir, exist_ok=True)
     
     # 生成文件名（使用字符避免特殊字符问题）
-    filename = f"{char}.png"
-    filepath = os.path.join(output_dir, filename)
+    filepath = os.path.join(output_dir, f"{char}.png")
     
     # 如果已存在，直接返回
     if os.path.exists(filepath):
         return filepath
     
-    # 创建80x80像素的图像
-    size = 80
-    img = Image.new('RGB', (size, size), get_color_for_name(name))
-    draw = ImageDraw.Draw(img)
-    
-    # 尝试加载字体（优先Arial，其次是系统默认）
-    font = None
-    font_size = 36
-    
-    try:
-        # Windows系统字体
-        font_paths = [
-            "C:/Windows/Fonts/arial.ttf",
-            "C:/Windows/Fonts/simsun.ttc",  # 宋体（支持中文）
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-            "/System/Library/Fonts/Helvetica.ttc",  # macOS
-        ]
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                font = ImageFont.truetype(font_path, font_size)
-                break
-    except:
-        pass
-    
-    if font is None:
-        # 使用默认字体
-        font = ImageFont.load_default()
-    
-    # 计算文字位置（居中）
-    bbox = draw.textbbox((0, 0), char, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    x = (size - text_width) // 2 - bbox[0]
-    y = (size - text_height) // 2 - bbox[1]
-    
-    # 绘制白色文字
-    draw.text((x, y), char, fill=(255, 255, 255), font=font)
-    
-    # 保存
-    img.save(filepath, 'PNG')
+    with open(filepath, 'wb') as f:
+        f.write(render_default_avatar(char))
     
     return filepath
 
@@ -134,26 +227,7 @@ def generate_all_default_avatars(names: list = None):
     预生成常见姓氏的头像，提升首次加载速度
     """
     if names is None:
-        # 常见姓氏（中文+英文）
-        names = [
-            # 中文常见姓氏
-            "李", "王", "张", "刘", "陈", "杨", "赵", "黄", "周", "吴",
-            "徐", "孙", "胡", "朱", "高", "林", "何", "郭", "马", "罗",
-            "梁", "宋", "郑", "谢", "韩", "唐", "冯", "于", "董", "萧",
-            "程", "曹", "袁", "邓", "许", "傅", "沈", "曾", "彭", "吕",
-            "苏", "卢", "蒋", "蔡", "贾", "丁", "魏", "薛", "叶", "阎",
-            "余", "潘", "杜", "戴", "夏", "钟", "汪", "田", "任", "姜",
-            "范", "方", "石", "姚", "谭", "廖", "邹", "熊", "金", "陆",
-            "郝", "孔", "白", "崔", "康", "毛", "邱", "秦", "江", "史",
-            "顾", "侯", "邵", "孟", "龙", "万", "段", "雷", "钱", "汤",
-            "尹", "黎", "易", "常", "武", "乔", "贺", "赖", "龚", "文",
-            # 英文首字母
-            "A", "B", "C", "D", "E", "F", "G", "H", "I", "J",
-            "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T",
-            "U", "V", "W", "X", "Y", "Z",
-            # 特殊
-            "光", "影", "时", "团", "声", "J", "S"  # 你的示例分享者
-        ]
+        names = COMMON_INITIALS
     
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'static', 'avatars', 'default')
     
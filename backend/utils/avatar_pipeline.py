@@ -0,0 +1,134 @@
+"""
+5分钟快速复盘 - 头像处理流水线
+==============================
+上传头像的解码、裁剪、多尺寸编码，在独立进程池中执行，不阻塞事件循环
+AI维护注意点:
+1. JPEG使用 Pillow draft() 按缩小比例解码，大图只解码到最接近目标的尺寸
+2. 输出 40/80/160px 的 WebP 与 JPEG，文件名为原图内容哈希：{hash}_{size}.{ext}
+3. 内容寻址文件永不覆盖修改，可配置 immutable 长缓存（见 utils/app_factory.py 的 cache_hashed_avatars）
+4. 先原子写完所有文件（临时文件 + os.replace），再由调用方一次UPDATE切换头像URL
+5. 本模块只依赖Pillow，进程池使用spawn启动，子进程导入开销小
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+# 输出尺寸（移动端卡片 1x/2x/4x）
+AVATAR_SIZES = (40, 80, 160)
+# 前端默认使用的尺寸
+DEFAULT_SIZE = 80
+AVATAR_FORMATS = (('webp', 'WEBP', {'quality': 82, 'method': 4}),
+                  ('jpg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}))
+
+# 内容寻址文件名，用于识别可永久缓存的头像
+HASHED_NAME_RE = re.compile(r'^[0-9a-f]{16}_\d+\.(webp|jpg)$')
+
+# 进程池大小（每个gunicorn worker各一个池）
+POOL_WORKERS = int(os.environ.get('AVATAR_POOL_WORKERS') or 2)
+
+_pool = None
+
+
+class ImageTooLarge(ValueError):
+    """像素数超过 Pillow 的解压炸弹上限（Image.MAX_IMAGE_PIXELS 的2倍）"""
+
+
+def content_hash(contents: bytes) -> str:
+    """原图内容哈希（16位十六进制）"""
+    return hashlib.sha256(contents).hexdigest()[:16]
+
+
+def variant_name(digest: str, size: int, ext: str) -> str:
+    return f"{digest}_{size}.{ext}"
+
+
+def process_avatar(contents: bytes, output_dir: str) -> dict:
+    """
+    解码、居中裁剪并输出全部尺寸变体（在子进程中执行）
+
+    Returns:
+        dict: {"hash": 内容哈希, "files": [文件名, ...]}
+
+    Raises:
+        ImageTooLarge: 像素数超过解压炸弹上限
+
+    AI维护注意点: 同一内容重复上传时文件已存在，直接复用
+    """
+    digest = content_hash(contents)
+    names = [variant_name(digest, size, ext) for size in AVATAR_SIZES for ext, _, _ in AVATAR_FORMATS]
+    if all(os.path.exists(os.path.join(output_dir, name)) for name in names):
+        return {'hash': digest, 'files': names}
+
+    try:
+        img = Image.open(BytesIO(contents))
+    except Image.DecompressionBombError as e:
+        # 压缩后很小、解码后极大的图片，在分配内存前拒绝
+        raise ImageTooLarge(str(e)) from None
+    largest = max(AVATAR_SIZES)
+    if img.format == 'JPEG':
+        # 按 1/2、1/4、1/8 缩小解码，保证短边仍不小于最大输出尺寸
+        img.draft('RGB', (largest, largest))
+
+    # 转换为RGB（处理PNG透明通道）
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # 裁剪为正方形（取中心区域）
+    width, height = img.size
+    min_dim = min(width, height)
+    left = (width - min_dim) // 2
+    top = (height - min_dim) // 2
+    img = img.crop((left, top, left + min_dim, top + min_dim))
+
+    os.makedirs(output_dir, exist_ok=True)
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        resized = img.resize((size, size), Image.Resampling.LANCZOS)
+        for ext, pil_format, options in AVATAR_FORMATS:
+            _write_atomic(os.path.join(output_dir, variant_name(digest, size, ext)),
+                          resized, pil_format, options)
+
+    return {'hash': digest, 'files': names}
+
+
+def _write_atomic(path: str, img: Image.Image, pil_format: str, options: dict):
+    """先写临时文件再改名，读者永远看不到半个文件"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    img.save(tmp_path, pil_format, **options)
+    os.replace(tmp_path, path)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """惰性创建进程池"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _pool
+
+
+async def process_avatar_async(contents: bytes, output_dir: str) -> dict:
+    """在进程池中处理头像，事件循环只等待结果"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pool(), process_avatar, contents, output_dir)
+
+
+def variant_urls(digest: str, url_prefix: str = '/static/avatars') -> dict:
+    """
+    生成前端可用的各尺寸URL
+
+    Returns:
+        dict: {"webp": {"40": url, ...}, "jpg": {...}}
+    """
+    return {
+        ext: {str(size): f"{url_prefix}/{variant_name(digest, size, ext)}" for size in AVATAR_SIZES}
+        for ext, _, _ in AVATAR_FORMATS
+    }
@@ -0,0 +1,133 @@
+"""
+5分钟快速复盘 - 看板头像雪碧图
+==============================
+把一天看板上所有分享者的头像拼成一张WebP，前端一次请求拿到全部头像
+AI维护注意点:
+1. 版本号 = 成员(id, 头像URL)列表的哈希；上传头像会换内容哈希URL，版本随之变化
+2. 同版本只拼一次：进程内LRU + static/avatars/sprites/{版本}.webp 磁盘缓存（多worker共享）
+3. 网格布局按分享者id排序，偏移量由 layout() 计算，看板接口随数据一起返回
+4. 已上传头像读取本地80px文件，未上传或文件缺失时使用默认首字母头像
+"""
+
+import hashlib
+import math
+import os
+from collections import OrderedDict
+from io import BytesIO
+from threading import Lock, get_ident
+
+from PIL import Image
+
+from utils.avatar_generator import avatar_initial, render_default_avatar
+from utils.metrics import cache_lookup
+
+CELL_SIZE = 80
+MEMORY_CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def sprite_version(members) -> str:
+    """
+    雪碧图版本号
+
+    Args:
+        members: [(sharer_id, name, avatar_url), ...]
+    """
+    digest = hashlib.sha1(str(CELL_SIZE).encode())
+    for sharer_id, name, avatar_url in sorted(members):
+        digest.update(f"{sharer_id}:{avatar_url or 'default:' + avatar_initial(name)}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def grid(members) -> tuple:
+    """网格列数与行数"""
+    columns = max(1, math.ceil(math.sqrt(len(members))))
+    rows = max(1, math.ceil(len(members) / columns))
+    return columns, rows
+
+
+def layout(members) -> dict:
+    """
+    计算每位分享者在雪碧图中的偏移
+
+    Returns:
+        dict: {sharer_id: {"x": 像素, "y": 像素}}
+    """
+    ordered = sorted(members)
+    columns, _ = grid(ordered)
+    return {
+        sharer_id: {"x": (i % columns) * CELL_SIZE, "y": (i // columns) * CELL_SIZE}
+        for i, (sharer_id, _, _) in enumerate(ordered)
+    }
+
+
+def _load_avatar(name, avatar_url, static_dir):
+    """读取已上传头像，失败时回退为默认头像"""
+    if avatar_url and avatar_url.startswith('/static/avatars/'):
+        path = os.path.join(static_dir, avatar_url[len('/static/'):])
+        # 内容哈希头像优先取同尺寸WebP
+        root, _ = os.path.splitext(path)
+        for candidate in (root + '.webp', path):
+            if os.path.exists(candidate):
+                try:
+                    img = Image.open(candidate).convert('RGB')
+                    if img.size != (CELL_SIZE, CELL_SIZE):
+                        img = img.resize((CELL_SIZE, CELL_SIZE), Image.Resampling.LANCZOS)
+                    return img
+                except OSError:
+                    break
+    return Image.open(BytesIO(render_default_avatar(avatar_initial(name), CELL_SIZE, 'png'))).convert('RGB')
+
+
+def build_sprite(members, static_dir) -> bytes:
+    """拼接雪碧图并编码为WebP"""
+    offsets = layout(members)
+    columns, rows = grid(members)
+    sheet = Image.new('RGB', (columns * CELL_SIZE, rows * CELL_SIZE), (255, 255, 255))
+    for sharer_id, name, avatar_url in members:
+        offset = offsets[sharer_id]
+        sheet.paste(_load_avatar(name, avatar_url, static_dir), (offset["x"], offset["y"]))
+    buf = BytesIO()
+    sheet.save(buf, 'WEBP', quality=82, method=4)
+    return buf.getvalue()
+
+
+def get_sprite(members, static_dir) -> tuple:
+    """
+    获取雪碧图（带缓存）
+
+    Returns:
+        tuple: (版本号, WebP字节)
+    """
+    version = sprite_version(members)
+    with _cache_lock:
+        hit = version in _cache
+        if hit:
+            _cache.move_to_end(version)
+            data = _cache[version]
+    cache_lookup('avatar_sprite_memory', hit)
+    if hit:
+        return version, data
+
+    sprite_dir = os.path.join(static_dir, 'avatars', 'sprites')
+    path = os.path.join(sprite_dir, f"{version}.webp")
+    on_disk = os.path.exists(path)
+    cache_lookup('avatar_sprite_disk', on_disk)
+    if on_disk:
+        with open(path, 'rb') as f:
+            data = f.read()
+    else:
+        data = build_sprite(members, static_dir)
+        os.makedirs(sprite_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    with _cache_lock:
+        _cache[version] = data
+        while len(_cache) > MEMORY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return version, data
@@ -0,0 +1,84 @@
+"""
+5分钟快速复盘 - 布隆过滤器
+==========================
+进程内的近期键集合，用于点赞等高频去重的快速拒绝路径
+AI维护注意点:
+1. 只会误报（把没见过的键判为见过），不会漏报
+2. 误报率由 error_rate 控制，容量满后整代轮换，内存占用恒定
+3. 每个gunicorn worker各一份，未命中时仍以数据库唯一约束为准；命中只表示"可能见过"，
+   不能据此丢弃写入，需查库确认
+4. RecentKeyFilter 查询两代，实际误报率约为 error_rate 的两倍
+"""
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """
+    定长布隆过滤器
+
+    AI维护注意点: 位数组用bytearray实现，不依赖第三方库
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.0001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # m = -n·ln(p) / (ln2)², k = m/n·ln2
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        """双重哈希生成k个位位置"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RecentKeyFilter:
+    """
+    近期键过滤器（两代轮换的布隆过滤器）
+
+    用法:
+        recent = RecentKeyFilter(capacity=100000)
+        if recent.seen(key): ...
+        recent.add(key)
+
+    AI维护注意点:
+    1. 当前代写满 capacity 后，旧代丢弃、当前代降为旧代
+    2. 查询同时检查两代，因此至少记住最近 capacity 个键，误报率约为单代的两倍
+    3. 线程安全
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.0001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = None
+        self._lock = threading.Lock()
+
+    def add(self, key: str):
+        with self._lock:
+            if self._current.count >= self.capacity:
+                self._previous = self._current
+                self._current = BloomFilter(self.capacity, self.error_rate)
+            self._current.add(key)
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            if key in self._current:
+                return True
+            return self._previous is not None and key in self._previous
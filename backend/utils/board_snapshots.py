@@ -0,0 +1,150 @@
+"""
+5分钟快速复盘 - 看板静态快照发布
+================================
+把每天的看板数据预渲染为 static/boards/{date}.json，历史看板由静态文件服务器/CDN直接返回
+AI维护注意点:
+1. 快照内容与 GET /api/viz/reviews/{date} 的响应完全一致（同一个渲染函数），前端可直接替换
+2. save_review 提交后立即发布；点赞与头像变化只标记"脏"复盘日，后台线程每
+   SNAPSHOT_REFRESH_INTERVAL 秒重新发布一次，点赞再多也只重写一次文件
+3. 文件先写临时文件再 os.replace，读者不会看到半个JSON
+4. 渲染函数由路由模块通过 set_renderer 注册，本模块不依赖路由
+5. 快照中的点赞数可能落后一个刷新周期，看板打开后由SSE推送补齐
+"""
+
+import atexit
+import json
+import os
+import threading
+
+
+class BoardSnapshotPublisher:
+    """
+    看板静态快照发布器
+
+    用法:
+        snapshots.set_renderer(render)      # render(day) -> dict
+        snapshots.publish(day)              # 立即发布
+        snapshots.mark_dirty([day_id, ...]) # 下个周期重新发布
+    """
+
+    def __init__(self, app=None, refresh_interval=60.0):
+        self.refresh_interval = refresh_interval
+        self.directory = None
+        self._render = None
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._app = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定Flask应用：快照目录为 static/boards"""
+        self._app = app
+        self.refresh_interval = app.config.get('SNAPSHOT_REFRESH_INTERVAL', self.refresh_interval)
+        self.directory = os.path.join(app.static_folder, 'boards')
+        app.extensions['board_snapshots'] = self
+        atexit.register(self._stopped.set)
+
+    def set_renderer(self, render):
+        """注册看板渲染函数 render(ReviewDay) -> dict"""
+        self._render = render
+
+    # ============ 发布 ============
+
+    def path_for(self, day_date) -> str:
+        return os.path.join(self.directory, f"{day_date.strftime('%Y-%m-%d')}.json")
+
+    def publish(self, day):
+        """
+        渲染并写出某天的快照（需在应用上下文中调用）
+
+        Returns:
+            str | None: 快照文件路径，未初始化时为None
+        """
+        if self._render is None or self.directory is None:
+            return None
+        payload = self._render(day)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(day.date)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return path
+
+    def publish_all(self, day_ids=None):
+        """
+        发布指定复盘日（None表示全部）的快照
+
+        Returns:
+            int: 发布的快照数
+        """
+        from models.visualization import ReviewDay
+
+        query = ReviewDay.query.order_by(ReviewDay.date)
+        if day_ids is not None:
+            query = query.filter(ReviewDay.id.in_(list(day_ids)))
+        count = 0
+        for day in query:
+            self.publish(day)
+            count += 1
+        return count
+
+    # ============ 定时刷新 ============
+
+    def mark_dirty(self, day_ids):
+        """标记需要重新发布的复盘日（点赞数、头像变化）"""
+        if self._app is None:
+            return
+        with self._lock:
+            self._dirty.update(day_ids)
+        self._ensure_refresher()
+
+    def mark_likes_dirty(self, conn, insight_ids):
+        """
+        计数缓冲落库钩子：标记点赞变化的干货所在复盘日
+
+        AI维护注意点: 落库时才标记，快照读到的是已落库的点赞数
+        """
+        from sqlalchemy import select
+
+        from models.visualization import Insight
+
+        self.mark_dirty(conn.execute(
+            select(Insight.day_id).where(Insight.id.in_(insight_ids)).distinct()
+        ).scalars().all())
+
+    def refresh(self):
+        """重新发布所有脏复盘日"""
+        with self._lock:
+            day_ids, self._dirty = self._dirty, set()
+        if not day_ids:
+            return 0
+        try:
+            return self.publish_all(day_ids)
+        except Exception:
+            with self._lock:
+                self._dirty.update(day_ids)
+            raise
+
+    def _ensure_refresher(self):
+        """首次标记时启动后台刷新线程（每个worker进程各一个）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='board-snapshots', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                with self._app.app_context():
+                    self.refresh()
+            except Exception as e:
+                self._app.logger.warning(f"看板快照刷新失败，稍后重试：{e}")
@@ -0,0 +1,237 @@
+"""
+5分钟快速复盘 - 计数器写回缓冲
+================================
+热点计数列（Insight.likes、ReviewTemplate.use_count、SharerStats.total_likes）的写回(write-behind)子系统
+AI维护注意点:
+1. 自增只写内存缓冲，后台线程定期以 col = col + n 的原子批量UPDATE落库
+2. 读取时叠加本进程未落库的增量（read-through），保证点赞后立即可见
+3. gunicorn多worker各自持有缓冲，落库语句为原子加法，不会互相覆盖
+4. 其他worker的增量最多延迟一个刷新周期可见
+5. 进程异常退出会丢失最多一个周期的增量，由 flask counters reconcile 按明细表重算纠正
+"""
+
+import atexit
+import threading
+from collections import defaultdict
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import bindparam, func, select, update
+
+
+class WriteBehindCounter:
+    """
+    计数器写回缓冲
+
+    用法:
+        counters.incr(Insight.likes, insight.id)
+        counters.read(Insight.likes, insight.id, insight.likes)
+
+    AI维护注意点:
+    1. 以 (表, 列, 主键) 为键累积增量，column 传ORM属性（如 Insight.likes），表须为单列主键
+    2. 刷新失败时增量回填缓冲，下个周期重试
+    3. 必须在业务事务提交之后调用 incr，避免回滚后计数虚高
+    """
+
+    # 对账规则：计数列 -> (明细表, 明细表外键列)
+    # AI维护注意点: 新增写回计数列时需在此登记重算来源；实时增减须与来源同口径
+    #   （如 use_count 随复盘新建/删除/换模板增减，见 ReviewTemplate.adjust_use_count），否则每晚对账会跳变
+    RECONCILE_SOURCES = {
+        ('insights', 'likes'): ('likes', 'insight_id'),
+        ('review_templates', 'use_count'): ('reviews', 'template_id'),
+    }
+
+    def __init__(self, app=None, flush_interval=2.0):
+        self.flush_interval = flush_interval
+        self._pending = defaultdict(int)
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._hooks = defaultdict(list)
+        self._app = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定Flask应用：读取刷新间隔、注册CLI命令与退出时落库"""
+        self._app = app
+        self.flush_interval = app.config.get('COUNTER_FLUSH_INTERVAL', self.flush_interval)
+        app.extensions['counters'] = self
+        app.cli.add_command(counters_cli)
+        atexit.register(self.shutdown)
+
+    # ============ 写入 ============
+
+    def incr(self, column, pk, n=1):
+        """
+        缓冲一次自增
+
+        Args:
+            column: ORM列属性，如 Insight.likes
+            pk: 行主键
+            n: 增量，默认1
+        """
+        table = column.class_.__table__
+        key = (table.name, column.key, pk)
+        with self._lock:
+            self._tables[table.name] = table
+            self._pending[key] += n
+        self._ensure_flusher()
+
+    def add_flush_hook(self, column, hook):
+        """
+        注册落库钩子：某计数列落库后，在同一事务内回调 hook(conn, 主键列表)
+
+        AI维护注意点: 用于维护依赖计数的派生数据（如热度分），钩子异常会回滚整批落库
+        """
+        table = column.class_.__table__
+        self._hooks[(table.name, column.key)].append(hook)
+
+    # ============ 读取 ============
+
+    def pending(self, column, pk):
+        """本进程尚未落库的增量"""
+        key = (column.class_.__table__.name, column.key, pk)
+        with self._lock:
+            return self._pending.get(key, 0)
+
+    def read(self, column, pk, persisted):
+        """
+        读穿缓冲：已落库值 + 未落库增量
+
+        Args:
+            persisted: 从数据库读到的列值（可为None）
+        """
+        return (persisted or 0) + self.pending(column, pk)
+
+    # ============ 落库 ============
+
+    def flush(self):
+        """
+        将缓冲增量批量落库
+
+        Returns:
+            int: 落库的行数
+
+        AI维护注意点: 需在应用上下文中调用（后台线程会自动推入）
+        """
+        from extensions import db
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(int)
+
+            groups = defaultdict(list)
+            for (table_name, column_name, pk), n in batch.items():
+                if n:
+                    groups[(table_name, column_name)].append({'_pk': pk, '_n': n})
+
+            if not groups:
+                return 0
+
+            try:
+                with db.engine.begin() as conn:
+                    for (table_name, column_name), params in groups.items():
+                        table = self._tables[table_name]
+                        pk_column = list(table.primary_key.columns)[0]
+                        stmt = update(table).where(
+                            pk_column == bindparam('_pk')
+                        ).values({column_name: table.c[column_name] + bindparam('_n')})
+                        conn.execute(stmt, params)
+                        for hook in self._hooks.get((table_name, column_name), ()):
+                            hook(conn, [p['_pk'] for p in params])
+            except Exception:
+                # 落库失败：增量回填，下次重试
+                with self._lock:
+                    for key, n in batch.items():
+                        self._pending[key] += n
+                raise
+
+            return sum(len(params) for params in groups.values())
+
+    def reconcile(self):
+        """
+        按明细表重算所有写回计数列
+
+        Returns:
+            dict: {"表.列": 更新行数}
+
+        AI维护注意点:
+        1. 先落库本进程缓冲，再以明细表COUNT覆盖计数列
+        2. 其他worker此刻未落库的增量会在其刷新后造成短暂偏差，下次对账纠正
+        """
+        from extensions import db
+
+        self.flush()
+
+        results = {}
+        with db.engine.begin() as conn:
+            for (table_name, column_name), (source_name, fk_name) in self.RECONCILE_SOURCES.items():
+                table = db.metadata.tables[table_name]
+                source = db.metadata.tables[source_name]
+                count_subquery = select(func.count()).where(
+                    source.c[fk_name] == table.c.id
+                ).scalar_subquery()
+                result = conn.execute(
+                    update(table).values({column_name: count_subquery})
+                )
+                results[f"{table_name}.{column_name}"] = result.rowcount
+        return results
+
+    # ============ 后台线程 ============
+
+    def _ensure_flusher(self):
+        """首次自增时启动后台刷新线程（每个worker进程各一个）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._app is None:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='counter-flusher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                with self._app.app_context():
+                    self.flush()
+            except Exception as e:
+                self._app.logger.warning(f"计数器落库失败，稍后重试：{e}")
+
+    def shutdown(self):
+        """停止后台线程并落库剩余增量"""
+        self._stopped.set()
+        if self._app is None:
+            return
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception as e:
+            self._app.logger.warning(f"退出时计数器落库失败：{e}")
+
+
+counters_cli = AppGroup('counters', help='计数器维护命令')
+
+
+@counters_cli.command('flush')
+def flush_command():
+    """立即落库本进程缓冲（调试用）"""
+    rows = current_app.extensions['counters'].flush()
+    click.echo(f"已落库 {rows} 行计数")
+
+
+@counters_cli.command('reconcile')
+def reconcile_command():
+    """按likes/reviews明细表重算点赞数与模板使用次数"""
+    results = current_app.extensions['counters'].reconcile()
+    for name, rows in results.items():
+        click.echo(f"{name}: 已重算 {rows} 行")
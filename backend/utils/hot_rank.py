@@ -0,0 +1,100 @@
+"""
+5分钟快速复盘 - 干货热度排行
+============================
+"精选"信息流的时间衰减热度分（Reddit hot 公式）
+AI维护注意点:
+1. score = log10(max(likes, 1)) + (复盘日 - 纪元) 秒数 / DECAY_SECONDS
+2. 新内容天然更高分，旧内容需要10倍点赞才能抵消 DECAY_SECONDS 的时间差，
+   因此分数无需随时间重算，只在点赞变化时更新，排行即 score 索引倒序读取
+3. 以复盘日（而非入库时间）为时间基准，批量导入的历史数据不会被当成新内容
+4. 点赞由计数缓冲落库钩子 refresh() 在同一事务内刷新，保存复盘时 index_insights() 写初始分
+"""
+
+import math
+from datetime import date, datetime
+
+from sqlalchemy import bindparam, delete, insert, select, update
+
+# 12.5小时：Reddit原始参数，复盘按天发布，差一天约等于 10^1.7 倍点赞
+DECAY_SECONDS = 45000
+EPOCH = datetime(2024, 1, 1)
+
+
+def hot_score(likes: int, day_date: date) -> float:
+    """计算热度分"""
+    if isinstance(day_date, str):
+        day_date = date.fromisoformat(day_date)
+    seconds = (datetime(day_date.year, day_date.month, day_date.day) - EPOCH).total_seconds()
+    return round(math.log10(max(likes or 0, 1)) + seconds / DECAY_SECONDS, 7)
+
+
+def index_insights(session, insights, day_date: date):
+    """为一批已flush的干货写入初始热度分"""
+    from models.visualization import HotInsight
+
+    rows = [{'insight_id': insight.id, 'score': hot_score(insight.likes, day_date)} for insight in insights]
+    if rows:
+        session.execute(insert(HotInsight), rows)
+
+
+def remove_day(session, day_id):
+    """删除某个复盘日所有干货的热度分（覆盖保存前调用）"""
+    from models.visualization import HotInsight, Insight
+
+    session.execute(
+        delete(HotInsight).where(
+            HotInsight.insight_id.in_(select(Insight.id).where(Insight.day_id == day_id))
+        )
+    )
+
+
+def refresh(conn, insight_ids):
+    """
+    按最新点赞数刷新热度分（计数缓冲落库钩子）
+
+    Args:
+        conn: 落库事务连接
+        insight_ids: 本批点赞数有变化的干货id
+    """
+    from models.visualization import HotInsight, Insight, ReviewDay
+
+    rows = conn.execute(
+        select(Insight.id, Insight.likes, ReviewDay.date).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).where(Insight.id.in_(insight_ids))
+    ).all()
+    if not rows:
+        return
+    table = HotInsight.__table__
+    conn.execute(
+        update(table).where(table.c.insight_id == bindparam('_id')).values(score=bindparam('_score')),
+        [{'_id': insight_id, '_score': hot_score(likes, day_date)} for insight_id, likes, day_date in rows]
+    )
+
+
+def rebuild(session, batch_size=1000):
+    """
+    全量重算热度分（历史数据回填/公式调整后使用）
+
+    Returns:
+        int: 写入行数
+    """
+    from models.visualization import HotInsight, Insight, ReviewDay
+
+    session.execute(delete(HotInsight))
+    total = 0
+    last_id = 0
+    while True:
+        batch = session.query(Insight.id, Insight.likes, ReviewDay.date).join(
+            ReviewDay, Insight.day_id == ReviewDay.id
+        ).filter(Insight.id > last_id).order_by(Insight.id).limit(batch_size).all()
+        if not batch:
+            break
+        session.execute(insert(HotInsight), [
+            {'insight_id': insight_id, 'score': hot_score(likes, day_date)}
+            for insight_id, likes, day_date in batch
+        ])
+        total += len(batch)
+        last_id = batch[-1].id
+    session.commit()
+    return total
@@ -0,0 +1,154 @@
+"""
+5分钟快速复盘 - 历史复盘批量导入
+================================
+把历史markdown归档目录一次性导入可视化看板（flask viz ingest <dir>）
+AI维护注意点:
+1. 解析在进程池中并行执行（MarkdownParser，与 /api/viz/parse 同一套规则和日期提取）
+2. 分享者一次性解析：全部姓名一条IN查询，缺失的一次批量插入
+3. 按 chunk_size 天一个事务批量插入复盘日/干货，并同步写检索索引、热度分、指纹
+4. 断点续传：已存在的日期直接跳过，每个事务提交后即是一个检查点，中断后重跑即可
+5. 相似近邻与分享者汇总在全部导入后统一重算一次，而不是逐天折入
+"""
+
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+MARKDOWN_EXTENSIONS = ('.md', '.markdown', '.txt')
+
+
+def find_files(directory: str) -> list:
+    """递归列出目录下的markdown文件（按路径排序，保证导入顺序稳定）"""
+    paths = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.lower().endswith(MARKDOWN_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def parse_file(path: str) -> dict:
+    """
+    解析单个文件（在子进程中执行）
+
+    AI维护注意点: 读取/解析异常在这里捕获并随结果返回，单个坏文件（无权限、非UTF-8等）不会中断整个导入
+
+    Returns:
+        dict: {"path", "date", "title", "markdown", "sharers": [(姓名, 表情, [(主题, 内容), ...]), ...], "error"}
+              无法提取日期时 date 为None；失败时 error 为原因说明，其余字段为空
+    """
+    from routes.visualization import MarkdownParser
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            markdown = f.read().strip()
+
+        day_date = None
+        extracted = MarkdownParser._extract_date(markdown)
+        if extracted:
+            try:
+                day_date = date(*map(int, extracted.split('-')))
+            except ValueError:
+                day_date = None
+
+        return {
+            'path': path,
+            'date': day_date,
+            'title': MarkdownParser._extract_title(markdown),
+            'markdown': markdown,
+            'sharers': [
+                (sharer.name, sharer.emoji, [(item.topic, item.content) for item in sharer.insights])
+                for sharer in MarkdownParser.parse(markdown)
+            ],
+            'error': None
+        }
+    except Exception as e:
+        return {
+            'path': path, 'date': None, 'title': None, 'markdown': None, 'sharers': [],
+            'error': f"{type(e).__name__}: {e}"
+        }
+
+
+def parse_all(paths, workers=None):
+    """进程池并行解析，按输入顺序逐个产出结果"""
+    if workers == 1:
+        yield from map(parse_file, paths)
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        yield from pool.map(parse_file, paths, chunksize=8)
+
+
+def resolve_sharers(session, names) -> dict:
+    """
+    姓名 → 分享者id，缺失的批量创建
+
+    AI维护注意点: 已有分享者一条IN查询取回，不逐个 filter_by
+    """
+    from models.visualization import Sharer
+
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    existing = dict(session.query(Sharer.name, Sharer.id).filter(Sharer.name.in_(names)))
+    missing = [name for name in names if name not in existing]
+    if missing:
+        session.execute(insert(Sharer), [{'name': name, 'avatar_url': None} for name in missing])
+        existing.update(session.query(Sharer.name, Sharer.id).filter(Sharer.name.in_(missing)))
+    return existing
+
+
+def insert_days(session, parsed_days, sharer_ids) -> dict:
+    """
+    一个事务内批量插入若干天的复盘与干货，并写入派生索引（调用方提交）
+
+    Returns:
+        dict: {"day_ids": [...], "insights": 干货数, "duplicates": 疑似重复数}
+    """
+    from models.visualization import Insight, ReviewDay
+    from utils import hot_rank, simhash, text_index
+
+    day_rows = [
+        {'date': day['date'], 'title': day['title'] or f"{day['date']} 复盘", 'raw_content': day['markdown']}
+        for day in parsed_days
+    ]
+    day_ids = session.execute(
+        insert(ReviewDay).returning(ReviewDay.id, sort_by_parameter_order=True), day_rows
+    ).scalars().all()
+
+    insight_rows = []
+    for day, day_id in zip(parsed_days, day_ids):
+        for name, emoji, items in day['sharers']:
+            for topic, content in items:
+                insight_rows.append({
+                    'day_id': day_id,
+                    'sharer_id': sharer_ids[name],
+                    'emoji': emoji,
+                    'topic': topic,
+                    'content': content,
+                    'likes': 0
+                })
+    if not insight_rows:
+        return {'day_ids': day_ids, 'insights': 0, 'duplicates': 0}
+
+    insight_ids = session.execute(
+        insert(Insight).returning(Insight.id, sort_by_parameter_order=True), insight_rows
+    ).scalars().all()
+    insights = [SimpleNamespace(id=insight_id, **row) for insight_id, row in zip(insight_ids, insight_rows)]
+
+    text_index.index_insights(session, insights)
+    by_day = defaultdict(list)
+    for insight in insights:
+        by_day[insight.day_id].append(insight)
+    for day, day_id in zip(parsed_days, day_ids):
+        hot_rank.index_insights(session, by_day[day_id], day['date'])
+    duplicates = simhash.index_insights(session, insights)
+
+    return {'day_ids': day_ids, 'insights': len(insights), 'duplicates': len(duplicates)}
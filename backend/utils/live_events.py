@@ -0,0 +1,221 @@
+"""
+5分钟快速复盘 - 看板实时事件总线
+================================
+点赞数变化推送给正在看板的观众（SSE），gunicorn多worker通过本地SQLite文件共享事件
+AI维护注意点:
+1. 发布只写内存：同一干货在一个周期(250ms)内的多次变化合并为一条，周期末批量写入总线文件
+2. 每个worker一个后台线程：先写出本进程的合并事件，再轮询总线新事件，按复盘日合并后
+   分发给本进程的订阅者——几百个观众只产生一次轮询，而不是几百次看板查询
+3. 事件携带的是点赞总数而非增量，前端取 max(本地, 推送)，重复/乱序推送都无害
+4. 点赞时发布"已落库+本进程缓冲"的总数（可能略少），计数缓冲落库后再发布库中准确值
+5. 总线文件为WAL模式的独立SQLite（默认 instance/live_events.db），与业务库无关，
+   只保留最近 RETENTION_SECONDS 秒的事件；首次发布/订阅时才创建，导入应用不产生文件
+"""
+
+import asyncio
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+
+class LiveEventBus:
+    """
+    看板实时事件总线
+
+    用法:
+        live_events.publish(day_id, {insight_id: likes})
+        queue = live_events.subscribe(day_id)   # 在事件循环中调用
+        payload = await queue.get()             # {"likes": {insight_id: likes}}
+        live_events.unsubscribe(day_id, queue)
+    """
+
+    RETENTION_SECONDS = 60
+
+    def __init__(self, app=None, interval=0.25):
+        self.interval = interval
+        self.path = None
+        self._pending = {}
+        self._subscribers = defaultdict(dict)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._app = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._last_id = None
+        self._last_prune = 0.0
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定Flask应用：只确定总线文件位置，首次使用时才建文件"""
+        self._app = app
+        self.interval = app.config.get('LIVE_EVENTS_INTERVAL', self.interval)
+        self.path = app.config.get('LIVE_EVENTS_DB') or os.path.join(app.instance_path, 'live_events.db')
+        app.extensions['live_events'] = self
+        atexit.register(self.shutdown)
+
+    def _connect(self):
+        """每个线程一个总线连接（首次连接时建文件和表）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS like_events ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, day_id INTEGER NOT NULL, '
+                'insight_id INTEGER NOT NULL, likes INTEGER NOT NULL, created_at REAL NOT NULL)'
+            )
+            self._local.conn = conn
+        return conn
+
+    # ============ 发布 ============
+
+    def publish(self, day_id, likes):
+        """
+        发布点赞总数（只写内存，下个周期合并写出）
+
+        Args:
+            day_id: 复盘日id
+            likes: {insight_id: 点赞总数}
+        """
+        if self._app is None:
+            return
+        with self._lock:
+            for insight_id, total in likes.items():
+                key = (day_id, insight_id)
+                self._pending[key] = max(self._pending.get(key, 0), total)
+        self._ensure_worker()
+
+    def publish_persisted(self, conn, insight_ids):
+        """
+        计数缓冲落库钩子：发布库中准确的点赞总数
+
+        AI维护注意点: 在落库事务内读取，值已包含本批增量
+        """
+        from sqlalchemy import select
+
+        from models.visualization import Insight
+
+        rows = conn.execute(
+            select(Insight.day_id, Insight.id, Insight.likes).where(Insight.id.in_(insight_ids))
+        ).all()
+        by_day = defaultdict(dict)
+        for day_id, insight_id, likes in rows:
+            by_day[day_id][insight_id] = likes
+        for day_id, likes in by_day.items():
+            self.publish(day_id, likes)
+
+    # ============ 订阅 ============
+
+    def subscribe(self, day_id) -> asyncio.Queue:
+        """订阅某复盘日的点赞变化（须在事件循环中调用）"""
+        queue = asyncio.Queue(maxsize=64)
+        with self._lock:
+            self._subscribers[day_id][queue] = asyncio.get_running_loop()
+        self._ensure_worker()
+        return queue
+
+    def unsubscribe(self, day_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(day_id)
+            if subscribers is not None:
+                subscribers.pop(queue, None)
+                if not subscribers:
+                    del self._subscribers[day_id]
+
+    # ============ 后台线程 ============
+
+    def tick(self):
+        """
+        一个周期：写出本进程合并的事件 → 轮询总线新事件 → 分发给订阅者
+
+        Returns:
+            int: 分发的复盘日数
+        """
+        conn = self._connect()
+        now = time.time()
+
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            watching = bool(self._subscribers)
+        if self._last_id is None:
+            # 首次轮询从当前位置开始，不回放历史
+            self._last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM like_events').fetchone()[0]
+        if batch:
+            conn.executemany(
+                'INSERT INTO like_events (day_id, insight_id, likes, created_at) VALUES (?, ?, ?, ?)',
+                [(day_id, insight_id, likes, now) for (day_id, insight_id), likes in batch.items()]
+            )
+        if now - self._last_prune > self.RETENTION_SECONDS:
+            conn.execute('DELETE FROM like_events WHERE created_at < ?', (now - self.RETENTION_SECONDS,))
+            self._last_prune = now
+
+        rows = conn.execute(
+            'SELECT id, day_id, insight_id, likes FROM like_events WHERE id > ? ORDER BY id', (self._last_id,)
+        ).fetchall()
+        if not rows:
+            return 0
+        self._last_id = rows[-1][0]
+        if not watching:
+            return 0
+
+        merged = defaultdict(dict)
+        for _, day_id, insight_id, likes in rows:
+            merged[day_id][insight_id] = max(merged[day_id].get(insight_id, 0), likes)
+
+        delivered = 0
+        with self._lock:
+            targets = [
+                (list(self._subscribers[day_id].items()), likes)
+                for day_id, likes in merged.items() if day_id in self._subscribers
+            ]
+        for subscribers, likes in targets:
+            payload = {"likes": likes}
+            for queue, loop in subscribers:
+                loop.call_soon_threadsafe(self._offer, queue, payload)
+            delivered += 1
+        return delivered
+
+    @staticmethod
+    def _offer(queue, payload):
+        """投递给订阅者；消费过慢时把最旧的一条并入本条（总数取大），不丢变化"""
+        if queue.full():
+            likes = dict(queue.get_nowait()["likes"])
+            for insight_id, total in payload["likes"].items():
+                likes[insight_id] = max(likes.get(insight_id, 0), total)
+            payload = {"likes": likes}
+        queue.put_nowait(payload)
+
+    def _ensure_worker(self):
+        """首次发布/订阅时启动后台线程（每个worker进程各一个）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='live-events', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                self._app.logger.warning(f"实时事件总线处理失败：{e}")
+
+    def shutdown(self):
+        """停止后台线程并写出剩余事件"""
+        self._stopped.set()
+        if self._app is None or not self._pending:
+            return
+        try:
+            self.tick()
+        except Exception as e:
+            self._app.logger.warning(f"退出时实时事件写出失败：{e}")
@@ -0,0 +1,164 @@
+"""
+5分钟快速复盘 - Prometheus指标
+==============================
+GET /api/metrics 以Prometheus文本格式输出请求延迟、SQL次数/耗时、连接池等待与缓存命中
+AI维护注意点:
+1. 路由标签取URL规则模板（如 /api/reviews/<int:review_id>），未匹配的请求记为 unmatched，避免标签爆炸
+2. 每请求的SQL条数/耗时由 before/after_cursor_execute 事件累计到请求级ContextVar，
+   请求外（计数器落库、写者线程等后台线程）的语句只计入 db_statements_total{source="background"}
+3. gunicorn多worker：设置环境变量 PROMETHEUS_MULTIPROC_DIR（须在导入prometheus_client前设置，
+   见 gunicorn.conf.py），各worker写各自的mmap文件，/api/metrics 汇总全部worker
+4. 连接池等待时间通过包装 pool._do_get 计时，须在 sqlite_profile.init_app 之后调用（dispose会重建连接池）
+5. 缓存命中率 = rate(cache_requests_total{result="hit"}) / rate(cache_requests_total)，
+   新增缓存时调用 cache_lookup(名称, 是否命中)
+6. 配置 METRICS_TOKEN 后抓取需携带 Authorization: Bearer <token>
+"""
+
+import contextvars
+import os
+import time
+
+from flask import Response, abort, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', '请求耗时', ['method', 'route'], buckets=LATENCY_BUCKETS
+)
+REQUEST_COUNT = Counter(
+    'http_requests_total', '请求数（按状态码）', ['method', 'route', 'status']
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries', '每请求SQL语句数', ['method', 'route'], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_QUERY_TIME = Histogram(
+    'http_request_db_seconds', '每请求SQL总耗时', ['method', 'route'], buckets=LATENCY_BUCKETS
+)
+DB_STATEMENTS = Counter(
+    'db_statements_total', 'SQL语句数', ['engine', 'source']
+)
+DB_STATEMENT_TIME = Counter(
+    'db_statement_seconds_total', 'SQL语句累计耗时', ['engine', 'source']
+)
+POOL_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', '从连接池取连接的等待时间', ['engine'],
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+)
+POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out', '已借出的连接数', ['engine'], multiprocess_mode='livesum'
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', '缓存查找次数', ['cache', 'result']
+)
+
+# 当前请求的 [SQL条数, SQL耗时]，请求外为None
+_request_queries = contextvars.ContextVar('request_queries', default=None)
+
+
+def cache_lookup(name, hit):
+    """记录一次缓存查找"""
+    CACHE_REQUESTS.labels(name, 'hit' if hit else 'miss').inc()
+
+
+def _route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def _before_request():
+    request.environ['metrics.start'] = time.perf_counter()
+    request.environ['metrics.token'] = _request_queries.set([0, 0.0])
+
+
+def _after_request(response):
+    start = request.environ.get('metrics.start')
+    if start is None or request.endpoint == 'metrics':
+        return response
+    route, method = _route_label(), request.method
+    REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+    REQUEST_COUNT.labels(method, route, response.status_code).inc()
+    stats = _request_queries.get()
+    if stats is not None:
+        REQUEST_QUERIES.labels(method, route).observe(stats[0])
+        REQUEST_QUERY_TIME.labels(method, route).observe(stats[1])
+    return response
+
+
+def _teardown_request(exc):
+    token = request.environ.pop('metrics.token', None)
+    if token is not None:
+        _request_queries.reset(token)
+
+
+def instrument_engine(engine, name):
+    """为引擎挂载SQL计时与连接池指标"""
+    statements = {source: DB_STATEMENTS.labels(name, source) for source in ('request', 'background')}
+    seconds = {source: DB_STATEMENT_TIME.labels(name, source) for source in ('request', 'background')}
+    checked_out = POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_start
+        stats = _request_queries.get()
+        source = 'background' if stats is None else 'request'
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+        statements[source].inc()
+        seconds[source].inc(elapsed)
+
+    event.listen(engine, 'checkout', lambda *args: checked_out.inc())
+    event.listen(engine, 'checkin', lambda *args: checked_out.dec())
+
+    pool = engine.pool
+    do_get = pool._do_get
+    wait = POOL_WAIT.labels(name)
+
+    def timed_do_get():
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            wait.observe(time.perf_counter() - start)
+
+    pool._do_get = timed_do_get
+
+
+def metrics_view():
+    """GET /api/metrics"""
+    from flask import current_app
+
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        abort(403)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_app(app, db):
+    """注册请求钩子、SQL事件与 /api/metrics 路由"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/api/metrics', 'metrics', metrics_view, methods=['GET'])
+
+    with app.app_context():
+        instrument_engine(db.engine, 'primary')
+    reader = app.extensions.get('sqlite_reader')
+    if reader is not None:
+        instrument_engine(reader, 'reader')
@@ -0,0 +1,148 @@
+"""
+5分钟快速复盘 - 接口SQL预算
+===========================
+为接口声明每请求SQL语句数上限，测试中超出即失败，用来拦截N+1回归
+AI维护注意点:
+1. 预算用 @query_budget(n) 声明在视图函数上（放在路由装饰器之下），与分页大小无关——
+   列表接口逐条查关联（如 to_dict 里的 .count()）在 per_page=50 时必然超预算
+2. QueryRecorder 统计的是当前线程在请求期间发出的语句，后台线程（计数器落库等）不计入
+3. pytest 中使用 conftest.py 的 query_budget fixture：测试期间每个带预算的请求都会检查，
+   超出的请求在用例结束时连同全部SQL一起报错
+4. 生产环境不注册任何事件，装饰器只在视图函数上挂一个属性
+"""
+
+import threading
+
+from flask import request_finished, request_started
+from sqlalchemy import event
+
+BUDGET_ATTR = '_query_budget'
+
+
+def query_budget(limit: int):
+    """
+    声明接口每请求最多执行的SQL语句数
+
+    用法:
+        @reviews_bp.route('', methods=['GET'])
+        @jwt_required()
+        @query_budget(3)
+        def get_reviews(): ...
+    """
+    def decorator(view):
+        setattr(view, BUDGET_ATTR, limit)
+        return view
+    return decorator
+
+
+def budget_for(app, endpoint):
+    """视图函数声明的预算（未声明返回None）"""
+    view = app.view_functions.get(endpoint)
+    return getattr(view, BUDGET_ATTR, None)
+
+
+class QueryRecorder:
+    """
+    记录当前线程执行的SQL
+
+    用法:
+        with QueryRecorder(engines) as recorder:
+            client.get('/api/reviews')
+        recorder.statements   # [(sql, 参数), ...]
+    """
+
+    def __init__(self, engines):
+        self.engines = list(engines)
+        self.statements = []
+        self._thread = None
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == self._thread:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self._thread = threading.get_ident()
+        for engine in self.engines:
+            event.listen(engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for engine in self.engines:
+            event.remove(engine, 'before_cursor_execute', self._record)
+        return False
+
+    def reset(self):
+        self.statements = []
+
+
+class BudgetExceeded:
+    """一次超预算的请求"""
+
+    def __init__(self, method, path, endpoint, limit, statements):
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.limit = limit
+        self.statements = statements
+
+    def __str__(self):
+        lines = [
+            f"{self.method} {self.path}（{self.endpoint}）执行了 {len(self.statements)} 条SQL，预算 {self.limit} 条："
+        ]
+        lines.extend(f"  {i}. {sql}  {params!r}" for i, (sql, params) in enumerate(self.statements, 1))
+        return '\n'.join(lines)
+
+
+class BudgetChecker:
+    """
+    按请求检查SQL预算（测试用）
+
+    AI维护注意点: 通过 request_started/request_finished 信号分段，只检查声明了预算的接口
+    """
+
+    def __init__(self, app, engines):
+        self.app = app
+        self.recorder = QueryRecorder(engines)
+        self.violations = []
+        self.checked = []
+
+    def _started(self, sender, **extra):
+        self.recorder.reset()
+
+    def _finished(self, sender, response, **extra):
+        from flask import request
+
+        limit = budget_for(self.app, request.endpoint)
+        if limit is None:
+            return
+        statements = list(self.recorder.statements)
+        self.checked.append((request.method, request.path, len(statements), limit))
+        if len(statements) > limit:
+            self.violations.append(
+                BudgetExceeded(request.method, request.full_path.rstrip('?'), request.endpoint, limit, statements)
+            )
+
+    def __enter__(self):
+        self.recorder.__enter__()
+        request_started.connect(self._started, self.app)
+        request_finished.connect(self._finished, self.app)
+        return self
+
+    def __exit__(self, *exc):
+        request_started.disconnect(self._started, self.app)
+        request_finished.disconnect(self._finished, self.app)
+        self.recorder.__exit__(*exc)
+        return False
+
+    def report(self) -> str:
+        return '\n\n'.join(str(violation) for violation in self.violations)
+
+
+def engines_of(app, db):
+    """应用的全部引擎（主引擎 + SQLite只读引擎）"""
+    with app.app_context():
+        engines = [db.engine]
+    reader = app.extensions.get('sqlite_reader')
+    if reader is not None:
+        engines.append(reader)
+    return engines
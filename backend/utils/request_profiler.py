@@ -0,0 +1,184 @@
+"""
+5分钟快速复盘 - 单请求采样剖析
+==============================
+管理员在任意接口加 ?__profile=1（或请求头 X-Profile: 1）即可对这一次请求做采样剖析，
+输出speedscope格式火焰图（https://www.speedscope.app 直接打开）
+AI维护注意点:
+1. 只依赖标准库：后台线程每 PROFILE_SAMPLE_INTERVAL 秒读取一次请求线程的调用栈（sys._current_frames），
+   请求线程本身不插桩，开销只在被剖析的请求上
+2. 每个样本按栈中是否出现数据库驱动/SQLAlchemy、JSON编码帧归入 [SQL] / [序列化] / [Python] 三类，
+   作为火焰图的第一层，summary 中给出三类耗时
+3. 取值 1：响应替换为剖析结果JSON；取值 store：照常返回响应，剖析结果存入 instance/profiles，
+   响应头 X-Profile-File 给出文件名，经 GET /api/admin/profiles/<文件名> 下载
+4. 非管理员携带该参数/请求头时直接忽略，表现与普通请求完全一致
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import Response, g, request
+
+SQL_MARKERS = (os.sep + 'sqlalchemy' + os.sep, os.sep + 'sqlite3' + os.sep, 'psycopg')
+SERIALIZATION_MARKERS = (os.sep + 'json' + os.sep, os.sep + 'flask' + os.sep + 'json' + os.sep)
+CATEGORIES = ('[SQL]', '[序列化]', '[Python]')
+
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.speedscope\.json$')
+
+
+class StackSampler:
+    """
+    对指定线程做栈采样
+
+    用法:
+        sampler = StackSampler(threading.get_ident(), 0.001).start()
+        ...
+        sampler.stop()
+        sampler.to_speedscope('GET /api/stats/overview')
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()   # (类别, 栈) -> 累计秒数
+        self.duration = 0.0
+        self._stopped = threading.Event()
+        self._thread = None
+        self._started_at = None
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started_at
+        return self
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(self._category(stack), tuple(stack))] += now - last
+            last = now
+
+    @staticmethod
+    def _category(stack):
+        files = [filename for _, filename, _ in stack]
+        if any(marker in filename for filename in files for marker in SQL_MARKERS):
+            return CATEGORIES[0]
+        if any(marker in filename for filename in files for marker in SERIALIZATION_MARKERS):
+            return CATEGORIES[1]
+        return CATEGORIES[2]
+
+    def summary(self) -> dict:
+        """三类耗时（毫秒）"""
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for (category, _), seconds in self.samples.items():
+            totals[category] += seconds
+        return {category: round(seconds * 1000, 2) for category, seconds in totals.items()}
+
+    def to_speedscope(self, name) -> dict:
+        """speedscope sampled格式（单位毫秒，相同栈合并为一个带权样本）"""
+        frames, index = [], {}
+
+        def frame_id(key):
+            if key not in index:
+                index[key] = len(frames)
+                label, filename, line = key
+                frames.append({'name': label, 'file': filename, 'line': line} if filename else {'name': label})
+            return index[key]
+
+        samples, weights = [], []
+        for (category, stack), seconds in self.samples.most_common():
+            samples.append([frame_id((category, None, None))] + [frame_id(key) for key in stack])
+            weights.append(round(seconds * 1000, 3))
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': '5min-review request_profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round(sum(weights), 3),
+                'samples': samples,
+                'weights': weights
+            }],
+            'summary': {'duration_ms': round(self.duration * 1000, 2), **self.summary()}
+        }
+
+
+def _requested_mode():
+    mode = request.args.get('__profile') or request.headers.get('X-Profile')
+    return mode if mode in ('1', 'store') else None
+
+
+def _before_request():
+    mode = _requested_mode()
+    if mode is None:
+        return
+    from flask import current_app
+
+    from utils.admin import current_admin
+
+    if current_admin() is None:
+        return
+    g.profile_mode = mode
+    g.profile_sampler = StackSampler(
+        threading.get_ident(), current_app.config.get('PROFILE_SAMPLE_INTERVAL', 0.001)
+    ).start()
+
+
+def _after_request(response):
+    sampler = g.pop('profile_sampler', None)
+    if sampler is None:
+        return response
+    from flask import current_app
+
+    sampler.stop()
+    rule = request.url_rule
+    name = f"{request.method} {rule.rule if rule is not None else request.path} → {response.status_code}"
+    profile = sampler.to_speedscope(name)
+    payload = json.dumps(profile, ensure_ascii=False, separators=(',', ':'))
+
+    if g.pop('profile_mode') == '1':
+        return Response(payload, mimetype='application/json')
+
+    directory = profile_directory(current_app)
+    os.makedirs(directory, exist_ok=True)
+    endpoint = re.sub(r'[^\w.-]+', '_', request.endpoint or 'unmatched')
+    filename = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{endpoint}.speedscope.json"
+    with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+        f.write(payload)
+    response.headers['X-Profile-File'] = filename
+    return response
+
+
+def profile_directory(app):
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def init_app(app):
+    """注册请求钩子（after_request 最先注册，保证最后执行、计入其他钩子的耗时）"""
+    app.after_request(_after_request)
+    app.before_request(_before_request)
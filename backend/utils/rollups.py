@@ -0,0 +1,110 @@
+"""
+5分钟快速复盘 - 分享者汇总维护
+==============================
+按分享者预聚合干货数、点赞、活跃天数等，替代按需全量扫描
+AI维护注意点:
+1. refresh_sharer_stats 以分组查询重算指定分享者，保存复盘时在同一事务内调用
+2. 点赞不走重算，而是计数缓冲累加 SharerStats.total_likes（见like_insight）。累加是 UPDATE，
+   没有汇总行的分享者会丢掉这部分点赞，因此有干货的分享者必须有汇总行：保存复盘时重算、
+   应用启动与 --skip-derived 导入后由 ensure_sharer_stats 补建
+3. 重算读取的是已落库的 Insight.likes，与缓冲中未落库的两个增量同批落库，结果一致
+4. 热门主题按点赞数取前 TOP_TOPICS 个；top_topics 中的点赞数只在重算时更新（保存复盘、
+   flask viz rollups），点赞不改动它，两次重算之间排名与点赞数可能滞后
+"""
+
+import json
+from collections import defaultdict
+
+from sqlalchemy import delete, exists, func, insert, select
+
+TOP_TOPICS = 5
+
+
+def refresh_sharer_stats(session, sharer_ids=None):
+    """
+    重算分享者汇总
+
+    Args:
+        session: 数据库会话（调用方负责提交）
+        sharer_ids: 需重算的分享者id集合，None表示全部
+
+    Returns:
+        int: 写入的汇总行数
+    """
+    from models.visualization import Insight, ReviewDay, SharerStats
+
+    if sharer_ids is not None:
+        sharer_ids = list(sharer_ids)
+        if not sharer_ids:
+            return 0
+
+    totals = session.query(
+        Insight.sharer_id,
+        func.count(Insight.id),
+        func.coalesce(func.sum(Insight.likes), 0),
+        func.count(func.distinct(Insight.day_id)),
+        func.min(ReviewDay.date),
+        func.max(ReviewDay.date)
+    ).join(ReviewDay, Insight.day_id == ReviewDay.id).group_by(Insight.sharer_id)
+
+    topics = session.query(
+        Insight.sharer_id,
+        Insight.topic,
+        func.coalesce(func.sum(Insight.likes), 0),
+        func.count(Insight.id)
+    ).group_by(Insight.sharer_id, Insight.topic)
+
+    if sharer_ids is not None:
+        totals = totals.filter(Insight.sharer_id.in_(sharer_ids))
+        topics = topics.filter(Insight.sharer_id.in_(sharer_ids))
+
+    top_topics = defaultdict(list)
+    for sharer_id, topic, likes, count in topics:
+        top_topics[sharer_id].append({'topic': topic, 'likes': int(likes), 'count': count})
+
+    rows = []
+    for sharer_id, insight_count, total_likes, active_days, first_date, last_date in totals:
+        ranked = sorted(top_topics[sharer_id], key=lambda t: (-t['likes'], -t['count']))
+        rows.append({
+            'sharer_id': sharer_id,
+            'insight_count': insight_count,
+            'total_likes': int(total_likes),
+            'active_days': active_days,
+            'first_date': first_date,
+            'last_date': last_date,
+            'top_topics': json.dumps(ranked[:TOP_TOPICS], ensure_ascii=False)
+        })
+
+    # 先删后插：没有干货的分享者不保留汇总行
+    stmt = delete(SharerStats)
+    if sharer_ids is not None:
+        stmt = stmt.where(SharerStats.sharer_id.in_(sharer_ids))
+    session.execute(stmt)
+    if rows:
+        session.execute(insert(SharerStats), rows)
+    return len(rows)
+
+
+def ensure_sharer_stats(session, sharer_ids=None):
+    """
+    为有干货但没有汇总行的分享者补建汇总（汇总表上线前的存量数据、--skip-derived 导入）
+
+    Args:
+        session: 数据库会话（调用方负责提交）
+        sharer_ids: 限定检查的分享者id，None表示全部
+
+    Returns:
+        int: 补建的汇总行数
+    """
+    from models.visualization import Insight, SharerStats
+
+    missing = select(Insight.sharer_id).where(
+        ~exists().where(SharerStats.sharer_id == Insight.sharer_id)
+    ).distinct()
+    if sharer_ids is not None:
+        sharer_ids = list(sharer_ids)
+        if not sharer_ids:
+            return 0
+        missing = missing.where(Insight.sharer_id.in_(sharer_ids))
+    missing_ids = session.execute(missing).scalars().all()
+    return refresh_sharer_stats(session, missing_ids) if missing_ids else 0
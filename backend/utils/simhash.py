@@ -0,0 +1,162 @@
+"""
+5分钟快速复盘 - 干货近似重复检测
+================================
+64位SimHash指纹 + 分段(band)索引，保存复盘时找出疑似重复的干货
+AI维护注意点:
+1. 特征同相似推荐（utils/similar.py tokens），按词频加权，blake2b取64位哈希
+2. 指纹切成 BANDS 段各16位并分别建索引：海明距离 ≤ MAX_DISTANCE(3) 的两条指纹
+   必有一段完全相同（抽屉原理），因此只需按段等值查询，单条检测代价与表大小无关
+3. SQLite整数为有符号64位，指纹按补码存储，比较前转回无符号
+4. 只报告不拦截：保存照常进行，由组织者决定是否删改
+"""
+
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import delete, insert, or_, select
+
+from utils.similar import document
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+MAX_DISTANCE = 3
+# 过短的干货（如"早起"）指纹不稳定，不参与检测
+MIN_FEATURES = 4
+
+
+@lru_cache(maxsize=65536)
+def _term_hash(term: str) -> bytes:
+    return hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest()
+
+
+def fingerprint(counts) -> int:
+    """
+    词频 → 64位SimHash（无符号）
+
+    AI维护注意点: 用numpy按位累加权重（±weight），词元哈希有LRU缓存，批量导入时不重复计算
+    """
+    if not counts:
+        return 0
+    hashes = np.frombuffer(b''.join(_term_hash(term) for term in counts), dtype=np.uint8)
+    bits = np.unpackbits(hashes.reshape(-1, 8), axis=1).astype(np.int64)
+    weights = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    # 大端字节序：第0列是最高位(63)
+    vector = weights @ (2 * bits - 1)
+    return int.from_bytes(np.packbits(vector > 0).tobytes(), 'big')
+
+
+def bands(value: int) -> list:
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (b * BAND_BITS)) & mask for b in range(BANDS)]
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def _signed(value: int) -> int:
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def _unsigned(value: int) -> int:
+    return value + (1 << BITS) if value < 0 else value
+
+
+def _row(insight_id, value):
+    row = {'insight_id': insight_id, 'simhash': _signed(value)}
+    row.update({f'band{b}': band for b, band in enumerate(bands(value))})
+    return row
+
+
+def index_insights(session, insights):
+    """
+    为一批已flush的干货写入指纹，并返回疑似重复
+
+    Returns:
+        list: [(新干货id, 已有干货id, 海明距离), ...]，同批内的重复只报告一次
+    """
+    from models.visualization import InsightFingerprint
+
+    fingerprints = {}
+    for insight in insights:
+        counts = document(insight.topic, insight.content)
+        if len(counts) >= MIN_FEATURES:
+            fingerprints[insight.id] = fingerprint(counts)
+    if not fingerprints:
+        return []
+
+    # 按段等值召回候选：(段号, 段值) → 新干货id
+    by_band = {}
+    for insight_id, value in fingerprints.items():
+        for b, band in enumerate(bands(value)):
+            by_band.setdefault((b, band), []).append(insight_id)
+    columns = [getattr(InsightFingerprint, f'band{b}') for b in range(BANDS)]
+    candidates = session.query(InsightFingerprint.insight_id, InsightFingerprint.simhash).filter(or_(*(
+        columns[b].in_({band for (bb, band) in by_band if bb == b}) for b in range(BANDS)
+    ))).all()
+
+    pairs = {}
+    for candidate_id, simhash in candidates:
+        value = _unsigned(simhash)
+        for b, band in enumerate(bands(value)):
+            for insight_id in by_band.get((b, band), ()):
+                d = distance(fingerprints[insight_id], value)
+                if d <= MAX_DISTANCE:
+                    pairs[(insight_id, candidate_id)] = d
+
+    # 同批新干货之间互相比较（指纹尚未入库），同样只比较同段桶内的
+    for bucket in by_band.values():
+        for i, a in enumerate(bucket):
+            for b in bucket[i + 1:]:
+                d = distance(fingerprints[a], fingerprints[b])
+                if d <= MAX_DISTANCE:
+                    pairs[(max(a, b), min(a, b))] = d
+
+    session.execute(insert(InsightFingerprint), [
+        _row(insight_id, value) for insight_id, value in fingerprints.items()
+    ])
+    return [(insight_id, other_id, d) for (insight_id, other_id), d in sorted(pairs.items())]
+
+
+def remove_day(session, day_id):
+    """删除某个复盘日所有干货的指纹（覆盖保存前调用）"""
+    from models.visualization import Insight, InsightFingerprint
+
+    session.execute(
+        delete(InsightFingerprint).where(
+            InsightFingerprint.insight_id.in_(select(Insight.id).where(Insight.day_id == day_id))
+        )
+    )
+
+
+def rebuild(session, batch_size=1000):
+    """
+    全量重算指纹（历史数据回填/特征规则变更后使用）
+
+    Returns:
+        int: 写入行数
+    """
+    from models.visualization import Insight, InsightFingerprint
+
+    session.execute(delete(InsightFingerprint))
+    total = 0
+    last_id = 0
+    while True:
+        batch = session.query(Insight.id, Insight.topic, Insight.content).filter(
+            Insight.id > last_id
+        ).order_by(Insight.id).limit(batch_size).all()
+        if not batch:
+            break
+        rows = []
+        for insight_id, topic, content in batch:
+            counts = document(topic, content)
+            if len(counts) >= MIN_FEATURES:
+                rows.append(_row(insight_id, fingerprint(counts)))
+        if rows:
+            session.execute(insert(InsightFingerprint), rows)
+        total += len(rows)
+        last_id = batch[-1].id
+    session.commit()
+    return total
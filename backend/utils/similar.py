@@ -0,0 +1,304 @@
+"""
+5分钟快速复盘 - 相似干货推荐
+============================
+预计算每条干货的TF-IDF近邻，阅读干货时推荐往期相关内容
+AI维护注意点:
+1. 特征：中文二元组(bigram)+英文三元组，子线性词频 1+log(tf)，平滑IDF，L2归一化
+2. 全量重建 rebuild() 用scipy稀疏矩阵分块计算 X·Xᵀ，argpartition 取前 TOP_K
+3. 保存复盘时 fold_in() 增量折入：经倒排索引(insight_terms)召回候选，只与候选计算相似度
+4. 词元是 text_index.terms() 的子集，文档频率直接按 insight_terms 统计，无需另存词表
+5. 同一天的干货互不推荐；相似度低于 MIN_SCORE 的不入表
+"""
+
+import json
+import math
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import bindparam, delete, func, insert, or_, select
+
+from utils.text_index import CJK_RE, WORD_RE
+
+# 每条干货保留的近邻数
+TOP_K = 10
+MIN_SCORE = 0.1
+# 全量重建时每块相似度矩阵的单元数上限（约32MB）
+BLOCK_CELLS = 4_000_000
+# 折入时召回的候选上限
+CANDIDATE_LIMIT = 2000
+# 文档频率超过该比例（且超过 MIN_STOP_DF）的词元视为停用词，不参与召回
+MAX_DF_RATIO = 0.2
+MIN_STOP_DF = 100
+
+
+def tokens(text: str) -> Counter:
+    """
+    文本切分为特征词元及词频
+
+    示例："时间价值" → {"时间": 1, "间价": 1, "价值": 1}
+    """
+    text = (text or '').lower()
+    result = Counter()
+    for run in CJK_RE.findall(text):
+        result.update(run[i:i + 2] for i in range(len(run) - 1))
+    for word in WORD_RE.findall(text):
+        if len(word) < 3:
+            result[word] += 1
+        else:
+            result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result
+
+
+def document(topic, content) -> Counter:
+    return tokens(f"{topic or ''}\n{content or ''}")
+
+
+def idf(df: int, n: int) -> float:
+    """平滑IDF"""
+    return math.log((1 + n) / (1 + df)) + 1
+
+
+def weigh(counts: Counter, df: dict, n: int) -> dict:
+    """词频 → L2归一化的TF-IDF稀疏向量"""
+    weights = {term: (1 + math.log(tf)) * idf(df.get(term, 0), n) for term, tf in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: round(w / norm, 6) for term, w in weights.items()}
+
+
+def _top_k(scores: np.ndarray, k: int):
+    """
+    每行相似度中取前k个，按分数倒序，过滤低于 MIN_SCORE 的
+
+    Args:
+        scores: 二维相似度矩阵（一行一条干货）
+
+    Returns:
+        list: 每行一个 [(列下标, 分数), ...]
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    return [
+        [(int(j), float(s)) for j, s in zip(row, row_scores) if s >= MIN_SCORE]
+        for row, row_scores in zip(top.tolist(), top_scores.tolist())
+    ]
+
+
+def rebuild(session, batch_size=1000):
+    """
+    全量重建向量与近邻表
+
+    Returns:
+        tuple: (向量数, 近邻行数)
+    """
+    from models.visualization import Insight, InsightVector, SimilarInsight
+
+    session.execute(delete(SimilarInsight))
+    session.execute(delete(InsightVector))
+
+    ids, days, docs = [], [], []
+    last_id = 0
+    while True:
+        batch = session.query(Insight.id, Insight.day_id, Insight.topic, Insight.content).filter(
+            Insight.id > last_id
+        ).order_by(Insight.id).limit(batch_size).all()
+        if not batch:
+            break
+        for insight_id, day_id, topic, content in batch:
+            ids.append(insight_id)
+            days.append(day_id)
+            docs.append(document(topic, content))
+        last_id = batch[-1].id
+
+    n = len(ids)
+    if not n:
+        session.commit()
+        return 0, 0
+
+    # 词表与CSR矩阵（子线性词频）
+    vocab = {}
+    indptr, indices, data = [0], [], []
+    for counts in docs:
+        for term, tf in counts.items():
+            indices.append(vocab.setdefault(term, len(vocab)))
+            data.append(1 + math.log(tf))
+        indptr.append(len(indices))
+    indices = np.asarray(indices, dtype=np.int64)
+    matrix = sparse.csr_matrix((np.asarray(data), indices, np.asarray(indptr)), shape=(n, len(vocab)))
+
+    df = np.bincount(indices, minlength=len(vocab))
+    matrix = matrix @ sparse.diags(np.log((1 + n) / (1 + df)) + 1)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms) @ matrix
+    matrix = matrix.tocsr()
+
+    # 写入向量
+    terms = [None] * len(vocab)
+    for term, col in vocab.items():
+        terms[col] = term
+    for start in range(0, n, batch_size):
+        rows = []
+        for i in range(start, min(start + batch_size, n)):
+            lo, hi = matrix.indptr[i], matrix.indptr[i + 1]
+            vector = {
+                terms[j]: round(w, 6)
+                for j, w in zip(matrix.indices[lo:hi].tolist(), matrix.data[lo:hi].tolist())
+            }
+            rows.append({'insight_id': ids[i], 'vector': json.dumps(vector, ensure_ascii=False)})
+        session.execute(insert(InsightVector.__table__), rows)
+
+    # 分块计算相似度，同一天（含自身）置零
+    days = np.asarray(days)
+    transposed = matrix.T.tocsc()
+    block = max(1, BLOCK_CELLS // n)
+    total = 0
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        scores = (matrix[start:end] @ transposed).toarray()
+        scores[days[start:end, None] == days[None, :]] = 0
+        rows = [
+            {'insight_id': ids[start + r], 'neighbor_id': ids[j], 'score': round(score, 6)}
+            for r, top in enumerate(_top_k(scores, TOP_K))
+            for j, score in top
+        ]
+        if rows:
+            session.execute(insert(SimilarInsight.__table__), rows)
+            total += len(rows)
+
+    session.commit()
+    return n, total
+
+
+def fold_in(session, insights):
+    """
+    把一批新保存（已flush、已写检索索引）的干货折入近邻表
+
+    1. 按当前文档频率计算新向量并写入
+    2. 经倒排索引召回共享非停用词元最多的候选，只与候选计算相似度
+    3. 写入新干货的近邻，并把新干货挤进候选原有的近邻列表
+
+    AI维护注意点: 同批新干货之间不互相推荐（保存单位是一天，本就同日）
+
+    Returns:
+        int: 写入的近邻行数
+    """
+    from models.visualization import Insight, InsightTerm, InsightVector, SimilarInsight
+
+    docs = {insight.id: document(insight.topic, insight.content) for insight in insights}
+    vocab = set().union(*docs.values()) if docs else set()
+    if not vocab:
+        return 0
+
+    n = session.query(func.count(Insight.id)).scalar()
+    df = dict(
+        session.query(InsightTerm.term, func.count(func.distinct(InsightTerm.insight_id)))
+        .filter(InsightTerm.term.in_(vocab)).group_by(InsightTerm.term)
+    )
+    vectors = {insight_id: weigh(counts, df, n) for insight_id, counts in docs.items()}
+    session.execute(insert(InsightVector), [
+        {'insight_id': insight_id, 'vector': json.dumps(vector, ensure_ascii=False)}
+        for insight_id, vector in vectors.items()
+    ])
+
+    stop_df = max(n * MAX_DF_RATIO, MIN_STOP_DF)
+    recall_terms = [term for term in vocab if df.get(term, 0) <= stop_df]
+    if not recall_terms:
+        return 0
+    day_ids = {insight.day_id for insight in insights}
+    candidates = select(InsightTerm.insight_id).join(
+        Insight, Insight.id == InsightTerm.insight_id
+    ).where(
+        InsightTerm.term.in_(recall_terms),
+        Insight.day_id.notin_(day_ids)
+    ).group_by(InsightTerm.insight_id).order_by(
+        func.count(func.distinct(InsightTerm.term)).desc()
+    ).limit(CANDIDATE_LIMIT)
+    candidate_rows = session.query(InsightVector.insight_id, InsightVector.vector).filter(
+        InsightVector.insight_id.in_(candidates)
+    ).all()
+    if not candidate_rows:
+        return 0
+
+    # 只保留新向量中出现的词元列，点积结果不变
+    columns = {term: col for col, term in enumerate(vocab)}
+    new_ids = list(vectors)
+    new_matrix = _matrix([vectors[i] for i in new_ids], columns)
+    candidate_ids = [row.insight_id for row in candidate_rows]
+    candidate_matrix = _matrix([json.loads(row.vector) for row in candidate_rows], columns)
+    scores = (new_matrix @ candidate_matrix.T).toarray()
+
+    rows = []
+    incoming = defaultdict(list)
+    for r, (insight_id, top) in enumerate(zip(new_ids, _top_k(scores, TOP_K))):
+        for j, score in top:
+            rows.append({'insight_id': insight_id, 'neighbor_id': candidate_ids[j], 'score': round(score, 6)})
+        for j in np.nonzero(scores[r] >= MIN_SCORE)[0]:
+            incoming[candidate_ids[j]].append((round(float(scores[r, j]), 6), insight_id))
+
+    # 新干货挤进候选的近邻列表，每条仍只保留前K个
+    evicted = []
+    if incoming:
+        existing = defaultdict(list)
+        for insight_id, neighbor_id, score in session.query(
+            SimilarInsight.insight_id, SimilarInsight.neighbor_id, SimilarInsight.score
+        ).filter(SimilarInsight.insight_id.in_(list(incoming))):
+            existing[insight_id].append((score, neighbor_id))
+        for insight_id, scored in incoming.items():
+            merged = sorted(existing[insight_id] + scored, reverse=True)[:TOP_K]
+            kept = {neighbor_id for _, neighbor_id in merged}
+            evicted.extend(
+                {'_id': insight_id, '_neighbor': neighbor_id}
+                for _, neighbor_id in existing[insight_id] if neighbor_id not in kept
+            )
+            rows.extend(
+                {'insight_id': insight_id, 'neighbor_id': neighbor_id, 'score': score}
+                for score, neighbor_id in scored if neighbor_id in kept
+            )
+
+    table = SimilarInsight.__table__
+    if evicted:
+        session.execute(
+            delete(table).where(
+                table.c.insight_id == bindparam('_id'),
+                table.c.neighbor_id == bindparam('_neighbor')
+            ),
+            evicted
+        )
+    if rows:
+        session.execute(insert(SimilarInsight), rows)
+    return len(rows)
+
+
+def _matrix(vectors, columns):
+    """稀疏向量列表 → CSR矩阵（不在 columns 中的词元丢弃）"""
+    indptr, indices, data = [0], [], []
+    for vector in vectors:
+        for term, weight in vector.items():
+            col = columns.get(term)
+            if col is not None:
+                indices.append(col)
+                data.append(weight)
+        indptr.append(len(indices))
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(vectors), len(columns)))
+
+
+def remove_day(session, day_id):
+    """删除某个复盘日干货的向量及其作为主体/近邻的所有行（覆盖保存前调用）"""
+    from models.visualization import Insight, InsightVector, SimilarInsight
+
+    day_insights = select(Insight.id).where(Insight.day_id == day_id)
+    session.execute(
+        delete(SimilarInsight).where(
+            or_(SimilarInsight.insight_id.in_(day_insights), SimilarInsight.neighbor_id.in_(day_insights))
+        )
+    )
+    session.execute(delete(InsightVector).where(InsightVector.insight_id.in_(day_insights)))
@@ -0,0 +1,285 @@
+"""
+5分钟快速复盘 - 慢查询日志
+==========================
+记录超过 SLOW_QUERY_MS 毫秒的SQL：所属路由、参数结构、行数、执行计划，写入轮转JSON日志
+AI维护注意点:
+1. 指纹 = 规整后的SQL（字面量→?、IN列表折叠、空白合并）的sha1前12位，同一语句不同参数指纹相同
+2. 执行计划每个指纹每进程只抓一次：SQLite用 EXPLAIN QUERY PLAN，PostgreSQL用 EXPLAIN，
+   只对 SELECT/WITH 抓取，在同一DBAPI连接上另开游标执行，不触发SQLAlchemy事件；
+   PostgreSQL包在SAVEPOINT内，EXPLAIN失败不会使业务事务进入aborted状态
+3. 只记录参数结构（键与类型、批量条数），不记录参数值，日志中不会出现用户内容
+4. 行数：写语句取 cursor.rowcount（影响行数）；返回结果集的语句在执行后尚未取数，
+   把 context.cursor 换成计数代理，结果集关闭（取完/first()/scalar()等）时按实际取出行数写日志，
+   结果集一直未关闭的那条不会写出
+5. 日志为每行一个JSON（默认 instance/slow_queries.log，按大小轮转）；
+   GET /api/admin/slow-queries 汇总全部日志文件（含其他worker写入的）按总耗时排序；
+   多worker各自轮转同一文件，轮转瞬间少量行会写进历史文件，汇总时一并读取，不会丢失
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from flask import has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('slow_queries')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """规整SQL：字面量与各种占位符统一为 ?，IN (?, ?, ...) 折叠为 (?+)"""
+    sql = _STRING_RE.sub('?', statement)
+    sql = _PARAM_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(?+)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode('utf-8')).hexdigest()[:12]
+
+
+def params_shape(parameters, executemany):
+    """参数结构：字典为 {键: 类型}，序列为 [类型, ...]；批量执行附带条数"""
+    def shape(params):
+        if isinstance(params, dict):
+            return {key: type(value).__name__ for key, value in params.items()}
+        if isinstance(params, (list, tuple)):
+            return [type(value).__name__ for value in params]
+        return type(params).__name__
+
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'row': shape(rows[0]) if rows else None}
+    return shape(parameters)
+
+
+class _CountingCursor:
+    """DBAPI游标代理：统计取出的行数，关闭时回调 on_close(行数)"""
+
+    def __init__(self, cursor, on_close):
+        self._cursor = cursor
+        self._on_close = on_close
+        self.fetched = 0
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self.fetched += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self.fetched += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self.fetched += len(rows)
+        return rows
+
+    def close(self):
+        try:
+            self._cursor.close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close(self.fetched)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class SlowQueryLog:
+    """
+    慢查询记录器（每个引擎挂一组事件）
+
+    AI维护注意点: 同一进程内多个实例共用 slow_queries 日志器，只挂一次文件handler
+    """
+
+    def __init__(self, threshold_ms, path, max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self._explained = set()
+        self._lock = threading.Lock()
+        if not logger.handlers:
+            # delay：首条慢查询时才创建文件，导入应用不产生空日志
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    def instrument(self, engine, name):
+        dialect = engine.dialect.name
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            context._slow_query_start = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - context._slow_query_start
+            if elapsed >= self.threshold:
+                self.record(cursor, statement, parameters, executemany, elapsed, name, dialect, context)
+
+    def record(self, cursor, statement, parameters, executemany, elapsed, engine_name, dialect, context=None):
+        key = fingerprint(statement)
+        entry = {
+            'ts': datetime.utcnow().isoformat(timespec='milliseconds'),
+            'fingerprint': key,
+            'ms': round(elapsed * 1000, 2),
+            'engine': engine_name,
+            'route': self._route(),
+            'sql': normalize(statement),
+            'params': params_shape(parameters, executemany),
+            'rows': None,
+            'pid': os.getpid()
+        }
+        with self._lock:
+            first = key not in self._explained
+            self._explained.add(key)
+        if first and not executemany:
+            entry['plan'] = self._explain(cursor, statement, parameters, dialect)
+
+        if cursor.description is not None and context is not None:
+            # 有结果集：取完后再写
+            def emit(rows):
+                entry['rows'] = rows
+                self._emit(entry)
+
+            context.cursor = _CountingCursor(cursor, emit)
+            return
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            entry['rows'] = cursor.rowcount
+        self._emit(entry)
+
+    @staticmethod
+    def _emit(entry):
+        logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    @staticmethod
+    def _route():
+        if has_request_context():
+            rule = request.url_rule
+            return f"{request.method} {rule.rule if rule is not None else request.path}"
+        return f"thread:{threading.current_thread().name}"
+
+    @staticmethod
+    def _explain(cursor, statement, parameters, dialect):
+        """在同一连接上抓取执行计划（非查询语句返回None，失败返回错误说明，不影响业务）"""
+        if not statement.lstrip()[:6].upper().startswith(('SELECT', 'WITH')):
+            return None
+        if dialect == 'sqlite':
+            prefix = 'EXPLAIN QUERY PLAN '
+        elif dialect == 'postgresql':
+            prefix = 'EXPLAIN '
+        else:
+            return None
+        # PostgreSQL上语句出错会使整个事务进入aborted状态，EXPLAIN包在SAVEPOINT里，失败只回滚到保存点；
+        # SQLite语句出错不影响所在事务，且在事务外发SAVEPOINT会绕过驱动的事务管理，不加
+        savepoint = dialect == 'postgresql' and not getattr(cursor.connection, 'autocommit', False)
+        try:
+            explain_cursor = cursor.connection.cursor()
+            try:
+                if savepoint:
+                    explain_cursor.execute('SAVEPOINT slow_query_explain')
+                try:
+                    explain_cursor.execute(prefix + statement, parameters)
+                    rows = explain_cursor.fetchall()
+                except Exception:
+                    if savepoint:
+                        explain_cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                    raise
+                finally:
+                    if savepoint:
+                        explain_cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            return f"执行计划获取失败：{e}"
+        if dialect == 'sqlite':
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        return [row[0] for row in rows]
+
+
+def init_app(app, db):
+    """按 SLOW_QUERY_MS 为主引擎与只读引擎挂载慢查询记录"""
+    threshold = app.config.get('SLOW_QUERY_MS')
+    if threshold is None:
+        return
+    path = app.config.get('SLOW_QUERY_LOG') or os.path.join(app.instance_path, 'slow_queries.log')
+    log = SlowQueryLog(threshold, path)
+    app.extensions['slow_queries'] = log
+    with app.app_context():
+        log.instrument(db.engine, 'primary')
+    reader = app.extensions.get('sqlite_reader')
+    if reader is not None:
+        log.instrument(reader, 'reader')
+
+
+def log_files(path):
+    """当前日志及轮转出的历史文件"""
+    directory, name = os.path.split(path)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, f) for f in os.listdir(directory)
+        if f == name or re.fullmatch(re.escape(name) + r'\.\d+', f)
+    )
+
+
+def top_fingerprints(path, limit=20):
+    """
+    汇总日志，按总耗时取前N个指纹
+
+    Returns:
+        list: [{"fingerprint", "count", "total_ms", "avg_ms", "max_ms", "sql", "routes", "plan", "last_seen"}, ...]
+    """
+    stats = {}
+    routes = defaultdict(lambda: defaultdict(int))
+    for file_path in log_files(path):
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                key = entry['fingerprint']
+                item = stats.get(key)
+                if item is None:
+                    item = stats[key] = {
+                        'fingerprint': key, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                        'sql': entry['sql'], 'plan': None, 'last_seen': entry['ts']
+                    }
+                item['count'] += 1
+                item['total_ms'] += entry['ms']
+                item['max_ms'] = max(item['max_ms'], entry['ms'])
+                item['last_seen'] = max(item['last_seen'], entry['ts'])
+                if entry.get('plan') and item['plan'] is None:
+                    item['plan'] = entry['plan']
+                routes[key][entry['route']] += 1
+
+    ranked = sorted(stats.values(), key=lambda item: item['total_ms'], reverse=True)[:limit]
+    for item in ranked:
+        item['total_ms'] = round(item['total_ms'], 2)
+        item['avg_ms'] = round(item['total_ms'] / item['count'], 2)
+        item['routes'] = dict(sorted(routes[item['fingerprint']].items(), key=lambda kv: -kv[1]))
+    return ranked
@@ -0,0 +1,119 @@
+"""
+5分钟快速复盘 - SQLite生产配置
+==============================
+gunicorn多worker共用一个SQLite文件时的连接参数与读写分离
+AI维护注意点:
+1. 每个新连接执行 SQLITE_PRAGMAS：WAL让读写互不阻塞，busy_timeout 在写锁冲突时
+   由SQLite内部等待而不是立即报 "database is locked"，synchronous=NORMAL 在WAL下安全且少一次fsync
+2. 只读引擎：同一数据库文件的第二个连接池，连接设置 query_only，误写直接报错
+3. 被 @read_only 标记的接口，会话中的查询路由到只读引擎（RoutingSession.get_bind），
+   flush/写语句始终走主引擎；WAL下读连接看到的是最近一次提交的快照，不等待写事务
+4. 非SQLite数据库（如PostgreSQL）时全部不生效，@read_only 为空操作
+"""
+
+import contextvars
+import functools
+import inspect
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+# 当前请求是否只读（线程/协程各自独立）
+_read_only = contextvars.ContextVar('read_only', default=False)
+
+
+def _apply_pragmas(pragmas, extra=()):
+    """生成 connect 事件回调：为每个新的DBAPI连接执行PRAGMA"""
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()] + list(extra)
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def init_app(app, db):
+    """
+    为SQLite主引擎挂载PRAGMA，并创建只读引擎
+
+    AI维护注意点: 需在 db.init_app 之后、首次连接之前调用
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+            return
+        event.listen(engine, 'connect', _apply_pragmas(pragmas))
+        # 已建立的连接（如建表时）不会再触发connect，回收后按新参数重连
+        engine.dispose()
+
+        if app.config.get('SQLITE_READ_ENGINE', True):
+            reader = create_engine(
+                engine.url,
+                pool_size=app.config.get('SQLITE_READ_POOL_SIZE', 10),
+                pool_pre_ping=False
+            )
+            read_pragmas = {k: v for k, v in pragmas.items() if k != 'journal_mode'}
+            event.listen(reader, 'connect', _apply_pragmas(read_pragmas, ['PRAGMA query_only=ON']))
+            app.extensions['sqlite_reader'] = reader
+
+
+def read_engine(app, db):
+    """只读引擎（未启用时返回主引擎），供不经过会话的流式查询使用"""
+    reader = app.extensions.get('sqlite_reader')
+    if reader is not None and _read_only.get():
+        return reader
+    return db.engine
+
+
+class RoutingSession(Session):
+    """
+    读写分离会话
+
+    AI维护注意点: 只有 @read_only 接口内、非flush、非DML的查询才路由到只读引擎
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_only.get() and not self._flushing and not getattr(clause, 'is_dml', False):
+            reader = current_app.extensions.get('sqlite_reader')
+            if reader is not None:
+                return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_only(func):
+    """
+    标记只读接口：接口内的会话查询走只读引擎
+
+    用法（装饰器放在路由装饰器之下）:
+        @stats_bp.route('/overview')
+        @jwt_required()
+        @read_only
+        def get_overview_stats(): ...
+
+    AI维护注意点: 接口内不能有任何写操作（包括计数缓冲以外的commit），否则会报只读错误
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _read_only.set(True)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _read_only.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
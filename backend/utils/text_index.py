@@ -0,0 +1,141 @@
+"""
+5分钟快速复盘 - 干货N-gram倒排索引
+==================================
+为干货主题/内容建立倒排索引，替代 ilike('%x%') 全表扫描
+AI维护注意点:
+1. 中文按单字+二元组(bigram)切分，英文数字按小写三元组(trigram)切分
+2. 查询时要求所有词元命中，再在Python中做子串精确校验，消除N-gram误命中
+3. 少于3个字母的英文词无法用三元组表达，返回None由调用方回退为模糊查询
+4. 索引行与干货同生命周期：save_review覆盖某天时先删旧索引再写新索引
+"""
+
+import re
+
+from sqlalchemy import delete, insert, select
+
+# 中日韩统一表意文字（含扩展A与兼容区）
+CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+WORD_RE = re.compile(r'[0-9a-z]+')
+
+# 索引字段标记
+FIELD_TOPIC = 't'
+FIELD_CONTENT = 'c'
+
+
+def terms(text: str) -> set:
+    """
+    文本切分为索引词元
+
+    示例：
+    "时间价值" → {"时", "间", "价", "值", "时间", "间价", "价值"}
+    "Notion"  → {"not", "oti", "tio", "ion"}
+    """
+    if not text:
+        return set()
+    text = text.lower()
+    result = set()
+    for run in CJK_RE.findall(text):
+        result.update(run)
+        result.update(run[i:i + 2] for i in range(len(run) - 1))
+    for word in WORD_RE.findall(text):
+        if len(word) < 3:
+            result.add(word)
+        else:
+            result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result
+
+
+def query_terms(query: str):
+    """
+    查询串切分为必须全部命中的词元
+
+    Returns:
+        set | None: None表示无法走索引（含少于3个字母的英文片段或无有效字符）
+
+    AI维护注意点: 查询侧中文只取bigram（单字查询取单字），避免无谓的单字放大
+    """
+    query = (query or '').lower()
+    result = set()
+    for run in CJK_RE.findall(query):
+        if len(run) == 1:
+            result.add(run)
+        else:
+            result.update(run[i:i + 2] for i in range(len(run) - 1))
+    for word in WORD_RE.findall(query):
+        if len(word) < 3:
+            return None
+        result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result or None
+
+
+def index_insights(session, insights):
+    """
+    为一批已flush（已有id）的干货写入索引行
+
+    AI维护注意点: 使用表级(Core)executemany批量插入，不逐行add到session，也不走ORM批量路径
+    """
+    from models.visualization import InsightTerm
+
+    rows = []
+    for insight in insights:
+        for term in terms(insight.topic):
+            rows.append({'term': term, 'field': FIELD_TOPIC, 'insight_id': insight.id})
+        for term in terms(insight.content):
+            rows.append({'term': term, 'field': FIELD_CONTENT, 'insight_id': insight.id})
+    if rows:
+        session.execute(insert(InsightTerm.__table__), rows)
+    return len(rows)
+
+
+def remove_day(session, day_id):
+    """删除某个复盘日所有干货的索引行（覆盖保存前调用）"""
+    from models.visualization import Insight, InsightTerm
+
+    session.execute(
+        delete(InsightTerm).where(
+            InsightTerm.insight_id.in_(select(Insight.id).where(Insight.day_id == day_id))
+        )
+    )
+
+
+def matching_ids(grams, fields=(FIELD_TOPIC,)):
+    """
+    构造"所有词元均命中"的干货id子查询
+
+    Args:
+        grams: query_terms() 的返回值
+        fields: 检索字段，默认只查主题
+    """
+    from extensions import db
+    from models.visualization import InsightTerm
+
+    return select(InsightTerm.insight_id).where(
+        InsightTerm.term.in_(grams),
+        InsightTerm.field.in_(fields)
+    ).group_by(InsightTerm.insight_id).having(
+        db.func.count(db.distinct(InsightTerm.term)) == len(grams)
+    )
+
+
+def rebuild(session, batch_size=1000):
+    """
+    全量重建索引（历史数据回填/索引规则变更后使用）
+
+    Returns:
+        int: 写入的索引行数
+    """
+    from models.visualization import Insight, InsightTerm
+
+    session.execute(delete(InsightTerm))
+    total = 0
+    last_id = 0
+    while True:
+        batch = session.query(Insight.id, Insight.topic, Insight.content).filter(
+            Insight.id > last_id
+        ).order_by(Insight.id).limit(batch_size).all()
+        if not batch:
+            break
+        total += index_insights(session, batch)
+        last_id = batch[-1].id
+    session.commit()
+    return total
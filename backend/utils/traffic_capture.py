@@ -0,0 +1,198 @@
+"""
+5分钟快速复盘 - 线上流量采样录制
+================================
+按比例录制 /api/* 请求（到达时间、耗时、状态码、脱敏后的参数与JSON请求体），供 perf/replay.py 在本地回放
+AI维护注意点:
+1. 默认关闭；TRAFFIC_CAPTURE_RATE 设为 0~1 之间的比例开启。登录用户按用户整体采样（同一用户要么全录要么不录，
+   保留其完整访问序列），匿名请求按请求随机采样
+2. 脱敏规则（见 anonymize）：用户与 *_id/id 整数换成带盐HMAC假名（#开头，同值同名，回放时映射到本地数据）；
+   只有白名单键（KEEP_KEYS：枚举、分页、日期等）的值原样保留，按键判断、不按值的形态判断；
+   其余字符串逐字替换为等长占位（ASCII→x，其他→字），保留请求体大小与字数，其余数字记为0；
+   凭据键（DROP_KEYS）整项丢弃，/api/auth/* 的请求体一律不录（body_kind=omitted，只记字节数）；
+   不记录请求头、Cookie、令牌、IP，响应体只记字节数
+3. 每行一个JSON，默认 instance/traffic.log 按大小轮转；ts 为请求开始的时间戳，多worker写同一文件，回放时按 ts 排序合并
+4. inflight 为录制时本进程内同时处理中的请求数，回放报告中与回放时的并发对照
+5. /api/metrics、/api/admin/*、OPTIONS 与携带剖析参数的请求不录制
+6. 录制挂在Flask请求钩子上；/api/viz/*（点赞、看板、点赞统计）是FastAPI路由，不经过这些钩子，
+   不在录制范围内——点赞风暴等看板流量回放不出来，需用 perf/like_storm.py 单独压测
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+from flask import g, request
+
+logger = logging.getLogger('traffic_capture')
+
+SKIP_PREFIXES = ('/api/metrics', '/api/admin/')
+# 请求体含账号凭据的接口，只记字节数
+OMIT_BODY_PREFIXES = ('/api/auth/',)
+# 取值为枚举/分页/日期、不含用户内容的键，原样保留
+KEEP_KEYS = {
+    'field_type', 'review_type', 'template_type', 'type', 'sort', 'order',
+    'is_system', 'is_default', 'is_public', 'include_system', 'required', 'order_index',
+    'page', 'per_page', 'limit', 'days', 'year', 'month', 'start_date', 'end_date', 'review_date',
+    'duration_minutes'
+}
+# 凭据键，整项丢弃
+DROP_KEYS = {'password', 'old_password', 'new_password', 'token', 'access_token', 'refresh_token'}
+
+_inflight = 0
+_inflight_lock = threading.Lock()
+
+
+def pseudonym(value, salt) -> str:
+    """稳定假名：同一盐下同值同名"""
+    digest = hmac.new(salt.encode('utf-8'), str(value).encode('utf-8'), hashlib.sha256).hexdigest()
+    return '#' + digest[:12]
+
+
+def _mask_text(text):
+    return ''.join(ch if ch.isspace() else ('x' if ch.isascii() else '字') for ch in text)
+
+
+def anonymize(value, salt, key=None):
+    """
+    递归脱敏
+
+    Args:
+        value: 参数值/JSON请求体
+        salt: HMAC盐
+        key: 当前值所属的键（决定整数是否视为id、值是否原样保留）
+    """
+    if isinstance(value, dict):
+        return {k: anonymize(v, salt, k) for k, v in value.items() if k not in DROP_KEYS}
+    if isinstance(value, list):
+        return [anonymize(v, salt, key) for v in value]
+    if isinstance(value, bool) or value is None:
+        return value
+    is_id = key is not None and (key == 'id' or key.endswith('_id'))
+    if is_id and (isinstance(value, int) or (isinstance(value, str) and value.isdigit())):
+        return pseudonym(value, salt)
+    if key in KEEP_KEYS:
+        return value if isinstance(value, (int, float, str)) else None
+    if isinstance(value, (int, float)):
+        return type(value)(0)
+    if isinstance(value, str):
+        return _mask_text(value)
+    return None
+
+
+class TrafficCapture:
+    """
+    流量录制器
+
+    AI维护注意点: 同一进程内多个实例共用 traffic_capture 日志器，只挂一次文件handler
+    """
+
+    def __init__(self, rate, path, salt, max_body=64 * 1024, max_bytes=50 * 1024 * 1024, backup_count=10):
+        self.rate = rate
+        self.path = path
+        self.salt = salt
+        self.max_body = max_body
+        if not logger.handlers:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = RotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    def _actor(self):
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+        try:
+            verify_jwt_in_request(optional=True)
+        except Exception:
+            return None
+        identity = get_jwt_identity()
+        return pseudonym(identity, self.salt) if identity is not None else None
+
+    def _sampled(self, actor):
+        if actor is None:
+            return random.random() < self.rate
+        # 按假名取样：同一用户的请求同进同出，各worker结论一致
+        return int(actor[1:9], 16) / 0xFFFFFFFF < self.rate
+
+    def before_request(self):
+        global _inflight
+        path = request.path
+        if (request.method == 'OPTIONS' or not path.startswith('/api/') or path.startswith(SKIP_PREFIXES)
+                or request.args.get('__profile') or request.headers.get('X-Profile')):
+            return
+        actor = self._actor()
+        if not self._sampled(actor):
+            return
+        with _inflight_lock:
+            _inflight += 1
+            inflight = _inflight
+        g.traffic_capture = {'ts': time.time(), 'start': time.perf_counter(), 'actor': actor, 'inflight': inflight}
+
+    def after_request(self, response):
+        state = g.get('traffic_capture')
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['start']
+        rule = request.url_rule
+
+        body, body_kind = None, None
+        length = request.content_length or 0
+        if length and request.path.startswith(OMIT_BODY_PREFIXES):
+            body_kind = 'omitted'
+        elif length:
+            payload = request.get_json(silent=True) if request.is_json and length <= self.max_body else None
+            body_kind = 'json' if payload is not None else 'other'
+            body = anonymize(payload, self.salt) if payload is not None else None
+
+        entry = {
+            'ts': round(state['ts'], 6),
+            'ms': round(elapsed * 1000, 3),
+            'method': request.method,
+            'route': rule.rule if rule is not None else None,
+            'args': anonymize(request.view_args or {}, self.salt),
+            'query': {
+                key: anonymize(request.args.getlist(key), self.salt, key)
+                for key in request.args if key not in DROP_KEYS
+            },
+            'body': body,
+            'body_kind': body_kind,
+            'body_bytes': length,
+            'actor': state['actor'],
+            'status': response.status_code,
+            'resp_bytes': response.calculate_content_length(),
+            'inflight': state['inflight'],
+            'pid': os.getpid()
+        }
+        logger.info(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+        return response
+
+    def teardown_request(self, exc):
+        global _inflight
+        if g.pop('traffic_capture', None) is not None:
+            with _inflight_lock:
+                _inflight -= 1
+
+
+def init_app(app):
+    """按 TRAFFIC_CAPTURE_RATE 注册录制钩子（未开启时不注册，零开销）"""
+    rate = app.config.get('TRAFFIC_CAPTURE_RATE') or 0
+    if rate <= 0:
+        return
+    path = app.config.get('TRAFFIC_CAPTURE_LOG') or os.path.join(app.instance_path, 'traffic.log')
+    capture = TrafficCapture(
+        min(rate, 1.0), path, app.config.get('TRAFFIC_CAPTURE_SALT') or app.config['SECRET_KEY'],
+        max_body=app.config.get('TRAFFIC_CAPTURE_MAX_BODY', 64 * 1024)
+    )
+    app.extensions['traffic_capture'] = capture
+    app.before_request(capture.before_request)
+    app.after_request(capture.after_request)
+    app.teardown_request(capture.teardown_request)
@@ -0,0 +1,310 @@
+"""
+5分钟快速复盘 - SQLite单写者队列
+================================
+多worker部署时把高频写事务（点赞、登录时间）交给唯一的写者串行执行，并合并提交
+AI维护注意点:
+1. 写操作先用 @writes.operation(名称) 登记为 fn(conn, **参数)，调用方 writes.submit(名称, **参数)
+   阻塞等待结果；参数与返回值须可JSON序列化（daemon模式要过socket）
+2. 三种模式（WRITE_QUEUE_MODE）：
+   - off：直接在当前会话连接上执行并提交（默认，与原行为一致）
+   - thread：本进程一个写者线程，只串行本worker的写入
+   - socket：同机一个写者守护进程（flask writes serve），各worker经UNIX socket提交，全机只有一个写者
+3. 组提交：写者取到第一个任务后，再收集最多 WRITE_QUEUE_LINGER 秒内到达的任务（至多 MAX_BATCH 个），
+   同一事务内每个任务一个SAVEPOINT执行，单个任务失败只回滚自己，最后一次COMMIT
+4. socket模式下守护进程不可达（连不上）时退回off模式直接写，并记录警告，不影响可用性；
+   请求已发出但超时/断开时抛 WriteQueueError，不回退，避免同一任务被守护进程和本进程各执行一次
+5. 写者只跑已登记的操作，不接受任意SQL
+6. 等待写者结果最多 RESULT_TIMEOUT 秒（小于 DAEMON_TIMEOUT，守护进程先于调用方超时并回报错误）；
+   整批事务开不起来/提交失败时，批内每个任务都收到异常，调用方不会无限阻塞
+"""
+
+import atexit
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+
+class WriteQueueError(Exception):
+    """写者守护进程返回的错误"""
+
+
+class WriteQueue:
+    """
+    单写者队列
+
+    用法:
+        @writes.operation('like')
+        def insert_like(conn, insight_id, device_id): ...
+
+        inserted = writes.submit('like', insight_id=1, device_id='abc')
+    """
+
+    MAX_BATCH = 256
+    DAEMON_TIMEOUT = 30  # 秒，等待守护进程确认的上限
+    RESULT_TIMEOUT = 20  # 秒，等待写者线程执行完一个任务的上限
+
+    def __init__(self, app=None, mode='off', linger=0.002):
+        self.mode = mode
+        self.linger = linger
+        self.socket_path = None
+        self._operations = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._app = None
+        self._engine = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """绑定Flask应用：读取模式、注册CLI命令与退出时排空队列"""
+        self._app = app
+        self.mode = app.config.get('WRITE_QUEUE_MODE', self.mode)
+        self.linger = app.config.get('WRITE_QUEUE_LINGER', self.linger)
+        self.socket_path = app.config.get('WRITE_QUEUE_SOCKET') or os.path.join(
+            app.instance_path, 'write_queue.sock'
+        )
+        app.extensions['write_queue'] = self
+        app.cli.add_command(writes_cli)
+        atexit.register(self.shutdown)
+
+    def operation(self, name):
+        """登记写操作 fn(conn, **params)（装饰器）"""
+        def decorator(fn):
+            self._operations[name] = fn
+            return fn
+        return decorator
+
+    # ============ 提交 ============
+
+    def submit(self, name, **params):
+        """
+        提交一次写操作，阻塞到其所在批次提交完成
+
+        Returns:
+            操作函数的返回值
+
+        AI维护注意点: off模式会提交当前 db.session，调用前不要留有未完成的会话修改
+        """
+        if name not in self._operations:
+            raise KeyError(f"未登记的写操作：{name}")
+        if self.mode == 'thread':
+            return self.wait(self.enqueue(name, params))
+        if self.mode == 'socket':
+            try:
+                return self._call_daemon(name, params)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                # 只有连接建立失败才回退直写：请求尚未发出，不会重复执行
+                self._app.logger.warning(f"写者守护进程不可达，直接写入：{e}")
+        return self._run_direct(name, params)
+
+    def _run_direct(self, name, params):
+        from extensions import db
+
+        try:
+            result = self._operations[name](db.session.connection(), **params)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return result
+
+    def enqueue(self, name, params) -> Future:
+        """放入本进程写者队列，返回Future"""
+        future = Future()
+        self._queue.put((name, params, future))
+        self._ensure_writer()
+        return future
+
+    # ============ 写者 ============
+
+    def _ensure_writer(self):
+        """首次入队时启动写者线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._engine is None:
+                from extensions import db
+
+                with self._app.app_context():
+                    self._engine = db.engine
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='write-queue', daemon=True)
+            self._thread.start()
+
+    def wait(self, future):
+        """等待写者结果，超过 RESULT_TIMEOUT 抛 WriteQueueError（任务可能稍后仍会执行）"""
+        try:
+            return future.result(timeout=self.RESULT_TIMEOUT)
+        except FutureTimeout:
+            raise WriteQueueError(
+                f"写者 {self.RESULT_TIMEOUT}s 内未完成（队列积压或数据库被锁，任务可能稍后仍会执行）"
+            ) from None
+
+    def _collect(self, timeout=None):
+        """取一批任务：阻塞等第一个，再在 linger 时间内收集后续到达的"""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def execute_batch(self, batch):
+        """
+        一个事务内执行一批任务（每个任务一个SAVEPOINT），提交后回填各自结果
+
+        Returns:
+            int: 成功的任务数
+        """
+        outcomes = []
+        try:
+            with self._engine.begin() as conn:
+                for name, params, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with conn.begin_nested():
+                            outcomes.append((future, self._operations[name](conn, **params), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # 开事务/提交失败：整批都没有落库，包括还没轮到执行的任务
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return 0
+
+        succeeded = 0
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+                succeeded += 1
+            else:
+                future.set_exception(error)
+        return succeeded
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect(timeout=1.0)
+            if batch:
+                self.execute_batch(batch)
+
+    def shutdown(self):
+        """停止写者线程，排空队列中剩余的任务"""
+        self._stopped.set()
+        if self._engine is None:
+            return
+        while True:
+            batch = self._collect(timeout=0)
+            if not batch:
+                break
+            self.execute_batch(batch)
+
+    # ============ 守护进程（socket模式） ============
+
+    def _call_daemon(self, name, params):
+        """
+        经UNIX socket提交给写者守护进程（每个线程一条长连接）
+
+        AI维护注意点:
+        1. 连接建立失败（FileNotFoundError/ConnectionRefusedError）原样抛出，由 submit 回退直写
+        2. 请求发出后超时或断开时守护进程可能已经提交，抛 WriteQueueError，不回退也不重发，避免写两次；
+           唯一例外是复用的空闲长连接直接读到EOF（守护进程重启过），重连重发一次
+        """
+        request = (json.dumps({'op': name, 'params': params}, ensure_ascii=False) + '\n').encode('utf-8')
+        for attempt in range(2):
+            conn = getattr(self._local, 'daemon', None)
+            reused = conn is not None
+            if conn is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.DAEMON_TIMEOUT)
+                try:
+                    sock.connect(self.socket_path)
+                except OSError:
+                    sock.close()
+                    raise
+                conn = self._local.daemon = sock.makefile('rwb')
+            try:
+                conn.write(request)
+                conn.flush()
+                line = conn.readline()
+            except OSError as e:
+                conn.close()
+                self._local.daemon = None
+                raise WriteQueueError(f"写者守护进程未确认（可能已提交，不重试）：{type(e).__name__}: {e}") from e
+            if not line:
+                conn.close()
+                self._local.daemon = None
+                if reused and not attempt:
+                    continue
+                raise WriteQueueError('写者守护进程关闭了连接（可能已提交，不重试）')
+            response = json.loads(line)
+            if not response['ok']:
+                raise WriteQueueError(response['error'])
+            return response['result']
+
+    def serve(self):
+        """运行写者守护进程：监听UNIX socket，所有连接的任务汇入同一个写者线程"""
+        writes = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                        if request['op'] not in writes._operations:
+                            raise KeyError(f"未登记的写操作：{request['op']}")
+                        result = writes.wait(writes.enqueue(request['op'], request.get('params') or {}))
+                        response = {'ok': True, 'result': result}
+                    except Exception as e:
+                        response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+            request_queue_size = 128  # 各worker同时建连
+
+        server = Server(self.socket_path, Handler)
+        os.chmod(self.socket_path, 0o660)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            os.remove(self.socket_path)
+            self.shutdown()
+
+
+writes_cli = AppGroup('writes', help='单写者队列命令')
+
+
+@writes_cli.command('serve')
+def serve_command():
+    """启动写者守护进程（各worker配置 WRITE_QUEUE_MODE=socket）"""
+    writes = current_app.extensions['write_queue']
+    click.echo(f"写者守护进程监听 {writes.socket_path}，已登记操作：{', '.join(sorted(writes._operations))}")
+    writes.serve()
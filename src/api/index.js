@@ -131,6 +131,7 @@ export const getTemplateUsage = () => api.get('/api/stats/templates')
 export const parseMarkdown = (data) => api.post('/api/viz/parse', data)
 export const saveReview = (data) => api.post('/api/viz/save', data)
 export const getReviewByDate = (date) => api.get(`/api/viz/reviews/${date}`)
+export const getReviewsInRange = (from, to) => api.get('/api/viz/reviews', { params: { from, to } })
 export const getAvailableDates = () => api.get('/api/viz/dates')
 export const uploadAvatar = (sharerName, file) => {
   const formData = new FormData()
@@ -140,9 +141,16 @@ export const uploadAvatar = (sharerName, file) => {
   })
 }
 export const likeInsight = (data) => api.post('/api/viz/like', data)
+export const getLikeState = (data) => api.post('/api/viz/likes/state', data)
 export const getLikesByInsight = (insightId) => api.get(`/api/viz/likes/${insightId}`)
+export const getLikeTimeline = (insightId, params) => api.get(`/api/viz/likes/${insightId}/timeline`, { params })
 export const getLikesByTopic = (topic) => api.get('/api/viz/likes/by-topic', { params: { topic } })
-export const getLikesBySharer = (sharerName) => api.get(`/api/viz/likes/by-sharer/${sharerName}`)
+export const getLikesBySharer = (sharerName, params) => api.get(`/api/viz/likes/by-sharer/${sharerName}`, { params })
+export const getSharerLeaderboard = (params) => api.get('/api/viz/sharers/leaderboard', { params })
+
+// 精选：按时间衰减热度排序的干货
+export const getHotInsights = (limit = 20) => api.get('/api/viz/hot', { params: { limit } })
+export const getSimilarInsights = (insightId, limit = 5) => api.get(`/api/viz/insights/${insightId}/similar`, { params: { limit } })
 
 // 默认导出实例
 export default api